@@ -0,0 +1,88 @@
+"""
+Compares decoding of a document response with streaming the document into a buffer or a file.
+
+Responses are built in memory and fed in 64 KB chunks, like ``response.iter_bytes()``. Every
+document is measured plain and with JSON escapes (newlines and quotes, as in real contract texts):
+the whole response decoded with ``json.loads``, and the document extracted with
+:func:`tools.streaming.extract_json_string` into a :class:`DocumentBuffer` and a :class:`DocumentFile`.
+The table reports milliseconds per response and the peak Python heap allocation::
+
+    python -m benchmarks.download --size 1024
+"""
+import argparse
+import json
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable
+
+from tools.streaming import DocumentBuffer, DocumentFile, extract_json_string
+
+CHUNK_SIZE = 64 * 1024
+LINES = {
+    'plain': 'Lorem ipsum dolor sit amet. ',
+    'escaped': 'Clause 1. The "Bank" may change the tariff.\n',
+}
+
+
+def build_response(line: str, size: int) -> list[bytes]:
+    """
+    Returns the chunks of a document response with a document of about ``size`` KB.
+    """
+    document = line * (size * 1024 // len(line) + 1)
+    content = json.dumps({'contract': {'url': 'http://localhost/documents/1', 'document': document}}).encode()
+    return [content[start:start + CHUNK_SIZE] for start in range(0, len(content), CHUNK_SIZE)]
+
+
+def measure(decode: Callable[[list[bytes]], None], chunks: list[bytes], rounds: int) -> tuple[float, int]:
+    """
+    Returns the best time (seconds) of one decode over ``rounds`` rounds and its peak heap allocation.
+    """
+    best = float('inf')
+    for _ in range(rounds):
+        start = time.perf_counter()
+        decode(chunks)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    decode(chunks)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--size', type=int, default=1024, help='Document size in KB')
+    parser.add_argument('--rounds', type=int, default=20, help='Measurements of every variant')
+    arguments = parser.parse_args()
+
+    path = Path(tempfile.gettempdir()) / 'benchmark-document.bin'
+
+    def load(chunks: list[bytes]) -> None:
+        json.loads(b''.join(chunks))
+
+    def to_buffer(chunks: list[bytes]) -> None:
+        target = DocumentBuffer(sum(map(len, chunks)))
+        extract_json_string(chunks, 'document', target)
+        target.close()
+
+    def to_file(chunks: list[bytes]) -> None:
+        target = DocumentFile(path)
+        extract_json_string(chunks, 'document', target)
+        target.close()
+
+    print(f'{"document":<9} {"variant":<8} {"ms":>8} {"peak KB":>9}')
+    try:
+        for name, line in LINES.items():
+            chunks = build_response(line, arguments.size)
+            for variant, decode in (('json', load), ('buffer', to_buffer), ('file', to_file)):
+                elapsed, peak = measure(decode, chunks, arguments.rounds)
+                print(f'{name:<9} {variant:<8} {elapsed * 1000:>8.2f} {peak / 1024:>9.0f}')
+    finally:
+        path.unlink(missing_ok=True)
+
+
+if __name__ == '__main__':
+    main()
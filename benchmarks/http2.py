@@ -0,0 +1,91 @@
+"""
+Compares an HTTP/1.1 connection pool with HTTP/2 multiplexing at high concurrency.
+
+Each iteration performs ``get_user``. HTTP/1.1 uses one connection per thread, HTTP/2 multiplexes
+all threads over a single h2c connection limited by ``--max-streams``. The table reports throughput,
+latency and the number of sockets open at the end of the run.
+
+Without ``--base-url`` an HTTP/1.1 stand-in and an h2c stand-in are started locally. HTTP/2
+requires ``pip install httpx[http2]``, the benchmark fails when it is requested and ``h2`` is missing::
+
+    python -m benchmarks.http2 --threads 16 64 256
+    python -m benchmarks.http2 --protocols HTTP/1.1 --threads 16 64 256
+    python -m benchmarks.http2 --base-url http://localhost:8003 --threads 16 64 256
+"""
+import argparse
+
+from httpx import Client, Limits
+
+from benchmarks.thread_scaling import free_port, start_stand_in_process
+from clients.http.gateway.users.client import UsersGatewayHTTPClient
+from clients.http.transport import StreamLimitTransport
+from tools.profiler import count_open_sockets
+from tools.runner import ScenarioContext, ThreadPoolRunner
+
+PROTOCOLS = ('HTTP/1.1', 'HTTP/2')
+
+
+def build_client(base_url: str, protocol: str, threads: int, max_streams: int) -> Client:
+    if protocol == 'HTTP/1.1':
+        limits = Limits(max_connections=threads, max_keepalive_connections=threads)
+        return Client(base_url=base_url, limits=limits)
+
+    transport = StreamLimitTransport(max_concurrent_streams=max_streams, http1=False, http2=True)
+    return Client(base_url=base_url, transport=transport)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--base-url', help='Gateway supporting h2c, local stand-ins are started if not set')
+    parser.add_argument('--protocols', nargs='+', choices=PROTOCOLS, default=list(PROTOCOLS))
+    parser.add_argument('--threads', type=int, nargs='+', default=[16, 64, 256])
+    parser.add_argument('--max-streams', type=int, default=100, help='Maximum concurrent HTTP/2 streams')
+    parser.add_argument('--duration', type=float, default=5.0, help='Seconds per measurement')
+    arguments = parser.parse_args()
+
+    if 'HTTP/2' in arguments.protocols:
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            parser.error("HTTP/2 requires the 'h2' package, install it with: pip install httpx[http2]")
+
+    stand_ins = []
+    base_urls = dict.fromkeys(arguments.protocols, arguments.base_url)
+    try:
+        if arguments.base_url is None:
+            for protocol in arguments.protocols:
+                port = free_port()
+                stand_ins.append(start_stand_in_process(port, http2=protocol == 'HTTP/2'))
+                base_urls[protocol] = f'http://localhost:{port}'
+
+        # Every stand-in keeps its own state, so the user is created through each base URL
+        user_ids = {}
+        for protocol, base_url in base_urls.items():
+            with build_client(base_url, protocol, 1, arguments.max_streams) as setup_client:
+                user_ids[protocol] = UsersGatewayHTTPClient(client=setup_client).create_user().user.id
+
+        print(f'{"protocol":>8} {"threads":>7} {"iter/s":>9} {"p50 ms":>8} {"p99 ms":>8} '
+              f'{"errors":>7} {"sockets":>7}')
+        for threads in arguments.threads:
+            for protocol in arguments.protocols:
+                def get_user(context: ScenarioContext, user_id: str = user_ids[protocol]) -> None:
+                    UsersGatewayHTTPClient(client=context.client).get_user(user_id)
+
+                with build_client(base_urls[protocol], protocol, threads, arguments.max_streams) as client:
+                    result = ThreadPoolRunner(get_user, threads=threads, client=client).run(
+                        duration=arguments.duration
+                    )
+                    sockets = count_open_sockets()
+                stats = result.summary()['get_user']
+                print(
+                    f'{protocol:>8} {threads:>7} {result.throughput:>9.0f} {stats["p50_ms"]:>8.2f} '
+                    f'{stats["p99_ms"]:>8.2f} {stats["errors"]:>7} {sockets if sockets is not None else "-":>7}'
+                )
+    finally:
+        for stand_in in stand_ins:
+            stand_in.terminate()
+            stand_in.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+Measures cold-start time of the ``python -m`` entry points of short load jobs.
+
+Every entry point is started with ``--help`` in a fresh interpreter several times, so it imports
+everything it needs and parses arguments, but does no work. The median wall time minus the median
+time of an empty interpreter start is reported, together with the heaviest imports reported by
+``python -X importtime``::
+
+    python -m benchmarks.import_time --runs 10
+    python -m benchmarks.import_time tools.traffic tools.distributed
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+ENTRY_POINTS = (
+    'tools.traffic',
+    'tools.distributed',
+    'benchmarks.stand_in',
+    'benchmarks.thread_scaling',
+    'benchmarks.http2',
+    'benchmarks.validation',
+    'benchmarks.download',
+)
+
+
+def measure(arguments: list[str], runs: int) -> float:
+    """
+    Returns the median wall time (seconds) of a fresh interpreter started with the arguments.
+    """
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *arguments], check=True, stdout=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def heaviest_imports(module: str, count: int) -> list[tuple[int, str]]:
+    """
+    Returns the modules with the largest cumulative import time (microseconds) of an entry point.
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-m', module, '--help'],
+        check=True, capture_output=True, text=True
+    )
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        imports.append((int(cumulative), name.strip()))
+    # Imports of the interpreter start (up to ``site``) are common to all entry points
+    names = [name for _, name in imports]
+    if 'site' in names:
+        imports = imports[names.index('site') + 1:]
+    imports = [item for item in imports if item[1] not in (module, '__main__')]
+    return sorted(imports, reverse=True)[:count]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', type=int, default=10, help='Interpreter starts per entry point')
+    parser.add_argument('--top', type=int, default=3, help='Number of heaviest imports to show')
+    parser.add_argument('modules', nargs='*', default=ENTRY_POINTS, help='Entry point modules')
+    arguments = parser.parse_args()
+
+    baseline = measure(['-c', 'pass'], arguments.runs)
+    print(f'Interpreter start: {baseline * 1000:.1f} ms')
+    for module in arguments.modules:
+        elapsed = measure(['-m', module, '--help'], arguments.runs) - baseline
+        heaviest = ', '.join(f'{name} {cumulative / 1000:.0f} ms' for cumulative, name in
+                             heaviest_imports(module, arguments.top))
+        print(f'{module:<45} {elapsed * 1000:7.1f} ms  ({heaviest})')
+
+
+if __name__ == '__main__':
+    main()
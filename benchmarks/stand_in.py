@@ -0,0 +1,345 @@
+"""
+Minimal in-memory stand-in for the http-gateway service.
+
+Implements the endpoints used by the gateway clients with plausible responses, so benchmarks
+can run without the real service. Start it with::
+
+    python -m benchmarks.stand_in --port 8003
+
+With ``--http2`` it speaks HTTP/2 with prior knowledge (h2c) instead, which requires the
+optional ``h2`` package (``pip install httpx[http2]``).
+"""
+import argparse
+import json
+import random
+import re
+import socket
+import uuid
+from datetime import date, datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from socketserver import BaseRequestHandler, ThreadingTCPServer
+from threading import Lock, Thread
+from typing import TYPE_CHECKING
+from urllib.parse import parse_qs, urlsplit
+
+if TYPE_CHECKING:
+    from h2.connection import H2Connection
+
+DOCUMENT = 'Lorem ipsum dolor sit amet. ' * 2000
+
+
+class GatewayState:
+    """
+    In-memory storage of users, accounts, cards and operations.
+    """
+
+    def __init__(self):
+        self.lock = Lock()
+        self.users: dict[str, dict] = {}
+        self.accounts: dict[str, dict] = {}
+        self.user_accounts: dict[str, list[str]] = {}
+        self.operations: dict[str, dict] = {}
+        self.account_operations: dict[str, list[str]] = {}
+
+    def create_user(self, payload: dict) -> dict:
+        user = {'id': str(uuid.uuid4()), **payload}
+        with self.lock:
+            self.users[user['id']] = user
+        return {'user': user}
+
+    def get_user(self, user_id: str) -> dict | None:
+        user = self.users.get(user_id)
+        return {'user': user} if user else None
+
+    def issue_card(self, account_id: str, card_type: str) -> dict:
+        return {
+            'id': str(uuid.uuid4()),
+            'pin': f'{random.randint(0, 9999):04}',
+            'cvv': f'{random.randint(0, 999):03}',
+            'type': card_type,
+            'status': 'ACTIVE',
+            'accountId': account_id,
+            'cardNumber': ''.join(random.choices('0123456789', k=16)),
+            'cardHolder': 'TEST USER',
+            'expiryDate': date(date.today().year + 3, 1, 1).isoformat(),
+            'paymentSystem': random.choice(['VISA', 'MASTERCARD']),
+        }
+
+    def open_account(self, payload: dict, account_type: str) -> dict:
+        account_id = str(uuid.uuid4())
+        cards = []
+        if account_type in ('DEBIT_CARD', 'CREDIT_CARD'):
+            cards = [self.issue_card(account_id, 'VIRTUAL'), self.issue_card(account_id, 'PHYSICAL')]
+        account = {'id': account_id, 'type': account_type, 'cards': cards, 'status': 'ACTIVE', 'balance': 0.0}
+        with self.lock:
+            self.accounts[account_id] = account
+            self.user_accounts.setdefault(payload['userId'], []).append(account_id)
+        return {'account': account}
+
+    def add_card(self, payload: dict, card_type: str) -> dict:
+        card = self.issue_card(payload['accountId'], card_type)
+        with self.lock:
+            account = self.accounts.get(payload['accountId'])
+            if account is not None:
+                account['cards'].append(card)
+        return {'card': card}
+
+    def get_accounts(self, user_id: str) -> dict:
+        with self.lock:
+            return {'accounts': [self.accounts[i] for i in self.user_accounts.get(user_id, [])]}
+
+    def make_operation(self, payload: dict, operation_type: str) -> dict:
+        operation = {
+            'id': str(uuid.uuid4()),
+            'type': operation_type,
+            'status': payload.get('status', 'COMPLETED'),
+            'amount': payload.get('amount', 0.0),
+            'cardId': payload['cardId'],
+            'category': payload.get('category', 'other'),
+            'createdAt': datetime.now().isoformat(),
+            'accountId': payload['accountId'],
+        }
+        with self.lock:
+            self.operations[operation['id']] = operation
+            self.account_operations.setdefault(operation['accountId'], []).append(operation['id'])
+        return {'operation': operation}
+
+    def get_operations(self, query: dict[str, str]) -> dict:
+        with self.lock:
+            ids = list(self.account_operations.get(query.get('accountId', ''), []))
+        operations = [self.operations[i] for i in reversed(ids)]
+        if 'type' in query:
+            operations = [operation for operation in operations if operation['type'] == query['type']]
+
+        start = int(query.get('cursor', 0))
+        limit = int(query['limit']) if 'limit' in query else len(operations)
+        page = operations[start:start + limit]
+        next_cursor = str(start + limit) if start + limit < len(operations) else None
+        return {'operations': page, 'nextCursor': next_cursor}
+
+    def get_operations_summary(self, query: dict[str, str]) -> dict:
+        summary = {'spentAmount': 0.0, 'receivedAmount': 0.0, 'cashbackAmount': 0.0}
+        for operation in self.get_operations({'accountId': query.get('accountId', '')})['operations']:
+            if operation['type'] == 'TOP_UP':
+                summary['receivedAmount'] += operation['amount']
+            elif operation['type'] == 'CASHBACK':
+                summary['cashbackAmount'] += operation['amount']
+            else:
+                summary['spentAmount'] += operation['amount']
+        return {'summary': summary}
+
+    def get(self, target: str) -> tuple[int, dict | None]:
+        """
+        Handles a GET request, a None body means not found.
+        """
+        url = urlsplit(target)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        path = url.path
+
+        if match := re.fullmatch(r'/api/v1/users/([^/]+)', path):
+            return 200, self.get_user(match[1])
+        if path == '/api/v1/accounts':
+            return 200, self.get_accounts(query.get('userId', ''))
+        if match := re.fullmatch(r'/api/v1/documents/(tariff|contract)-document/([^/]+)', path):
+            document = {'url': f'http://localhost/documents/{match[1]}/{match[2]}', 'document': DOCUMENT}
+            return 200, {match[1]: document}
+        if path == '/api/v1/operations':
+            return 200, self.get_operations(query)
+        if path == '/api/v1/operations/operations-summary':
+            return 200, self.get_operations_summary(query)
+        if match := re.fullmatch(r'/api/v1/operations/operation-receipt/([^/]+)', path):
+            receipt = {'url': f'http://localhost/receipts/{match[1]}', 'document': DOCUMENT}
+            return 200, {'receipt': receipt}
+        if match := re.fullmatch(r'/api/v1/operations/([^/]+)', path):
+            operation = self.operations.get(match[1])
+            return 200, {'operation': operation} if operation else None
+        return 404, None
+
+    def post(self, target: str, payload: dict) -> tuple[int, dict | None]:
+        """
+        Handles a POST request, a None body means not found.
+        """
+        path = urlsplit(target).path
+
+        if path == '/api/v1/users':
+            return 200, self.create_user(payload)
+        if match := re.fullmatch(r'/api/v1/accounts/open-(deposit|savings|debit-card|credit-card)-account', path):
+            account_type = match[1].upper().replace('-', '_')
+            return 200, self.open_account(payload, account_type)
+        if match := re.fullmatch(r'/api/v1/cards/issue-(virtual|physical)-card', path):
+            return 200, self.add_card(payload, match[1].upper())
+        if match := re.fullmatch(r'/api/v1/operations/make-([a-z-]+)-operation', path):
+            if match[1] in OPERATION_TYPES:
+                return 200, self.make_operation(payload, OPERATION_TYPES[match[1]])
+        return 404, None
+
+
+OPERATION_TYPES = {
+    'fee': 'FEE',
+    'top-up': 'TOP_UP',
+    'cashback': 'CASHBACK',
+    'transfer': 'TRANSFER',
+    'purchase': 'PURCHASE',
+    'bill-payment': 'BILL_PAYMENT',
+    'cash-withdrawal': 'CASH_WITHDRAWAL',
+}
+
+
+class GatewayHandler(BaseHTTPRequestHandler):
+    """
+    Routes gateway requests to :class:`GatewayState`.
+    """
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    state = GatewayState()
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def send_json(self, status: int, body: dict | None) -> None:
+        data = json.dumps(body if body is not None else {'detail': 'Not found'}).encode()
+        self.send_response(status if body is not None else 404)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self) -> None:
+        self.send_json(*self.state.get(self.path))
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get('Content-Length', 0))
+        self.send_json(*self.state.post(self.path, json.loads(self.rfile.read(length) or b'{}')))
+
+
+def start_stand_in(host: str = 'localhost', port: int = 0) -> ThreadingHTTPServer:
+    """
+    Starts the stand-in gateway in a background thread of the current process.
+
+    :param host: The host to bind.
+    :param port: The port to bind, a free port is chosen if 0.
+    :return: The running server, its address is available as ``server.server_address``.
+    """
+    server = ThreadingHTTPServer((host, port), GatewayHandler)
+    server.daemon_threads = True
+    Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+
+class H2CConnectionHandler(BaseRequestHandler):
+    """
+    Serves one HTTP/2 connection with prior knowledge (h2c) using the ``h2`` package.
+
+    Streams of the connection are multiplexed, responses are sent as the flow control windows allow.
+    """
+    state = GatewayHandler.state
+
+    def handle(self) -> None:
+        from h2.config import H2Configuration
+        from h2.connection import H2Connection
+        from h2.events import ConnectionTerminated, DataReceived, RequestReceived, StreamEnded, StreamReset
+
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        connection = H2Connection(config=H2Configuration(client_side=False, header_encoding='utf-8'))
+        connection.initiate_connection()
+        self.request.sendall(connection.data_to_send())
+
+        requests: dict[int, tuple[dict[str, str], bytearray]] = {}
+        pending: dict[int, memoryview] = {}
+        while data := self.request.recv(65536):
+            for event in connection.receive_data(data):
+                if isinstance(event, RequestReceived):
+                    requests[event.stream_id] = (dict(event.headers), bytearray())
+                elif isinstance(event, DataReceived):
+                    requests[event.stream_id][1].extend(event.data)
+                    connection.acknowledge_received_data(event.flow_controlled_length, event.stream_id)
+                elif isinstance(event, StreamEnded):
+                    headers, body = requests.pop(event.stream_id)
+                    pending[event.stream_id] = self.respond(connection, event.stream_id, headers, body)
+                elif isinstance(event, StreamReset):
+                    requests.pop(event.stream_id, None)
+                    pending.pop(event.stream_id, None)
+                elif isinstance(event, ConnectionTerminated):
+                    return
+
+            for stream_id, remaining in list(pending.items()):
+                while size := min(
+                        len(remaining),
+                        connection.local_flow_control_window(stream_id),
+                        connection.max_outbound_frame_size,
+                ):
+                    connection.send_data(stream_id, remaining[:size])
+                    remaining = remaining[size:]
+                if remaining:
+                    pending[stream_id] = remaining
+                else:
+                    connection.end_stream(stream_id)
+                    del pending[stream_id]
+            self.request.sendall(connection.data_to_send())
+
+    def respond(self, connection: 'H2Connection', stream_id: int, headers: dict[str, str], body: bytes) -> memoryview:
+        if headers[':method'] == 'POST':
+            status, response = self.state.post(headers[':path'], json.loads(body or b'{}'))
+        else:
+            status, response = self.state.get(headers[':path'])
+        data = json.dumps(response if response is not None else {'detail': 'Not found'}).encode()
+        connection.send_headers(stream_id, [
+            (':status', str(status if response is not None else 404)),
+            ('content-type', 'application/json'),
+            ('content-length', str(len(data))),
+        ])
+        return memoryview(data)
+
+
+class H2CServer(ThreadingTCPServer):
+    """
+    Threaded TCP server of h2c connections, reusing the address like ``ThreadingHTTPServer``.
+    """
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+def start_h2c_stand_in(host: str = 'localhost', port: int = 0) -> H2CServer:
+    """
+    Starts the stand-in gateway speaking HTTP/2 with prior knowledge in a background thread.
+
+    Requires the optional ``h2`` package: ``pip install httpx[http2]``.
+
+    :param host: The host to bind.
+    :param port: The port to bind, a free port is chosen if 0.
+    :return: The running server, its address is available as ``server.server_address``.
+    """
+    server = build_h2c_server(host, port)
+    Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def build_h2c_server(host: str, port: int) -> H2CServer:
+    try:
+        import h2  # noqa: F401
+    except ImportError as error:
+        raise ImportError(
+            "The h2c stand-in requires the 'h2' package, install it with: pip install httpx[http2]"
+        ) from error
+
+    return H2CServer((host, port), H2CConnectionHandler)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--port', type=int, default=8003)
+    parser.add_argument(
+        '--http2', action='store_true', help='Speak HTTP/2 with prior knowledge (h2c) instead of HTTP/1.1'
+    )
+    arguments = parser.parse_args()
+
+    if arguments.http2:
+        stand_in = build_h2c_server(arguments.host, arguments.port)
+    else:
+        stand_in = ThreadingHTTPServer((arguments.host, arguments.port), GatewayHandler)
+        stand_in.daemon_threads = True
+    protocol = ' (h2c)' if arguments.http2 else ''
+    print(f'Stand-in gateway is listening on http://{arguments.host}:{arguments.port}{protocol}')
+    stand_in.serve_forever()
@@ -0,0 +1,81 @@
+"""
+Measures how the thread-pool runner scales from 1 to 64 threads against the local stand-in.
+
+Each iteration performs ``get_user`` followed by ``get_accounts`` for a pre-created user.
+The stand-in is started in a separate process, so it does not compete for the GIL with
+the load generator::
+
+    python -m benchmarks.thread_scaling --duration 5
+"""
+import argparse
+import socket
+import subprocess
+import sys
+import time
+
+from httpx import Client, Limits
+
+from clients.http.gateway.accounts.client import AccountsGatewayHTTPClient
+from clients.http.gateway.users.client import UsersGatewayHTTPClient
+from tools.runner import ScenarioContext, ThreadPoolRunner
+
+THREADS = (1, 2, 4, 8, 16, 32, 64)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('localhost', 0))
+        return sock.getsockname()[1]
+
+
+def start_stand_in_process(port: int, http2: bool = False) -> subprocess.Popen:
+    command = [sys.executable, '-m', 'benchmarks.stand_in', '--port', str(port)]
+    process = subprocess.Popen(command + ['--http2'] if http2 else command)
+    for _ in range(100):
+        try:
+            socket.create_connection(('localhost', port), timeout=0.1).close()
+            return process
+        except OSError:
+            time.sleep(0.05)
+    process.kill()
+    raise RuntimeError('Stand-in gateway did not start')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--duration', type=float, default=5.0, help='Seconds per thread count')
+    arguments = parser.parse_args()
+
+    port = free_port()
+    stand_in = start_stand_in_process(port)
+    base_url = f'http://localhost:{port}'
+    try:
+        with Client(base_url=base_url) as setup_client:
+            user_id = UsersGatewayHTTPClient(client=setup_client).create_user().user.id
+            AccountsGatewayHTTPClient(client=setup_client).open_debit_card_account(user_id)
+
+        def get_user_and_accounts(context: ScenarioContext) -> None:
+            with context.metrics.measure('get_user'):
+                UsersGatewayHTTPClient(client=context.client).get_user(user_id)
+            with context.metrics.measure('get_accounts'):
+                AccountsGatewayHTTPClient(client=context.client).get_accounts(user_id)
+
+        print(f'{"threads":>7} {"iter/s":>9} {"p50 ms":>8} {"p99 ms":>8} {"errors":>7}')
+        for threads in THREADS:
+            limits = Limits(max_connections=threads, max_keepalive_connections=threads)
+            with Client(base_url=base_url, limits=limits) as client:
+                result = ThreadPoolRunner(get_user_and_accounts, threads=threads, client=client).run(
+                    duration=arguments.duration
+                )
+            stats = result.summary()['get_user_and_accounts']
+            print(
+                f'{threads:>7} {result.throughput:>9.0f} {stats["p50_ms"]:>8.2f} '
+                f'{stats["p99_ms"]:>8.2f} {stats["errors"]:>7}'
+            )
+    finally:
+        stand_in.terminate()
+        stand_in.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,155 @@
+"""
+Compares parsing of every gateway response type into the wrapper schema and into the inner value.
+
+Payloads are generated by the stand-in state. Every response is parsed with
+``Schema.model_validate_json`` and with the adapters of :mod:`clients.http.adapters`: into the
+inner schema, into a lightweight TypedDict and into a lightweight dataclass. The table reports
+microseconds per response and the speed-up over the wrapper schema::
+
+    python -m benchmarks.validation --operations 50
+"""
+import argparse
+import inspect
+import json
+import time
+from importlib import import_module
+from typing import Any, Callable, get_args
+
+from pydantic import BaseModel
+
+from benchmarks.stand_in import DOCUMENT, OPERATION_TYPES, GatewayState
+from clients.http.adapters import adapters, lightweight
+
+SCHEMA_MODULES = (
+    'clients.http.gateway.users.schema',
+    'clients.http.gateway.accounts.schema',
+    'clients.http.gateway.cards.schema',
+    'clients.http.gateway.documents.schema',
+    'clients.http.gateway.operations.schema',
+)
+
+
+def response_schemas() -> list[type[BaseModel]]:
+    """
+    Returns all response schemas of the gateway clients.
+    """
+    schemas = []
+    for name in SCHEMA_MODULES:
+        module = import_module(name)
+        schemas.extend(
+            value for key, value in vars(module).items()
+            if key.endswith('ResponseSchema') and inspect.isclass(value) and value.__module__ == name
+        )
+    return schemas
+
+
+def sample_payloads(operations: int) -> dict[str, bytes]:
+    """
+    Returns plausible response bodies by response schema name.
+
+    :param operations: Number of operations in the operations list response.
+    """
+    state = GatewayState()
+    user = state.create_user({
+        'email': 'test_user@example.com', 'lastName': 'User', 'firstName': 'Test',
+        'middleName': 'Load', 'phoneNumber': '+10000000000',
+    })
+    user_id = user['user']['id']
+    accounts = {
+        account_type: state.open_account({'userId': user_id}, account_type)
+        for account_type in ('DEPOSIT', 'SAVINGS', 'DEBIT_CARD', 'CREDIT_CARD')
+    }
+    account = accounts['DEBIT_CARD']['account']
+    card = {'accountId': account['id'], 'userId': user_id}
+    made = {
+        name: state.make_operation(
+            {'cardId': account['cards'][0]['id'], 'accountId': account['id'], 'amount': 10.0}, operation_type
+        )
+        for name, operation_type in OPERATION_TYPES.items()
+    }
+    for index in range(operations - len(made)):
+        state.make_operation({'cardId': account['cards'][0]['id'], 'accountId': account['id'], 'amount': index}, 'FEE')
+    document = {'url': 'http://localhost/documents/1', 'document': DOCUMENT}
+
+    payloads = {
+        'GetUserResponseSchema': user,
+        'CreateUserResponseSchema': user,
+        'GetAccountsResponseSchema': state.get_accounts(user_id),
+        'OpenDepositAccountResponseSchema': accounts['DEPOSIT'],
+        'OpenSavingsAccountResponseSchema': accounts['SAVINGS'],
+        'OpenDebitCardAccountResponseSchema': accounts['DEBIT_CARD'],
+        'OpenCreditCardAccountResponseSchema': accounts['CREDIT_CARD'],
+        'IssueVirtualCardResponseSchema': state.add_card(card, 'VIRTUAL'),
+        'IssuePhysicalCardResponseSchema': state.add_card(card, 'PHYSICAL'),
+        'GetTariffDocumentResponseSchema': {'tariff': document},
+        'GetContractDocumentResponseSchema': {'contract': document},
+        'GetOperationsResponseSchema': state.get_operations({'accountId': account['id']}),
+        'GetOperationsSummaryResponseSchema': state.get_operations_summary({'accountId': account['id']}),
+        'GetOperationReceiptResponseSchema': {'receipt': document},
+        'GetOperationResponseSchema': made['fee'],
+    }
+    for name, operation in made.items():
+        schema_name = ''.join(part.capitalize() for part in name.split('-'))
+        payloads[f'Make{schema_name}OperationResponseSchema'] = operation
+    return {name: json.dumps(payload).encode() for name, payload in payloads.items()}
+
+
+def inner_schema(schema: type[BaseModel]) -> type[BaseModel]:
+    """
+    Returns the schema wrapped by the only required field of the response schema.
+    """
+    field = next(info for info in schema.model_fields.values() if info.is_required())
+    annotation = field.annotation
+    return next(
+        candidate for candidate in (annotation, *get_args(annotation))
+        if inspect.isclass(candidate) and issubclass(candidate, BaseModel)
+    )
+
+
+def measure(parse: Callable[[bytes], Any], content: bytes, duration: float) -> float:
+    """
+    Returns the best mean time (seconds) of one parse over five rounds of about ``duration`` seconds.
+    """
+    parse(content)
+    start = time.perf_counter()
+    parse(content)
+    number = max(1, int(duration / 5 / max(time.perf_counter() - start, 1e-7)))
+
+    best = float('inf')
+    for _ in range(5):
+        start = time.perf_counter()
+        for _ in range(number):
+            parse(content)
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--operations', type=int, default=50, help='Operations in the operations list response')
+    parser.add_argument('--duration', type=float, default=0.5, help='Seconds per measurement')
+    arguments = parser.parse_args()
+
+    payloads = sample_payloads(arguments.operations)
+    print(f'{"response":<42} {"bytes":>7} {"schema µs":>10} {"inner":>8} {"dict":>8} {"dataclass":>10}')
+    for schema in response_schemas():
+        content = payloads.get(schema.__name__)
+        if content is None:
+            print(f'{schema.__name__:<42} no sample payload')
+            continue
+
+        inner = inner_schema(schema)
+        baseline = measure(schema.model_validate_json, content, arguments.duration)
+        timings = [
+            measure(adapters.inner(schema, target=target).validate_json, content, arguments.duration)
+            for target in (None, lightweight(inner, 'dict'), lightweight(inner, 'dataclass'))
+        ]
+        speedups = [f'{baseline / timing:.2f}x' for timing in timings]
+        print(
+            f'{schema.__name__:<42} {len(content):>7} {baseline * 1e6:>10.1f} '
+            f'{speedups[0]:>8} {speedups[1]:>8} {speedups[2]:>10}'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,223 @@
+"""
+Registry of prebuilt pydantic TypeAdapters for response parsing.
+
+Most gateway responses wrap a single object or list (``{"operation": {...}}``), while callers
+only need the inner value. :meth:`AdapterRegistry.inner` builds an adapter validating the
+response body straight into the inner type, without allocating the wrapper schema::
+
+    operation = adapters.validate_inner(MakeFeeOperationResponseSchema, response.content)
+    operations = adapters.validate_inner(GetOperationsResponseSchema, response.content, field='operations')
+
+Hot paths may validate into lightweight targets instead of schema instances, see :func:`lightweight`::
+
+    Operation = lightweight(OperationSchema)
+    operation = adapters.validate_inner(MakeFeeOperationResponseSchema, response.content, target=Operation)
+    operation['cardId']
+
+Adapters are built on first use and cached, like the deferred schemas of :class:`BaseSchema`.
+"""
+import dataclasses
+import inspect
+from functools import partial
+from threading import Lock, RLock
+from typing import Annotated, Any, Literal, NotRequired, Union, get_args, get_origin
+
+from pydantic import BaseModel, Field, TypeAdapter
+from typing_extensions import TypedDict
+
+_lightweight: dict[tuple[type[BaseModel], str], type] = {}
+_lightweight_lock = RLock()
+
+
+def _replace_model(annotation: Any, model: type[BaseModel], target: type) -> Any:
+    """
+    Replaces ``model`` with ``target`` in ``X``, ``list[X]`` and ``X | None`` annotations.
+    """
+    if annotation is model:
+        return target
+    args = get_args(annotation)
+    if not args:
+        return annotation
+    replaced = tuple(_replace_model(arg, model, target) for arg in args)
+    origin = get_origin(annotation)
+    if origin is list:
+        return list[replaced[0]]
+    if type(None) in args:
+        return Union[replaced]
+    return annotation
+
+
+def _lightweight_annotation(annotation: Any, kind: str) -> Any:
+    if inspect.isclass(annotation) and issubclass(annotation, BaseModel):
+        return lightweight(annotation, kind)
+    for arg in get_args(annotation):
+        if inspect.isclass(arg) and issubclass(arg, BaseModel):
+            annotation = _replace_model(annotation, arg, lightweight(arg, kind))
+    return annotation
+
+
+def lightweight(schema: type[BaseModel], kind: Literal['dict', 'dataclass'] = 'dict') -> type:
+    """
+    Returns a lightweight validation target mirroring the schema, nested schemas included.
+
+    Field types and constraints are kept, so the data is validated the same way, but the result
+    is a plain ``dict`` (a ``TypedDict`` keyed by the API field names, the cheapest to build,
+    optional fields missing in the response are missing in the dict) or a slotted keyword-only
+    dataclass with the Python field names, optional fields missing in the response get a fresh
+    copy of the schema default.
+
+    :param schema: The schema to mirror.
+    :param kind: ``dict`` for a TypedDict, ``dataclass`` for a dataclass.
+    :return: The TypedDict or dataclass type, cached per schema.
+    """
+    key = (schema, kind)
+    target = _lightweight.get(key)
+    if target is not None:
+        return target
+
+    with _lightweight_lock:
+        target = _lightweight.get(key)
+        if target is not None:
+            return target
+
+        fields = {}
+        for name, field in schema.model_fields.items():
+            annotation = _lightweight_annotation(field.annotation, kind)
+            if field.metadata:
+                annotation = Annotated[annotation, *field.metadata]
+            fields[name] = (annotation, field)
+
+        if kind == 'dict':
+            target = TypedDict(schema.__name__, {
+                field.alias or name: annotation if field.is_required() else NotRequired[annotation]
+                for name, (annotation, field) in fields.items()
+            })
+        elif kind == 'dataclass':
+            target = dataclasses.make_dataclass(schema.__name__, [
+                (
+                    name,
+                    Annotated[annotation, Field(alias=field.alias)] if field.alias else annotation,
+                    dataclasses.field() if field.is_required() else dataclasses.field(
+                        default_factory=partial(field.get_default, call_default_factory=True)
+                    ),
+                )
+                for name, (annotation, field) in fields.items()
+            ], slots=True, kw_only=True)
+        else:
+            raise ValueError(f"Unknown lightweight target kind {kind!r}, expected 'dict' or 'dataclass'")
+
+        _lightweight[key] = target
+        return target
+
+
+class InnerAdapter:
+    """
+    Validates a wrapper response straight into the value of one of its fields.
+
+    :param schema: The wrapper response schema.
+    :param field: The field name, the only field of the schema if not set.
+    :param target: Optional type replacing the inner schema, e.g. :func:`lightweight` of it.
+    """
+
+    def __init__(self, schema: type[BaseModel], field: str | None = None, target: type | None = None):
+        if field is None:
+            required = [name for name, info in schema.model_fields.items() if info.is_required()]
+            if len(required) != 1:
+                raise ValueError(f'{schema.__name__} has {len(required)} required fields, the field should be given')
+            field = required[0]
+
+        info = schema.model_fields[field]
+        annotation = info.annotation
+        if target is not None:
+            for candidate in (annotation, *get_args(annotation)):
+                if inspect.isclass(candidate) and issubclass(candidate, BaseModel):
+                    annotation = _replace_model(annotation, candidate, target)
+                    break
+
+        self.key = info.alias or field
+        envelope = TypedDict(f'{schema.__name__}Envelope', {self.key: annotation}, total=info.is_required())
+        self.adapter = TypeAdapter(envelope)
+        self.info = info
+
+    def unwrap(self, envelope: dict[str, Any]) -> Any:
+        """
+        Returns the inner value of a validated envelope, a fresh default of the field if it is missing.
+        """
+        if self.key in envelope:
+            return envelope[self.key]
+        return self.info.get_default(call_default_factory=True)
+
+    def validate_json(self, content: bytes | str) -> Any:
+        """
+        Validates the JSON response body and returns the inner value.
+        """
+        return self.unwrap(self.adapter.validate_json(content))
+
+    def validate_python(self, data: dict[str, Any]) -> Any:
+        """
+        Validates the decoded response body and returns the inner value.
+        """
+        return self.unwrap(self.adapter.validate_python(data))
+
+
+class AdapterRegistry:
+    """
+    Cache of TypeAdapters, each one is built once and shared between threads.
+    """
+
+    def __init__(self):
+        self.adapters: dict[Any, TypeAdapter] = {}
+        self.inner_adapters: dict[tuple[type[BaseModel], str | None, type | None], InnerAdapter] = {}
+        self.lock = Lock()
+
+    def adapter(self, target: Any) -> TypeAdapter:
+        """
+        Returns the TypeAdapter of any type supported by pydantic (TypedDict, dataclass, ``list[Schema]``...).
+        """
+        adapter = self.adapters.get(target)
+        if adapter is None:
+            with self.lock:
+                adapter = self.adapters.get(target)
+                if adapter is None:
+                    adapter = self.adapters[target] = TypeAdapter(target)
+        return adapter
+
+    def inner(self, schema: type[BaseModel], field: str | None = None, target: type | None = None) -> InnerAdapter:
+        """
+        Returns the adapter of the inner value of a wrapper response, see :class:`InnerAdapter`.
+        """
+        key = (schema, field, target)
+        adapter = self.inner_adapters.get(key)
+        if adapter is None:
+            with self.lock:
+                adapter = self.inner_adapters.get(key)
+                if adapter is None:
+                    adapter = self.inner_adapters[key] = InnerAdapter(schema, field, target)
+        return adapter
+
+    def validate(self, target: Any, content: bytes | str) -> Any:
+        """
+        Validates a JSON body into the target type.
+        """
+        return self.adapter(target).validate_json(content)
+
+    def validate_inner(
+            self,
+            schema: type[BaseModel],
+            content: bytes | str,
+            field: str | None = None,
+            target: type | None = None
+    ) -> Any:
+        """
+        Validates a JSON wrapper response and returns the inner value.
+
+        :param schema: The wrapper response schema.
+        :param content: The response body.
+        :param field: The field name, the only required field of the schema if not set.
+        :param target: Optional type replacing the inner schema.
+        :return: The inner value.
+        """
+        return self.inner(schema, field, target).validate_json(content)
+
+
+adapters = AdapterRegistry()
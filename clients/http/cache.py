@@ -0,0 +1,132 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+
+from httpx import Response, URL, QueryParams
+
+
+@dataclass
+class CacheEntry:
+    """
+    Cached response together with its expiration time and validator.
+    """
+    response: Response
+    expires_at: float
+    etag: str | None = None
+
+    @property
+    def is_fresh(self) -> bool:
+        return time.monotonic() < self.expires_at
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU cache of GET responses with time-to-live.
+
+    Expired entries are kept until evicted, so responses with an ETag can be revalidated
+    with ``If-None-Match`` instead of being downloaded again.
+
+    :param max_size: Maximum number of cached responses, the least recently used one is evicted first.
+    :param ttl: Number of seconds a cached response is served without contacting the server.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float = 60.0):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.entries: OrderedDict[tuple[str, str, str], CacheEntry] = OrderedDict()
+        self.lock = Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+
+    @staticmethod
+    def build_key(
+            url: URL | str,
+            params: QueryParams | None = None,
+            base_url: URL | str = ''
+    ) -> tuple[str, str, str]:
+        """
+        Builds a cache key from the base URL of the client, the endpoint URL (including entity ID)
+        and query params, so a cache shared by clients of different gateways keeps their responses apart.
+
+        :param url: The endpoint URL
+        :param params: request query params
+        :param base_url: The base URL of the httpx.Client
+        :return: A hashable cache key.
+        """
+        return str(base_url), str(url), str(QueryParams(params))
+
+    def get(self, key: tuple[str, str, str]) -> CacheEntry | None:
+        """
+        Returns a cached entry, fresh or expired, and marks it as recently used.
+
+        A fresh entry is counted as a cache hit.
+
+        :param key: The cache key.
+        :return: The cache entry or None if the response is not cached.
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+                if entry.is_fresh:
+                    self.hits += 1
+            return entry
+
+    def put(self, key: tuple[str, str, str], response: Response) -> None:
+        """
+        Stores a response downloaded from the server, evicting the least recently used
+        entries above the size bound. Counted as a cache miss.
+
+        :param key: The cache key.
+        :param response: A successful, already read response.
+        """
+        entry = CacheEntry(
+            response=response,
+            expires_at=time.monotonic() + self.ttl,
+            etag=response.headers.get('ETag'),
+        )
+        with self.lock:
+            self.misses += 1
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def refresh(self, entry: CacheEntry) -> None:
+        """
+        Extends the lifetime of an entry confirmed by the server as not modified.
+
+        :param entry: The revalidated cache entry.
+        """
+        with self.lock:
+            self.revalidations += 1
+            entry.expires_at = time.monotonic() + self.ttl
+
+    def clear(self) -> None:
+        """
+        Drops all cached responses and resets the counters.
+        """
+        with self.lock:
+            self.entries.clear()
+            self.hits = self.misses = self.revalidations = 0
+
+    def stats(self) -> dict[str, int]:
+        """
+        Returns cache counters.
+
+        ``hits`` are responses served from the cache without a request, ``revalidations`` are
+        responses served from the cache after a ``304 Not Modified`` answer and ``misses`` are
+        responses downloaded from the server.
+
+        :return: A dictionary with the counters and the current cache size.
+        """
+        with self.lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'revalidations': self.revalidations,
+                'size': len(self.entries),
+            }
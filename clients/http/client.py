@@ -1,6 +1,18 @@
-from typing import Any
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+from typing import Any, Iterator, TypeVar
 
-from httpx import Client, URL, Response, QueryParams
+from httpx import Client, URL, Response, QueryParams, codes
+from pydantic import BaseModel
+
+from clients.http.adapters import adapters
+from clients.http.cache import ResponseCache
+from clients.http.coalescing import SingleFlight
+from clients.http.ratelimit import SHED_STATUS_CODES, RateLimiter, ShedRequestError, endpoint_key, parse_retry_after
+from clients.http.validation import SampledValidator
+from tools.streaming import DocumentBuffer, DocumentFile, extract_json_string
+
+T = TypeVar('T', bound=BaseModel)
 
 
 class HTTPClient:
@@ -10,24 +22,190 @@ class HTTPClient:
     :param client: An instance of httpx.Client to make HTTP requests
     """
 
-    def __init__(self, client: Client):
+    def __init__(
+            self,
+            client: Client,
+            cache: ResponseCache | None = None,
+            single_flight: SingleFlight | None = None,
+            validator: SampledValidator | None = None,
+            rate_limiter: RateLimiter | None = None
+    ):
         self.client = client
+        self.cache = cache
+        self.single_flight = single_flight
+        self.validator = validator
+        self.rate_limiter = rate_limiter
+
+    def parse(self, schema: type[T], response: Response) -> T:
+        """
+        Parses the JSON response body into the schema
+
+        Every response is validated, unless the schema is trusted by the sampled validator of the client.
+
+        :param schema: The response schema
+        :param response: The response to parse
+        :return: The schema instance
+        """
+        if self.validator is None:
+            return schema.model_validate_json(response.content)
+        return self.validator.parse(schema, response.content)
+
+    def parse_inner(
+            self,
+            schema: type[BaseModel],
+            response: Response,
+            field: str | None = None,
+            target: type | None = None
+    ) -> Any:
+        """
+        Parses a wrapper response straight into its inner value, without building the wrapper schema
+
+        The response is always validated, with an adapter from the shared registry, see
+        :mod:`clients.http.adapters`.
+
+        :param schema: The wrapper response schema, e.g. ``MakeFeeOperationResponseSchema``
+        :param response: The response to parse
+        :param field: The wrapper field, the only required field of the schema if not set
+        :param target: Optional type replacing the inner schema, e.g. ``lightweight(OperationSchema)``
+        :return: The inner value
+        """
+        return adapters.validate_inner(schema, response.content, field=field, target=target)
+
+    def check_shed(self, method: str, url: URL | str, response: Response) -> None:
+        """
+        Raises ShedRequestError if the gateway shed the request with 429 or 503
+
+        The ``Retry-After`` period is passed to the rate limiter, if the client has one.
+
+        :param method: The request method
+        :param url: The endpoint URL
+        :param response: The received response
+        """
+        if response.status_code not in SHED_STATUS_CODES:
+            return
+
+        retry_after = parse_retry_after(response.headers.get('Retry-After'))
+        if self.rate_limiter is not None:
+            self.rate_limiter.on_shed(method, url, retry_after)
+        raise ShedRequestError(endpoint_key(method, url), response.status_code, retry_after)
 
     def get(self, url: URL | str, params: QueryParams | None = None) -> Response:
         """
         Performs a GET request
 
+        If the client has a response cache, a fresh cached response is returned without a request
+        and an expired one is revalidated with ``If-None-Match`` when the server provided an ETag.
+        If the client has a single-flight group, concurrent identical requests share one response.
+        A 429/503 response raises ShedRequestError, see :mod:`clients.http.ratelimit`.
+
         :param url: The endpoint URL
         :param params: request query params
         :return: An httpx.Response object with the response data
         """
+        if self.cache is None:
+            return self._get(url, params=params)
+
+        key = self.cache.build_key(url, params, base_url=self.client.base_url)
+        entry = self.cache.get(key)
+        if entry is not None and entry.is_fresh:
+            return entry.response
+
+        headers = {'If-None-Match': entry.etag} if entry is not None and entry.etag else None
+        response = self._get(url, params=params, headers=headers)
+        if entry is not None and response.status_code == codes.NOT_MODIFIED:
+            self.cache.refresh(entry)
+            return entry.response
+
+        self.cache.put(key, response)
+        return response
+
+    def _get(
+            self,
+            url: URL | str,
+            params: QueryParams | None = None,
+            headers: dict[str, str] | None = None
+    ) -> Response:
+        if self.single_flight is None:
+            return self._send_get(url, params=params, headers=headers)
+
+        key = (
+            str(self.client.base_url), str(url), str(QueryParams(params)), tuple(sorted((headers or {}).items()))
+        )
+        return self.single_flight.do(key, lambda: self._send_get(url, params=params, headers=headers))
+
+    def _send_get(
+            self,
+            url: URL | str,
+            params: QueryParams | None = None,
+            headers: dict[str, str] | None = None
+    ) -> Response:
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire('GET', url)
         try:
-            response = self.client.get(url, params=params)
-            response.raise_for_status()
+            response = self.client.get(url, params=params, headers=headers)
+            self.check_shed('GET', url, response)
+            if response.status_code != codes.NOT_MODIFIED:
+                response.raise_for_status()
             return response
+        except ShedRequestError:
+            raise
         except Exception as ex:
             raise RuntimeError(f'Error occurred while performing GET-request: {ex}')
 
+    @contextmanager
+    def stream(self, url: URL | str, params: QueryParams | None = None) -> Iterator[Response]:
+        """
+        Performs a streaming GET request
+
+        The response body is not loaded into memory, it should be consumed with
+        ``response.iter_bytes()``/``response.iter_text()`` inside the ``with`` block.
+
+        :param url: The endpoint URL
+        :param params: request query params
+        :return: A context manager yielding an unread httpx.Response object
+        """
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire('GET', url)
+        with ExitStack() as stack:
+            try:
+                response = stack.enter_context(self.client.stream('GET', url, params=params))
+                self.check_shed('GET', url, response)
+                response.raise_for_status()
+            except ShedRequestError:
+                raise
+            except Exception as ex:
+                raise RuntimeError(f'Error occurred while performing the streaming GET-request: {ex}')
+            yield response
+
+    def download(
+            self,
+            url: URL | str,
+            key: str = 'document',
+            path: str | Path | None = None
+    ) -> tuple[bytes, DocumentBuffer | DocumentFile]:
+        """
+        Performs a streaming GET request extracting a large string field of the JSON response
+
+        The field value is written chunk by chunk into a buffer preallocated by the response
+        ``Content-Length``, or into a file if the path is given.
+
+        :param url: The endpoint URL
+        :param key: The name of the string field to extract
+        :param path: Optional path of the file to write the field value to
+        :return: The response JSON without the field value, and the buffer or file with the value
+        """
+        with self.stream(url) as response:
+            if path is not None:
+                target = DocumentFile(path)
+            else:
+                target = DocumentBuffer(int(response.headers.get('Content-Length', 0)))
+            try:
+                envelope = extract_json_string(response.iter_bytes(), key, target)
+            except Exception as ex:
+                target.close()
+                raise RuntimeError(f'Error occurred while downloading the {key!r} field: {ex}')
+        return envelope, target
+
     def post(self, url: URL | str, payload: Any | None = None) -> Response:
         """
         Performs a POST request
@@ -36,9 +214,14 @@ class HTTPClient:
         :param payload: The data to send in the request body. Only JSON-serializable Python objects
         :return: An httpx.Response object with the response data
         """
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire('POST', url)
         try:
             response = self.client.post(url, json=payload)
+            self.check_shed('POST', url, response)
             response.raise_for_status()
             return response
+        except ShedRequestError:
+            raise
         except Exception as ex:
             raise RuntimeError(f'Error occurred while performing the POST-request: {ex}')
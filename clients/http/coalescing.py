@@ -0,0 +1,87 @@
+from concurrent.futures import Future
+from threading import Lock
+from typing import TYPE_CHECKING, Awaitable, Callable, Hashable, TypeVar
+
+if TYPE_CHECKING:
+    import asyncio
+
+T = TypeVar('T')
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls made from different threads.
+
+    While a call with some key is in flight, other threads calling with the same key wait
+    for it and receive its result (or exception) instead of repeating the work.
+    """
+
+    def __init__(self):
+        self.lock = Lock()
+        self.calls: dict[Hashable, Future] = {}
+        self.shared = 0
+
+    def do(self, key: Hashable, func: Callable[[], T]) -> T:
+        """
+        Runs ``func`` unless a call with the same key is already running, then waits for that call.
+
+        :param key: Identity of the call, e.g. request method, URL and query params.
+        :param func: The function performing the work.
+        :return: The result of the single in-flight call.
+        """
+        with self.lock:
+            future = self.calls.get(key)
+            leader = future is None
+            if leader:
+                future = self.calls[key] = Future()
+            else:
+                self.shared += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = func()
+        except BaseException as ex:
+            future.set_exception(ex)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self.lock:
+                del self.calls[key]
+
+
+class AsyncSingleFlight:
+    """
+    Coalesces concurrent identical calls made from coroutines of one event loop.
+
+    Same as :class:`SingleFlight`, but for ``httpx.AsyncClient`` based code.
+    """
+
+    def __init__(self):
+        self.calls: dict[Hashable, 'asyncio.Task'] = {}
+        self.shared = 0
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        """
+        Awaits ``func()`` unless a call with the same key is already running, then awaits that call.
+
+        Cancellation of one waiter does not cancel the shared call.
+
+        :param key: Identity of the call, e.g. request method, URL and query params.
+        :param func: The coroutine function performing the work.
+        :return: The result of the single in-flight call.
+        """
+        # Imported here to keep asyncio out of the start-up of thread-based load jobs
+        import asyncio
+
+        task = self.calls.get(key)
+        if task is None:
+            task = self.calls[key] = asyncio.ensure_future(func())
+            task.add_done_callback(lambda _: self.calls.pop(key, None))
+        else:
+            self.shared += 1
+
+        return await asyncio.shield(task)
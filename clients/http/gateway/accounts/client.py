@@ -13,7 +13,11 @@ from clients.http.gateway.accounts.schema import (
     OpenSavingsAccountRequestSchema,
     OpenSavingsAccountResponseSchema,
 )
-from clients.http.gateway.client import build_gateway_http_client
+from clients.http.cache import ResponseCache
+from clients.http.coalescing import SingleFlight
+from clients.http.ratelimit import RateLimiter
+from clients.http.validation import SampledValidator
+from clients.http.gateway.client import get_gateway_http_client
 
 
 class AccountsGatewayHTTPClient(HTTPClient):
@@ -89,7 +93,7 @@ class AccountsGatewayHTTPClient(HTTPClient):
         """
         query = GetAccountsQuerySchema(user_id=user_id)
         response = self.get_accounts_api(query=query)
-        return GetAccountsResponseSchema.model_validate_json(response.text)
+        return self.parse(GetAccountsResponseSchema, response)
 
     def open_deposit_account(self, user_id: str) -> OpenDepositAccountResponseSchema:
         """
@@ -100,7 +104,7 @@ class AccountsGatewayHTTPClient(HTTPClient):
         """
         payload = OpenDepositAccountRequestSchema(user_id=user_id)
         response = self.open_deposit_account_api(payload=payload)
-        return OpenDepositAccountResponseSchema.model_validate_json(response.text)
+        return self.parse(OpenDepositAccountResponseSchema, response)
 
     def open_savings_account(self, user_id: str) -> OpenSavingsAccountResponseSchema:
         """
@@ -111,7 +115,7 @@ class AccountsGatewayHTTPClient(HTTPClient):
         """
         payload = OpenSavingsAccountRequestSchema(user_id=user_id)
         response = self.open_savings_account_api(payload=payload)
-        return OpenSavingsAccountResponseSchema.model_validate_json(response.text)
+        return self.parse(OpenSavingsAccountResponseSchema, response)
 
     def open_debit_card_account(self, user_id: str) -> OpenDebitCardAccountResponseSchema:
         """
@@ -122,7 +126,7 @@ class AccountsGatewayHTTPClient(HTTPClient):
         """
         payload = OpenDebitCardAccountRequestSchema(user_id=user_id)
         response = self.open_debit_card_account_api(payload=payload)
-        return OpenDebitCardAccountResponseSchema.model_validate_json(response.text)
+        return self.parse(OpenDebitCardAccountResponseSchema, response)
 
     def open_credit_card_account(self, user_id: str) -> OpenCreditCardAccountResponseSchema:
         """
@@ -133,14 +137,31 @@ class AccountsGatewayHTTPClient(HTTPClient):
         """
         payload = OpenCreditCardAccountRequestSchema(user_id=user_id)
         response = self.open_credit_card_account_api(payload=payload)
-        return OpenCreditCardAccountResponseSchema.model_validate_json(response.text)
+        return self.parse(OpenCreditCardAccountResponseSchema, response)
 
 
-def build_accounts_gateway_http_client() -> AccountsGatewayHTTPClient:
+def build_accounts_gateway_http_client(
+        cache: ResponseCache | None = None,
+        single_flight: SingleFlight | None = None,
+        validator: SampledValidator | None = None,
+        rate_limiter: RateLimiter | None = None,
+        target: str | None = None
+) -> AccountsGatewayHTTPClient:
     """
     Builds and returns an AccountsGatewayHTTPClient instance.
 
-    Uses the build_gateway_http_client function to create an underlying http client.
+    Uses the shared http client of the gateway target, see get_gateway_http_client.
+    :param cache: Optional response cache for GET requests, may be shared between clients.
+    :param single_flight: Optional group coalescing concurrent identical GET requests.
+    :param validator: Optional sampled validator, all responses are validated if not set.
+    :param rate_limiter: Optional per-endpoint back-off on 429/503, may be shared between clients.
+    :param target: The name of the gateway target, the default target if not set.
     :return: An instance of the AccountsGatewayHTTPClient.
     """
-    return AccountsGatewayHTTPClient(client=build_gateway_http_client())
+    return AccountsGatewayHTTPClient(
+        client=get_gateway_http_client(target),
+        cache=cache,
+        single_flight=single_flight,
+        validator=validator,
+        rate_limiter=rate_limiter,
+    )
@@ -1,7 +1,8 @@
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import Field, ConfigDict
 from enum import StrEnum, Enum
 
 from clients.http.gateway.cards.schema import CardSchema
+from clients.http.schema import BaseSchema
 
 
 class AccountType(StrEnum):
@@ -18,7 +19,7 @@ class AccountStatus(StrEnum):
     CLOSED = "CLOSED"
 
 
-class AccountSchema(BaseModel):
+class AccountSchema(BaseSchema):
     """
     Data structure representing an account.
 
@@ -31,7 +32,7 @@ class AccountSchema(BaseModel):
     balance: float
 
 
-class GetAccountsQuerySchema(BaseModel):
+class GetAccountsQuerySchema(BaseSchema):
     """
     Data structure for query parameters to retrieve accounts.
 
@@ -41,7 +42,7 @@ class GetAccountsQuerySchema(BaseModel):
     user_id: str = Field(alias='userId')
 
 
-class GetAccountsResponseSchema(BaseModel):
+class GetAccountsResponseSchema(BaseSchema):
     """
     Response data structure for retrieving user accounts.
 
@@ -50,7 +51,7 @@ class GetAccountsResponseSchema(BaseModel):
     accounts: list[AccountSchema]
 
 
-class OpenDepositAccountRequestSchema(BaseModel):
+class OpenDepositAccountRequestSchema(BaseSchema):
     """
     Data structure for opening deposit account.
     """
@@ -58,14 +59,14 @@ class OpenDepositAccountRequestSchema(BaseModel):
     user_id: str = Field(alias='userId')
 
 
-class OpenDepositAccountResponseSchema(BaseModel):
+class OpenDepositAccountResponseSchema(BaseSchema):
     """
     Response data structure for opening deposit account.
     """
     account: AccountSchema
 
 
-class OpenSavingsAccountRequestSchema(BaseModel):
+class OpenSavingsAccountRequestSchema(BaseSchema):
     """
     Data structure for opening savings account.
     """
@@ -73,14 +74,14 @@ class OpenSavingsAccountRequestSchema(BaseModel):
     user_id: str = Field(alias='userId')
 
 
-class OpenSavingsAccountResponseSchema(BaseModel):
+class OpenSavingsAccountResponseSchema(BaseSchema):
     """
     Response data structure for opening savings account.
     """
     account: AccountSchema
 
 
-class OpenDebitCardAccountRequestSchema(BaseModel):
+class OpenDebitCardAccountRequestSchema(BaseSchema):
     """
     Data structure for opening debit card account
     """
@@ -88,14 +89,14 @@ class OpenDebitCardAccountRequestSchema(BaseModel):
     user_id: str = Field(alias='userId')
 
 
-class OpenDebitCardAccountResponseSchema(BaseModel):
+class OpenDebitCardAccountResponseSchema(BaseSchema):
     """
     Response data structure for opening debit card account.
     """
     account: AccountSchema
 
 
-class OpenCreditCardAccountRequestSchema(BaseModel):
+class OpenCreditCardAccountRequestSchema(BaseSchema):
     """
     Data structure for opening credit card account
     """
@@ -103,7 +104,7 @@ class OpenCreditCardAccountRequestSchema(BaseModel):
     user_id: str = Field(alias='userId')
 
 
-class OpenCreditCardAccountResponseSchema(BaseModel):
+class OpenCreditCardAccountResponseSchema(BaseSchema):
     """
     Response data structure for opening credit card account.
     """
@@ -7,7 +7,11 @@ from clients.http.gateway.cards.schema import (
     IssueVirtualCardRequestSchema,
     IssueVirtualCardResponseSchema,
 )
-from clients.http.gateway.client import build_gateway_http_client
+from clients.http.cache import ResponseCache
+from clients.http.coalescing import SingleFlight
+from clients.http.ratelimit import RateLimiter
+from clients.http.validation import SampledValidator
+from clients.http.gateway.client import get_gateway_http_client
 
 
 class CardsGatewayHTTPClient(HTTPClient):
@@ -52,7 +56,7 @@ class CardsGatewayHTTPClient(HTTPClient):
         request_payload = IssueVirtualCardRequestSchema(user_id=user_id, account_id=account_id)
         response = self.issue_virtual_card_api(payload=request_payload)
 
-        return IssueVirtualCardResponseSchema.model_validate_json(response.text)
+        return self.parse(IssueVirtualCardResponseSchema, response)
 
     def issue_physical_card(self, user_id: str, account_id: str) -> IssuePhysicalCardResponseSchema:
         """
@@ -65,14 +69,31 @@ class CardsGatewayHTTPClient(HTTPClient):
         request_payload = IssuePhysicalCardRequestSchema(user_id=user_id, account_id=account_id)
         response = self.issue_physical_card_api(payload=request_payload)
 
-        return IssuePhysicalCardResponseSchema.model_validate_json(response.text)
+        return self.parse(IssuePhysicalCardResponseSchema, response)
 
 
-def build_cards_gateway_http_client() -> CardsGatewayHTTPClient:
+def build_cards_gateway_http_client(
+        cache: ResponseCache | None = None,
+        single_flight: SingleFlight | None = None,
+        validator: SampledValidator | None = None,
+        rate_limiter: RateLimiter | None = None,
+        target: str | None = None
+) -> CardsGatewayHTTPClient:
     """
     Builds and returns an instance of CardsGatewayHTTPClient.
 
-    Uses the build_gateway_http_client function to create an underlying http client.
+    Uses the shared http client of the gateway target, see get_gateway_http_client.
+    :param cache: Optional response cache for GET requests, may be shared between clients.
+    :param single_flight: Optional group coalescing concurrent identical GET requests.
+    :param validator: Optional sampled validator, all responses are validated if not set.
+    :param rate_limiter: Optional per-endpoint back-off on 429/503, may be shared between clients.
+    :param target: The name of the gateway target, the default target if not set.
     :return: An instance of CardsGatewayHTTPClient.
     """
-    return CardsGatewayHTTPClient(client=build_gateway_http_client())
+    return CardsGatewayHTTPClient(
+        client=get_gateway_http_client(target),
+        cache=cache,
+        single_flight=single_flight,
+        validator=validator,
+        rate_limiter=rate_limiter,
+    )
@@ -1,7 +1,9 @@
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import Field, ConfigDict
 from enum import StrEnum
 from datetime import date
 
+from clients.http.schema import BaseSchema
+
 
 class CardType(StrEnum):
     UNSPECIFIED = "UNSPECIFIED"
@@ -23,7 +25,7 @@ class CardPaymentSystem(StrEnum):
     VISA = "VISA"
 
 
-class CardSchema(BaseModel):
+class CardSchema(BaseSchema):
     """
     Data structure representing a card.
 
@@ -41,7 +43,7 @@ class CardSchema(BaseModel):
     payment_system: CardPaymentSystem = Field(alias = 'paymentSystem')
 
 
-class IssueVirtualCardRequestSchema(BaseModel):
+class IssueVirtualCardRequestSchema(BaseSchema):
     """
     Request payload for issuing a virtual card.
 
@@ -53,7 +55,7 @@ class IssueVirtualCardRequestSchema(BaseModel):
     account_id: str = Field(alias = 'accountId')
 
 
-class IssueVirtualCardResponseSchema(BaseModel):
+class IssueVirtualCardResponseSchema(BaseSchema):
     """
     Response data structure for issuing virtual card.
 
@@ -62,7 +64,7 @@ class IssueVirtualCardResponseSchema(BaseModel):
     card: CardSchema
 
 
-class IssuePhysicalCardRequestSchema(BaseModel):
+class IssuePhysicalCardRequestSchema(BaseSchema):
     """
     Request payload for issuing a physical card.
 
@@ -74,7 +76,7 @@ class IssuePhysicalCardRequestSchema(BaseModel):
     account_id: str = Field(alias='accountId')
 
 
-class IssuePhysicalCardResponseSchema(BaseModel):
+class IssuePhysicalCardResponseSchema(BaseSchema):
     """
     Response data structure for issuing physical card.
 
@@ -1,4 +1,78 @@
-from httpx import Client
+from threading import Lock
 
-def build_gateway_http_client() -> Client:
-    return Client(base_url='http://localhost:8003', timeout=90)
\ No newline at end of file
+from httpx import Client, Limits
+
+from clients.http.gateway.settings import get_settings
+from clients.http.transport import StreamLimitTransport
+
+_clients: dict[str, Client] = {}
+_clients_lock = Lock()
+
+
+def build_gateway_http_client(
+        limits: Limits | None = None,
+        http2: bool | None = None,
+        max_concurrent_streams: int | None = None,
+        target: str | None = None
+) -> Client:
+    """
+    Builds an httpx.Client for the http-gateway service.
+
+    The base URL, timeout, pool limits, headers and auth are taken from the target settings
+    (see :mod:`clients.http.gateway.settings`), the arguments override them.
+
+    The client is thread-safe and may be shared between threads, in this case the connection
+    pool should allow at least as many connections as there are threads.
+
+    With ``http2`` the client speaks HTTP/2 with prior knowledge (h2c, no HTTP/1.1 upgrade),
+    multiplexing concurrent requests over a single connection, so the connection limits
+    do not have to grow with the number of threads. HTTP/2 requires the optional ``h2``
+    package: ``pip install httpx[http2]``.
+
+    :param limits: Optional connection pool limits.
+    :param http2: Use HTTP/2 instead of HTTP/1.1.
+    :param max_concurrent_streams: Maximum number of concurrent HTTP/2 streams.
+    :param target: The name of the gateway target, the default target if not set.
+    :return: An instance of httpx.Client.
+    """
+    settings = get_settings().target(target)
+    limits = limits or settings.limits()
+    http2 = settings.http2 if http2 is None else http2
+    options = {'base_url': settings.base_url, 'timeout': settings.timeout, 'headers': settings.request_headers()}
+    if not http2:
+        return Client(**options, limits=limits)
+
+    try:
+        import h2  # noqa: F401
+    except ImportError as error:
+        raise ImportError(
+            "HTTP/2 mode requires the 'h2' package, install it with: pip install httpx[http2]"
+        ) from error
+
+    transport = StreamLimitTransport(
+        max_concurrent_streams=max_concurrent_streams or settings.max_concurrent_streams,
+        http1=False,
+        http2=True,
+        limits=limits,
+    )
+    return Client(**options, transport=transport)
+
+
+def get_gateway_http_client(target: str | None = None) -> Client:
+    """
+    Returns the shared httpx.Client of the gateway target, built on first use.
+
+    Every target has its own connection pool tuned by the target settings, so several gateway
+    instances (e.g. a canary and a stable one) can be loaded at the same time.
+
+    :param target: The name of the gateway target, the default target if not set.
+    :return: The shared instance of httpx.Client.
+    """
+    name = (target or get_settings().default).lower()
+    client = _clients.get(name)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(name)
+            if client is None:
+                client = _clients[name] = build_gateway_http_client(target=name)
+    return client
@@ -1,11 +1,20 @@
+from pathlib import Path
+
 from httpx import Response
 
 from clients.http.client import HTTPClient
-from clients.http.gateway.client import build_gateway_http_client
+from clients.http.cache import ResponseCache
+from clients.http.coalescing import SingleFlight
+from clients.http.ratelimit import RateLimiter
+from clients.http.validation import SampledValidator
+from clients.http.gateway.client import get_gateway_http_client
 from clients.http.gateway.documents.schema import (
+    GetContractDocumentEnvelopeSchema,
     GetContractDocumentResponseSchema,
+    GetTariffDocumentEnvelopeSchema,
     GetTariffDocumentResponseSchema,
 )
+from tools.streaming import StreamedDocument
 
 
 class DocumentsGatewayHTTPClient(HTTPClient):
@@ -40,7 +49,7 @@ class DocumentsGatewayHTTPClient(HTTPClient):
         """
         response = self.get_tariff_document_api(account_id=account_id)
 
-        return GetTariffDocumentResponseSchema.model_validate_json(response.text)
+        return self.parse(GetTariffDocumentResponseSchema, response)
 
     def get_contract_document(self, account_id: str) -> GetContractDocumentResponseSchema:
         """
@@ -51,14 +60,59 @@ class DocumentsGatewayHTTPClient(HTTPClient):
         """
         response = self.get_contract_document_api(account_id=account_id)
 
-        return GetContractDocumentResponseSchema.model_validate_json(response.text)
+        return self.parse(GetContractDocumentResponseSchema, response)
+
+    def stream_tariff_document(self, account_id: str, path: str | Path | None = None) -> StreamedDocument:
+        """
+        Streams the tariff document into memory or a file without decoding the response.
+
+        Only the document URL is validated, the document content is available as ``document``
+        (a memoryview, or a memory map of the file) until the result is closed.
+
+        :param account_id: The account ID to retrieve the tariff document for.
+        :param path: Optional path of the file to write the document to.
+        :return: A streamed document with GetTariffDocumentEnvelopeSchema envelope.
+        """
+        envelope, target = self.download(url=f'/api/v1/documents/tariff-document/{account_id}', path=path)
+        return StreamedDocument(GetTariffDocumentEnvelopeSchema.model_validate_json(envelope), target)
+
+    def stream_contract_document(self, account_id: str, path: str | Path | None = None) -> StreamedDocument:
+        """
+        Streams the contract document into memory or a file without decoding the response.
+
+        Only the document URL is validated, the document content is available as ``document``
+        (a memoryview, or a memory map of the file) until the result is closed.
+
+        :param account_id: The account ID to retrieve the contract document for.
+        :param path: Optional path of the file to write the document to.
+        :return: A streamed document with GetContractDocumentEnvelopeSchema envelope.
+        """
+        envelope, target = self.download(url=f'/api/v1/documents/contract-document/{account_id}', path=path)
+        return StreamedDocument(GetContractDocumentEnvelopeSchema.model_validate_json(envelope), target)
 
 
-def build_documents_gateway_http_client() -> DocumentsGatewayHTTPClient:
+def build_documents_gateway_http_client(
+        cache: ResponseCache | None = None,
+        single_flight: SingleFlight | None = None,
+        validator: SampledValidator | None = None,
+        rate_limiter: RateLimiter | None = None,
+        target: str | None = None
+) -> DocumentsGatewayHTTPClient:
     """
     Builds and returns an instance of the DocumentsGatewayHTTPClient class.
 
-    Uses the build_gateway_http_client function to create an underlying http client.
+    Uses the shared http client of the gateway target, see get_gateway_http_client.
+    :param cache: Optional response cache for GET requests, may be shared between clients.
+    :param single_flight: Optional group coalescing concurrent identical GET requests.
+    :param validator: Optional sampled validator, all responses are validated if not set.
+    :param rate_limiter: Optional per-endpoint back-off on 429/503, may be shared between clients.
+    :param target: The name of the gateway target, the default target if not set.
     :return: A DocumentsGatewayHTTPClient instance.
     """
-    return DocumentsGatewayHTTPClient(client=build_gateway_http_client())
+    return DocumentsGatewayHTTPClient(
+        client=get_gateway_http_client(target),
+        cache=cache,
+        single_flight=single_flight,
+        validator=validator,
+        rate_limiter=rate_limiter,
+    )
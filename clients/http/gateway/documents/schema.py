@@ -1,13 +1,30 @@
-from pydantic import BaseModel, HttpUrl
+from pydantic import HttpUrl
 
-class DocumentSchema(BaseModel):
+from clients.http.schema import BaseSchema
+
+class DocumentSchema(BaseSchema):
     url: HttpUrl
     document: str
 
 
-class GetTariffDocumentResponseSchema(BaseModel):
+class GetTariffDocumentResponseSchema(BaseSchema):
     tariff: DocumentSchema
 
 
-class GetContractDocumentResponseSchema(BaseModel):
-    contract: DocumentSchema
\ No newline at end of file
+class GetContractDocumentResponseSchema(BaseSchema):
+    contract: DocumentSchema
+
+
+class DocumentEnvelopeSchema(BaseSchema):
+    """
+    Document metadata without the content, see :meth:`HTTPClient.download`.
+    """
+    url: HttpUrl
+
+
+class GetTariffDocumentEnvelopeSchema(BaseSchema):
+    tariff: DocumentEnvelopeSchema
+
+
+class GetContractDocumentEnvelopeSchema(BaseSchema):
+    contract: DocumentEnvelopeSchema
@@ -1,13 +1,23 @@
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Iterator
+
 from httpx import Response, QueryParams
 
 from clients.http.client import HTTPClient
-from clients.http.gateway.client import build_gateway_http_client
+from clients.http.cache import ResponseCache
+from clients.http.coalescing import SingleFlight
+from clients.http.ratelimit import RateLimiter
+from clients.http.validation import SampledValidator
+from clients.http.gateway.client import get_gateway_http_client
 from clients.http.gateway.operations.schema import (
     GetOperationResponseSchema,
     GetOperationsQuerySchema,
     GetOperationsResponseSchema,
     GetOperationsSummaryQuerySchema,
     GetOperationsSummaryResponseSchema,
+    GetOperationReceiptEnvelopeSchema,
     GetOperationReceiptResponseSchema,
     MakeBillPaymentOperationRequestSchema,
     MakeBillPaymentOperationResponseSchema,
@@ -23,7 +33,10 @@ from clients.http.gateway.operations.schema import (
     MakeTopUpOperationResponseSchema,
     MakeTransferOperationRequestSchema,
     MakeTransferOperationResponseSchema,
+    OperationSchema,
+    OperationType,
 )
+from tools.streaming import StreamedDocument, iter_json_array
 
 
 class OperationsGatewayHTTPClient(HTTPClient):
@@ -37,7 +50,7 @@ class OperationsGatewayHTTPClient(HTTPClient):
         """
         return self.get(
             url='/api/v1/operations',
-            params=QueryParams(**query.model_dump(by_alias=True, exclude_unset=True))
+            params=QueryParams(**query.model_dump(mode='json', by_alias=True, exclude_none=True))
         )
 
     def get_operations_summary_api(
@@ -170,15 +183,96 @@ class OperationsGatewayHTTPClient(HTTPClient):
             payload=payload.model_dump(by_alias=True)
         )
 
-    def get_operations(self, account_id: str) -> GetOperationsResponseSchema:
-        """
-        Retrieves a list of all operations associated with a given account ID.
-        :param account_id:
+    def get_operations(
+            self,
+            account_id: str,
+            limit: int | None = None,
+            cursor: str | None = None,
+            operation_type: OperationType | None = None,
+            created_from: datetime | None = None,
+            created_to: datetime | None = None,
+    ) -> GetOperationsResponseSchema:
+        """
+        Retrieves a list of operations associated with a given account ID.
+
+        Without pagination and filter parameters the whole operations history is returned.
+
+        :param account_id: The account ID to retrieve operations for.
+        :param limit: Maximum number of operations to return.
+        :param cursor: Cursor of the page to retrieve, taken from ``next_cursor`` of the previous page.
+        :param operation_type: Return only operations of this type.
+        :param created_from: Return only operations created at or after this moment.
+        :param created_to: Return only operations created at or before this moment.
         :return: A response schema with list of operations.
         """
-        query = GetOperationsQuerySchema(accountId=account_id)
+        query = GetOperationsQuerySchema(
+            account_id=account_id,
+            limit=limit,
+            cursor=cursor,
+            operation_type=operation_type,
+            created_from=created_from,
+            created_to=created_to,
+        )
         response = self.get_operations_api(query=query)
-        return GetOperationsResponseSchema.model_validate_json(response.text)
+        return self.parse(GetOperationsResponseSchema, response)
+
+    def paginate_operations(
+            self,
+            account_id: str,
+            page_size: int = 20,
+            operation_type: OperationType | None = None,
+            created_from: datetime | None = None,
+            created_to: datetime | None = None,
+    ) -> Iterator[OperationSchema]:
+        """
+        Lazily retrieves operations associated with a given account ID page by page.
+
+        The next page is requested only when the previous one is consumed, so stopping
+        the iteration early saves the remaining requests.
+
+        :param account_id: The account ID to retrieve operations for.
+        :param page_size: Number of operations requested per page.
+        :param operation_type: Return only operations of this type.
+        :param created_from: Return only operations created at or after this moment.
+        :param created_to: Return only operations created at or before this moment.
+        :return: An iterator over operation schemas.
+        """
+        cursor = None
+        while True:
+            page = self.get_operations(
+                account_id=account_id,
+                limit=page_size,
+                cursor=cursor,
+                operation_type=operation_type,
+                created_from=created_from,
+                created_to=created_to,
+            )
+            yield from page.operations
+
+            cursor = page.next_cursor
+            if not cursor or not page.operations:
+                return
+
+    def iter_operations(self, account_id: str, limit: int | None = None) -> Iterator[OperationSchema]:
+        """
+        Lazily retrieves operations associated with a given account ID.
+
+        The response body is streamed and operations are validated one by one, so memory usage
+        does not depend on the size of the operations list. The connection is closed as soon as
+        the iterator is exhausted, closed or garbage collected.
+
+        :param account_id: The account ID to retrieve operations for.
+        :param limit: Stop after this number of operations. All operations are returned if not set.
+        :return: An iterator over operation schemas.
+        """
+        query = GetOperationsQuerySchema(account_id=account_id)
+        with self.stream(
+                url='/api/v1/operations',
+                params=QueryParams(**query.model_dump(mode='json', by_alias=True, exclude_none=True))
+        ) as response:
+            operations = iter_json_array(response.iter_text(), key='operations')
+            for operation in islice(operations, limit):
+                yield OperationSchema.model_validate(operation)
 
     def get_operations_summary(self, account_id: str) -> GetOperationsSummaryResponseSchema:
         """
@@ -188,7 +282,7 @@ class OperationsGatewayHTTPClient(HTTPClient):
         """
         query = GetOperationsSummaryQuerySchema(accountId=account_id)
         response = self.get_operations_summary_api(query=query)
-        return GetOperationsSummaryResponseSchema.model_validate_json(response.text)
+        return self.parse(GetOperationsSummaryResponseSchema, response)
 
     def get_operation_receipt(self, operation_id: str) -> GetOperationReceiptResponseSchema:
         """
@@ -198,7 +292,21 @@ class OperationsGatewayHTTPClient(HTTPClient):
         :return: A response schema containing the receipt information.
         """
         response = self.get_operation_receipt_api(operation_id=operation_id)
-        return GetOperationReceiptResponseSchema.model_validate_json(response.text)
+        return self.parse(GetOperationReceiptResponseSchema, response)
+
+    def stream_operation_receipt(self, operation_id: str, path: str | Path | None = None) -> StreamedDocument:
+        """
+        Streams the receipt of an operation into memory or a file without decoding the response.
+
+        Only the receipt URL is validated, the receipt content is available as ``document``
+        (a memoryview, or a memory map of the file) until the result is closed.
+
+        :param operation_id: The operation ID to retrieve receipt for.
+        :param path: Optional path of the file to write the receipt to.
+        :return: A streamed document with GetOperationReceiptEnvelopeSchema envelope.
+        """
+        envelope, target = self.download(url=f'/api/v1/operations/operation-receipt/{operation_id}', path=path)
+        return StreamedDocument(GetOperationReceiptEnvelopeSchema.model_validate_json(envelope), target)
 
     def get_operation(self, operation_id) -> GetOperationResponseSchema:
         """
@@ -208,7 +316,7 @@ class OperationsGatewayHTTPClient(HTTPClient):
         :return: A response schema containing the operation details.
         """
         response = self.get_operation_api(operation_id=operation_id)
-        return GetOperationResponseSchema.model_validate_json(response.text)
+        return self.parse(GetOperationResponseSchema, response)
 
     def make_fee_operation(
             self, card_id: str, account_id: str
@@ -221,7 +329,7 @@ class OperationsGatewayHTTPClient(HTTPClient):
         """
         request_payload = MakeFeeOperationRequestSchema(card_id=card_id, account_id=account_id)
         response = self.make_fee_operation_api(payload=request_payload)
-        return MakeFeeOperationResponseSchema.model_validate_json(response.text)
+        return self.parse(MakeFeeOperationResponseSchema, response)
 
     def make_top_up_operation(
             self, card_id: str, account_id: str
@@ -235,7 +343,7 @@ class OperationsGatewayHTTPClient(HTTPClient):
         """
         request_payload = MakeTopUpOperationRequestSchema(card_id=card_id, account_id=account_id)
         response = self.make_top_up_operation_api(payload=request_payload)
-        return MakeTopUpOperationResponseSchema.model_validate_json(response.text)
+        return self.parse(MakeTopUpOperationResponseSchema, response)
 
     def make_cashback_operation(
             self, card_id: str, account_id: str
@@ -249,7 +357,7 @@ class OperationsGatewayHTTPClient(HTTPClient):
         """
         request_payload = MakeCashbackOperationRequestSchema(card_id=card_id, account_id=account_id)
         response = self.make_cashback_operation_api(payload=request_payload)
-        return MakeCashbackOperationResponseSchema.model_validate_json(response.text)
+        return self.parse(MakeCashbackOperationResponseSchema, response)
 
     def make_transfer_operation(
             self, card_id: str, account_id: str
@@ -263,7 +371,7 @@ class OperationsGatewayHTTPClient(HTTPClient):
         """
         request_payload = MakeTransferOperationRequestSchema(card_id=card_id, account_id=account_id)
         response = self.make_transfer_operation_api(payload=request_payload)
-        return MakeTransferOperationResponseSchema.model_validate_json(response.text)
+        return self.parse(MakeTransferOperationResponseSchema, response)
 
     def make_purchase_operation(
             self, card_id: str, account_id: str
@@ -277,7 +385,7 @@ class OperationsGatewayHTTPClient(HTTPClient):
         """
         request_payload = MakePurchaseOperationRequestSchema(card_id=card_id, account_id=account_id)
         response = self.make_purchase_operation_api(payload=request_payload)
-        return MakePurchaseOperationResponseSchema.model_validate_json(response.text)
+        return self.parse(MakePurchaseOperationResponseSchema, response)
 
     def make_bill_payment_operation(
             self, card_id: str, account_id: str
@@ -291,7 +399,7 @@ class OperationsGatewayHTTPClient(HTTPClient):
         """
         request_payload = MakeBillPaymentOperationRequestSchema(card_id=card_id, account_id=account_id)
         response = self.make_bill_payment_operation_api(payload=request_payload)
-        return MakeBillPaymentOperationResponseSchema.model_validate_json(response.text)
+        return self.parse(MakeBillPaymentOperationResponseSchema, response)
 
     def make_cash_withdrawal_operation(
             self, card_id: str, account_id: str
@@ -305,14 +413,31 @@ class OperationsGatewayHTTPClient(HTTPClient):
         """
         request_payload = MakeCashWithdrawalOperationRequestSchema(card_id=card_id, account_id=account_id)
         response = self.make_cash_withdrawal_operation_api(payload=request_payload)
-        return MakeCashWithdrawalOperationResponseSchema.model_validate_json(response.text)
+        return self.parse(MakeCashWithdrawalOperationResponseSchema, response)
 
 
-def build_operations_gateway_http_client() -> OperationsGatewayHTTPClient:
+def build_operations_gateway_http_client(
+        cache: ResponseCache | None = None,
+        single_flight: SingleFlight | None = None,
+        validator: SampledValidator | None = None,
+        rate_limiter: RateLimiter | None = None,
+        target: str | None = None
+) -> OperationsGatewayHTTPClient:
     """
     Builds and returns an OperationsGatewayHTTPClient instance.
 
-    Uses the build_gateway_http_client function to create an underlying http client.
+    Uses the shared http client of the gateway target, see get_gateway_http_client.
+    :param cache: Optional response cache for GET requests, may be shared between clients.
+    :param single_flight: Optional group coalescing concurrent identical GET requests.
+    :param validator: Optional sampled validator, all responses are validated if not set.
+    :param rate_limiter: Optional per-endpoint back-off on 429/503, may be shared between clients.
+    :param target: The name of the gateway target, the default target if not set.
     :return: An instance of OperationsGatewayHTTPClient.
     """
-    return OperationsGatewayHTTPClient(client=build_gateway_http_client())
+    return OperationsGatewayHTTPClient(
+        client=get_gateway_http_client(target),
+        cache=cache,
+        single_flight=single_flight,
+        validator=validator,
+        rate_limiter=rate_limiter,
+    )
@@ -1,7 +1,8 @@
-from pydantic import BaseModel, Field, HttpUrl, ConfigDict
+from pydantic import Field, HttpUrl, ConfigDict
 from enum import StrEnum
 from datetime import datetime
 
+from clients.http.schema import BaseSchema
 from tools.fakers import fake
 
 
@@ -21,7 +22,7 @@ class OperationStatus(StrEnum):
     IN_PROGRESS = "IN_PROGRESS"
     UNSPECIFIED = "UNSPECIFIED"
 
-class OperationSchema(BaseModel):
+class OperationSchema(BaseSchema):
     """
     Data structure representing an operation.
 
@@ -37,7 +38,7 @@ class OperationSchema(BaseModel):
     account_id: str = Field(alias='accountId')
 
 
-class OperationsSummarySchema(BaseModel):
+class OperationsSummarySchema(BaseSchema):
     """
     Data structure representing a summary of operations.
 
@@ -48,7 +49,7 @@ class OperationsSummarySchema(BaseModel):
     cashback_amount: float = Field(alias='cashbackAmount')
 
 
-class OperationReceiptSchema(BaseModel):
+class OperationReceiptSchema(BaseSchema):
     """
     Data structure representing a receipt of an operation.
     """
@@ -56,23 +57,34 @@ class OperationReceiptSchema(BaseModel):
     document: str
 
 
-class GetOperationsQuerySchema(BaseModel):
+class GetOperationsQuerySchema(BaseSchema):
     """
     Data structure for a query parameters to retrieve operations.
 
-    Contains the account ID for which operations should be retrieved.
+    Contains the account ID for which operations should be retrieved and optional
+    pagination (limit, cursor) and filtering (operation type, creation date range) parameters.
     """
+    model_config = ConfigDict(populate_by_name=True)
+
     account_id: str = Field(alias='accountId')
+    limit: int | None = Field(default=None, gt=0)
+    cursor: str | None = None
+    operation_type: OperationType | None = Field(default=None, alias='type')
+    created_from: datetime | None = Field(default=None, alias='createdFrom')
+    created_to: datetime | None = Field(default=None, alias='createdTo')
 
 
-class GetOperationsResponseSchema(BaseModel):
+class GetOperationsResponseSchema(BaseSchema):
     """
     Response data structure for retrieving operations.
+
+    Contains the cursor of the next page if there are more operations to retrieve.
     """
     operations: list[OperationSchema]
+    next_cursor: str | None = Field(default=None, alias='nextCursor')
 
 
-class GetOperationsSummaryQuerySchema(BaseModel):
+class GetOperationsSummaryQuerySchema(BaseSchema):
     """
     Data structure for a query parameters to retrieve a summary of operations.
 
@@ -81,28 +93,42 @@ class GetOperationsSummaryQuerySchema(BaseModel):
     account_id: str = Field(alias='accountId')
 
 
-class GetOperationsSummaryResponseSchema(BaseModel):
+class GetOperationsSummaryResponseSchema(BaseSchema):
     """
     Data structure for retrieving operations summary information.
     """
     summary: OperationsSummarySchema
 
 
-class GetOperationReceiptResponseSchema(BaseModel):
+class GetOperationReceiptResponseSchema(BaseSchema):
     """
     Data structure for retrieving a receipt for an operation.
     """
     receipt: OperationReceiptSchema
 
 
-class GetOperationResponseSchema(BaseModel):
+class OperationReceiptEnvelopeSchema(BaseSchema):
+    """
+    Receipt metadata without the content, see :meth:`HTTPClient.download`.
+    """
+    url: HttpUrl
+
+
+class GetOperationReceiptEnvelopeSchema(BaseSchema):
+    """
+    Data structure for a streamed receipt of an operation.
+    """
+    receipt: OperationReceiptEnvelopeSchema
+
+
+class GetOperationResponseSchema(BaseSchema):
     """
     Response data structure for retrieving operation.
     """
     operation: OperationSchema
 
 
-class MakeOperationRequestSchema(BaseModel):
+class MakeOperationRequestSchema(BaseSchema):
     """
     Base data structure for a request to perform an operation.
 
@@ -125,7 +151,7 @@ class MakeFeeOperationRequestSchema(MakeOperationRequestSchema):
     ...
 
 
-class MakeFeeOperationResponseSchema(BaseModel):
+class MakeFeeOperationResponseSchema(BaseSchema):
     """
     Response data structure for making a fee operation.
     """
@@ -141,7 +167,7 @@ class MakeTopUpOperationRequestSchema(MakeOperationRequestSchema):
     ...
 
 
-class MakeTopUpOperationResponseSchema(BaseModel):
+class MakeTopUpOperationResponseSchema(BaseSchema):
     """
     Response data structure for making a top-up operation.
     """
@@ -157,7 +183,7 @@ class MakeCashbackOperationRequestSchema(MakeOperationRequestSchema):
     ...
 
 
-class MakeCashbackOperationResponseSchema(BaseModel):
+class MakeCashbackOperationResponseSchema(BaseSchema):
     """
     Response data structure for making a cashback operation.
     """
@@ -173,7 +199,7 @@ class MakeTransferOperationRequestSchema(MakeOperationRequestSchema):
     ...
 
 
-class MakeTransferOperationResponseSchema(BaseModel):
+class MakeTransferOperationResponseSchema(BaseSchema):
     """
     Response data structure for making a transfer operation.
     """
@@ -189,7 +215,7 @@ class MakePurchaseOperationRequestSchema(MakeOperationRequestSchema):
     category: str = Field(default_factory=fake.category)
 
 
-class MakePurchaseOperationResponseSchema(BaseModel):
+class MakePurchaseOperationResponseSchema(BaseSchema):
     """
     Response data structure for making a purchase operation.
     """
@@ -205,7 +231,7 @@ class MakeBillPaymentOperationRequestSchema(MakeOperationRequestSchema):
     ...
 
 
-class MakeBillPaymentOperationResponseSchema(BaseModel):
+class MakeBillPaymentOperationResponseSchema(BaseSchema):
     """
     Response data structure for making a bill payment operation.
     """
@@ -221,7 +247,7 @@ class MakeCashWithdrawalOperationRequestSchema(MakeOperationRequestSchema):
     ...
 
 
-class MakeCashWithdrawalOperationResponseSchema(BaseModel):
+class MakeCashWithdrawalOperationResponseSchema(BaseSchema):
     """
     Response data structure for making a cash withdrawal operation.
     """
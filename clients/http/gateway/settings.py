@@ -0,0 +1,155 @@
+"""
+Settings of the http-gateway targets.
+
+Targets are read from the ``[tool.gateway]`` table of ``pyproject.toml`` (or of the TOML file
+given in the ``GATEWAY_CONFIG`` environment variable)::
+
+    [tool.gateway]
+    default = "stable"
+
+    [tool.gateway.targets.stable]
+    base_url = "http://localhost:8003"
+    max_connections = 64
+
+    [tool.gateway.targets.canary]
+    base_url = "http://localhost:8004"
+    max_connections = 64
+    headers = { X-Release = "canary" }
+
+Every setting can be overridden by an environment variable ``GATEWAY__<TARGET>__<SETTING>``,
+e.g. ``GATEWAY__CANARY__BASE_URL=http://10.0.0.5:8003``, dictionaries are given as JSON.
+Target names are case-insensitive. ``GATEWAY__DEFAULT`` selects the default target, the first configured target is the default
+if not set. Without any configuration there is a single ``default`` target at ``http://localhost:8003``.
+"""
+import json
+import os
+import tomllib
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Mapping
+
+from httpx import Limits
+from pydantic import BaseModel, Field, field_validator
+
+ENV_PREFIX = 'GATEWAY__'
+CONFIG_PATH = Path(__file__).resolve().parents[3] / 'pyproject.toml'
+
+
+class TargetSettings(BaseModel):
+    """
+    Connection settings of one gateway instance.
+    """
+    base_url: str = 'http://localhost:8003'
+    timeout: float = 90.0
+    max_connections: int | None = 100
+    max_keepalive_connections: int | None = 20
+    keepalive_expiry: float | None = 5.0
+    http2: bool = False
+    max_concurrent_streams: int = 100
+    headers: dict[str, str] = Field(default_factory=dict)
+    auth_token: str | None = None
+
+    def limits(self) -> Limits:
+        return Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+    def request_headers(self) -> dict[str, str]:
+        """
+        Returns the default headers of the target, with the bearer token if set.
+        """
+        if self.auth_token is None:
+            return self.headers
+        return {**self.headers, 'Authorization': f'Bearer {self.auth_token}'}
+
+
+class GatewaySettings(BaseModel):
+    """
+    Named gateway targets and the default one, target names are case-insensitive.
+    """
+    default: str = 'default'
+    targets: dict[str, TargetSettings] = Field(default_factory=lambda: {'default': TargetSettings()})
+
+    @field_validator('default')
+    @classmethod
+    def normalize_default(cls, value: str) -> str:
+        return value.lower()
+
+    @field_validator('targets')
+    @classmethod
+    def normalize_targets(cls, value: dict[str, TargetSettings]) -> dict[str, TargetSettings]:
+        return {name.lower(): settings for name, settings in value.items()}
+
+    def target(self, name: str | None = None) -> TargetSettings:
+        """
+        Returns the settings of the target.
+
+        :param name: The target name, the default target if not set.
+        :return: The target settings.
+        """
+        name = (name or self.default).lower()
+        try:
+            return self.targets[name]
+        except KeyError:
+            raise ValueError(f'Unknown gateway target {name!r}, configured targets: {sorted(self.targets)}')
+
+
+def read_environment(environ: Mapping[str, str]) -> dict[str, Any]:
+    """
+    Collects ``GATEWAY__*`` variables into the settings structure.
+    """
+    config: dict[str, Any] = {}
+    for key, value in environ.items():
+        if not key.startswith(ENV_PREFIX):
+            continue
+
+        path = key[len(ENV_PREFIX):].lower().split('__')
+        if path == ['default']:
+            config['default'] = value
+        elif len(path) == 2:
+            target, setting = path
+            if value.startswith('{'):
+                value = json.loads(value)
+            config.setdefault('targets', {}).setdefault(target, {})[setting] = value
+    return config
+
+
+def load_settings(path: str | Path | None = None, environ: Mapping[str, str] | None = None) -> GatewaySettings:
+    """
+    Loads gateway settings from a TOML file and environment variables, the latter take precedence.
+
+    :param path: The TOML file, ``GATEWAY_CONFIG`` or the project ``pyproject.toml`` if not set.
+    :param environ: Environment variables, ``os.environ`` if not set.
+    :return: The validated settings.
+    """
+    environ = os.environ if environ is None else environ
+    path = Path(path or environ.get('GATEWAY_CONFIG') or CONFIG_PATH)
+
+    config: dict[str, Any] = {}
+    if path.exists():
+        with open(path, 'rb') as file:
+            config = tomllib.load(file).get('tool', {}).get('gateway', {})
+
+    overrides = read_environment(environ)
+    if 'default' in overrides:
+        config['default'] = overrides['default']
+    # Environment variable names are case-insensitive, so are target names
+    targets = config['targets'] = {name.lower(): settings for name, settings in config.get('targets', {}).items()}
+    for name, settings in overrides.get('targets', {}).items():
+        targets[name] = {**targets.get(name, {}), **settings}
+    if targets:
+        config.setdefault('default', next(iter(targets)))
+    else:
+        del config['targets']
+
+    return GatewaySettings.model_validate(config)
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> GatewaySettings:
+    """
+    Returns the settings loaded once per process, see :func:`load_settings`.
+    """
+    return load_settings()
@@ -1,12 +1,42 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+
 from httpx import Response
 
 from clients.http.client import HTTPClient
-from clients.http.gateway.client import build_gateway_http_client
+from clients.http.cache import ResponseCache
+from clients.http.coalescing import SingleFlight
+from clients.http.ratelimit import RateLimiter
+from clients.http.validation import SampledValidator
+from clients.http.gateway.client import get_gateway_http_client
 from clients.http.gateway.users.schema import (
     GetUserResponseSchema,
     CreateUserRequestSchema,
     CreateUserResponseSchema
 )
+from tools.fakers import fake
+
+
+@dataclass
+class CreateUsersResult:
+    """
+    Result of bulk user creation.
+
+    ``ids`` contains ids of the created users, ``failures`` maps indexes of the failed
+    payloads to error messages.
+    """
+    ids: list[str] = field(default_factory=list)
+    failures: dict[int, str] = field(default_factory=dict)
+    elapsed: float = 0.0
+
+    @property
+    def throughput(self) -> float:
+        """
+        Created users per second.
+        """
+        return len(self.ids) / self.elapsed if self.elapsed else 0.0
 
 
 class UsersGatewayHTTPClient(HTTPClient):
@@ -25,6 +55,15 @@ class UsersGatewayHTTPClient(HTTPClient):
         """
         return self.post('/api/v1/users', payload=payload.model_dump(by_alias=True))
 
+    def create_user_raw_api(self, payload: dict[str, Any]) -> Response:
+        """
+        Creates new user from an already serialized payload, see ``fake.user_payloads``.
+
+        :param payload: The user creation data with API field names.
+        :return: The server response(httpx.Response object).
+        """
+        return self.post('/api/v1/users', payload=payload)
+
     def get_user_api(self, user_id: str) -> Response:
         """
         Retrieves user data using raw API endpoint.
@@ -42,7 +81,7 @@ class UsersGatewayHTTPClient(HTTPClient):
         :return: A response schema containing the user data.
         """
         response = self.get_user_api(user_id)
-        return GetUserResponseSchema.model_validate_json(response.text)
+        return self.parse(GetUserResponseSchema, response)
 
     def create_user(self) -> CreateUserResponseSchema:
         """
@@ -52,14 +91,68 @@ class UsersGatewayHTTPClient(HTTPClient):
         """
         create_user_payload = CreateUserRequestSchema()
         response = self.create_user_api(create_user_payload)
-        return CreateUserResponseSchema.model_validate_json(response.text)
+        return self.parse(CreateUserResponseSchema, response)
+
+    def create_users(self, n: int, concurrency: int = 32) -> CreateUsersResult:
+        """
+        Creates users in bulk with concurrent requests over the shared connection pool.
+
+        Payloads are generated upfront with ``fake.user_payloads``, then ``concurrency`` threads
+        send them, each its own share of the payloads. A failed request does not stop the others,
+        it is reported in ``failures``. The connection pool of the client should allow at least
+        ``concurrency`` connections.
+
+        :param n: Number of users to create.
+        :param concurrency: Number of concurrent requests, at least 1.
+        :return: Ids of the created users, failures and creation throughput.
+        """
+        if concurrency < 1:
+            raise ValueError(f'Concurrency should be at least 1, got {concurrency}')
+
+        payloads = fake.user_payloads(n)
+
+        def create(worker: int) -> CreateUsersResult:
+            result = CreateUsersResult()
+            for index in range(worker, n, concurrency):
+                try:
+                    response = self.create_user_raw_api(payloads[index])
+                    result.ids.append(self.parse(CreateUserResponseSchema, response).user.id)
+                except Exception as ex:
+                    result.failures[index] = str(ex)
+            return result
+
+        result = CreateUsersResult()
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='create-users') as executor:
+            for worker_result in executor.map(create, range(min(concurrency, n))):
+                result.ids.extend(worker_result.ids)
+                result.failures.update(worker_result.failures)
+        result.elapsed = time.perf_counter() - start
+        return result
 
 
-def build_users_gateway_http_client() -> UsersGatewayHTTPClient:
+def build_users_gateway_http_client(
+        cache: ResponseCache | None = None,
+        single_flight: SingleFlight | None = None,
+        validator: SampledValidator | None = None,
+        rate_limiter: RateLimiter | None = None,
+        target: str | None = None
+) -> UsersGatewayHTTPClient:
     """
     Builds and returns an UsersGatewayHTTPClient instance.
 
-    Uses the build_gateway_http_client function to create an underlying http client.
+    Uses the shared http client of the gateway target, see get_gateway_http_client.
+    :param cache: Optional response cache for GET requests, may be shared between clients.
+    :param single_flight: Optional group coalescing concurrent identical GET requests.
+    :param validator: Optional sampled validator, all responses are validated if not set.
+    :param rate_limiter: Optional per-endpoint back-off on 429/503, may be shared between clients.
+    :param target: The name of the gateway target, the default target if not set.
     :return: An instance of UsersGatewayHTTPClient.
     """
-    return UsersGatewayHTTPClient(client=build_gateway_http_client())
+    return UsersGatewayHTTPClient(
+        client=get_gateway_http_client(target),
+        cache=cache,
+        single_flight=single_flight,
+        validator=validator,
+        rate_limiter=rate_limiter,
+    )
@@ -1,9 +1,10 @@
-from pydantic import BaseModel, Field, EmailStr, ConfigDict
+from pydantic import Field, EmailStr, ConfigDict
 
+from clients.http.schema import BaseSchema
 from tools.fakers import fake
 
 
-class UserSchema(BaseModel):
+class UserSchema(BaseSchema):
     """
     Data structure representing a user.
     """
@@ -15,14 +16,14 @@ class UserSchema(BaseModel):
     phone_number: str = Field(alias='phoneNumber')
 
 
-class GetUserResponseSchema(BaseModel):
+class GetUserResponseSchema(BaseSchema):
     """
     Response data structure for retrieving user data.
     """
     user: UserSchema
 
 
-class CreateUserRequestSchema(BaseModel):
+class CreateUserRequestSchema(BaseSchema):
     """
     Data structure for creating a new user.
     """
@@ -35,7 +36,7 @@ class CreateUserRequestSchema(BaseModel):
     phone_number: str = Field(alias='phoneNumber', default_factory=fake.phone_number)
 
 
-class CreateUserResponseSchema(BaseModel):
+class CreateUserResponseSchema(BaseSchema):
     """
     Response data structure for creating a new user.
     """
@@ -0,0 +1,210 @@
+import re
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from threading import Lock
+
+from httpx import URL, codes
+
+SHED_STATUS_CODES = (codes.TOO_MANY_REQUESTS, codes.SERVICE_UNAVAILABLE)
+
+# Path segments identifying an entity (UUIDs, numbers), replaced to group requests by endpoint
+_ID_SEGMENT = re.compile(r'/(?:[0-9a-fA-F]{8}-[0-9a-fA-F-]{27}|\d+)(?=/|$)')
+
+
+class ShedRequestError(RuntimeError):
+    """
+    The request was shed: rejected by the gateway with 429/503, or skipped by the client-side rate limiter.
+
+    :param endpoint: The endpoint key, e.g. ``GET /api/v1/users/{id}``.
+    :param status_code: The response status, None if the request was skipped without sending.
+    :param retry_after: Seconds until the endpoint accepts requests again, if known.
+    """
+
+    def __init__(self, endpoint: str, status_code: int | None, retry_after: float | None):
+        self.endpoint = endpoint
+        self.status_code = status_code
+        self.retry_after = retry_after
+        reason = f'status {status_code}' if status_code is not None else 'skipped by the rate limiter'
+        suffix = f', retry after {retry_after:.3f} s' if retry_after is not None else ''
+        super().__init__(f'Request to {endpoint} was shed ({reason}){suffix}')
+
+
+def endpoint_key(method: str, url: URL | str) -> str:
+    """
+    Returns the endpoint key of a request, entity IDs in the path are replaced with ``{id}``.
+    """
+    return f'{method} {_ID_SEGMENT.sub("/{id}", URL(url).path)}'
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """
+    Parses the ``Retry-After`` header, given either in seconds or as an HTTP date.
+
+    :return: Seconds to wait, None if the header is missing or malformed.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """
+    Token bucket of one endpoint, which can be blocked for a ``Retry-After`` period.
+
+    :param rate: Tokens per second, None for no rate limit (the bucket only follows ``Retry-After``).
+    :param burst: Maximum number of accumulated tokens.
+    """
+
+    def __init__(self, rate: float | None = None, burst: float = 1.0):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = Lock()
+
+    def refill(self, now: float) -> None:
+        if self.rate is not None:
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self) -> float:
+        """
+        Takes a token, possibly in advance.
+
+        :return: Seconds to wait before the request may be sent.
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.refill(now)
+            delay = max(0.0, self.blocked_until - now)
+            if self.rate is not None:
+                self.tokens -= 1
+                if self.tokens < 0:
+                    delay = max(delay, -self.tokens / self.rate)
+            return delay
+
+    def try_acquire(self) -> float | None:
+        """
+        Takes a token if one is available right now.
+
+        :return: None if the token was taken, otherwise seconds until the bucket is unblocked (may be 0).
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.refill(now)
+            if now < self.blocked_until:
+                return self.blocked_until - now
+            if self.rate is not None:
+                if self.tokens < 1:
+                    return (1 - self.tokens) / self.rate
+                self.tokens -= 1
+            return None
+
+    def block(self, seconds: float) -> None:
+        """
+        Blocks the bucket for ``seconds`` and drops the accumulated tokens.
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.blocked_until = max(self.blocked_until, now + seconds)
+            self.tokens = min(self.tokens, 0.0)
+            self.updated = now
+
+
+@dataclass
+class ShedStats:
+    """
+    Shedding counters of one endpoint.
+
+    ``shed`` counts requests rejected by the gateway, ``skipped`` counts requests not sent
+    because the endpoint was blocked, ``waited`` is the total back-off time in seconds.
+    """
+    shed: int = 0
+    skipped: int = 0
+    waited: float = 0.0
+
+
+class RateLimiter:
+    """
+    Per-endpoint back-off driven by the gateway load shedding.
+
+    When the gateway responds with 429 or 503, the endpoint bucket is blocked for the
+    ``Retry-After`` period (``default_retry_after`` if the header is missing). Requests to a
+    blocked endpoint are then either delayed until it is unblocked (``wait`` mode, closed model),
+    or not sent at all and failed with :class:`ShedRequestError` (``skip`` mode). Skipping keeps
+    open-model schedules honest: arrivals continue at the target rate instead of queueing up
+    behind the back-off.
+
+    :param mode: ``wait`` or ``skip``.
+    :param rates: Optional static request rates by endpoint key, see :func:`endpoint_key`.
+    :param default_retry_after: Block duration in seconds when the response has no ``Retry-After``.
+    """
+
+    def __init__(self, mode: str = 'wait', rates: dict[str, float] | None = None, default_retry_after: float = 1.0):
+        if mode not in ('wait', 'skip'):
+            raise ValueError(f"Unknown rate limiter mode {mode!r}, expected 'wait' or 'skip'")
+
+        self.mode = mode
+        self.rates = rates or {}
+        self.default_retry_after = default_retry_after
+        self.buckets: dict[str, TokenBucket] = {}
+        self.stats: dict[str, ShedStats] = {}
+        self.lock = Lock()
+
+    def bucket(self, endpoint: str) -> TokenBucket:
+        bucket = self.buckets.get(endpoint)
+        if bucket is None:
+            with self.lock:
+                bucket = self.buckets.get(endpoint)
+                if bucket is None:
+                    bucket = self.buckets[endpoint] = TokenBucket(rate=self.rates.get(endpoint))
+                    self.stats[endpoint] = ShedStats()
+        return bucket
+
+    def acquire(self, method: str, url: URL | str) -> None:
+        """
+        Waits until the endpoint accepts requests, or raises ShedRequestError in ``skip`` mode.
+        """
+        endpoint = endpoint_key(method, url)
+        bucket = self.bucket(endpoint)
+        if self.mode == 'skip':
+            retry_after = bucket.try_acquire()
+            if retry_after is not None:
+                with self.lock:
+                    self.stats[endpoint].skipped += 1
+                raise ShedRequestError(endpoint, None, retry_after)
+            return
+
+        delay = bucket.reserve()
+        if delay > 0:
+            with self.lock:
+                self.stats[endpoint].waited += delay
+            time.sleep(delay)
+
+    def on_shed(self, method: str, url: URL | str, retry_after: float | None) -> None:
+        """
+        Blocks the endpoint after a shed response.
+        """
+        endpoint = endpoint_key(method, url)
+        self.bucket(endpoint).block(self.default_retry_after if retry_after is None else retry_after)
+        with self.lock:
+            self.stats[endpoint].shed += 1
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """
+        Returns shedding counters of every endpoint which has been requested.
+        """
+        with self.lock:
+            return {
+                endpoint: {'shed': stats.shed, 'skipped': stats.skipped, 'waited': stats.waited}
+                for endpoint, stats in sorted(self.stats.items())
+            }
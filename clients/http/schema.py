@@ -0,0 +1,12 @@
+from pydantic import BaseModel, ConfigDict
+
+
+class BaseSchema(BaseModel):
+    """
+    Base class for API request and response schemas.
+
+    Validation and serialization schemas are built on first use instead of at import time,
+    which keeps start-up of short-lived processes fast and postpones loading of optional
+    validators (e.g. ``email_validator`` for ``EmailStr``) until they are actually needed.
+    """
+    model_config = ConfigDict(defer_build=True)
@@ -0,0 +1,88 @@
+import time
+from typing import Any
+
+from httpx import Client, Request
+
+from tools.metrics import Metrics
+
+# httpcore trace events by phase, DNS resolution is a part of ``connection.connect_tcp``
+PHASES = {
+    'connection.connect_tcp': 'connect',
+    'connection.start_tls': 'tls',
+    'http11.send_request_headers': 'send',
+    'http11.send_request_body': 'send',
+    'http2.send_connection_init': 'send',
+    'http2.send_request_headers': 'send',
+    'http2.send_request_body': 'send',
+    'http11.receive_response_headers': 'wait',
+    'http2.receive_response_headers': 'wait',
+    'http11.receive_response_body': 'receive',
+    'http2.receive_response_body': 'receive',
+}
+CLOSE_EVENTS = ('http11.response_closed.complete', 'http2.response_closed.complete')
+
+
+class PhaseTimer:
+    """
+    Collects per-request phase timings from httpcore trace events.
+
+    Every request is split into phases, each aggregated into its own histogram:
+
+    - ``queue``: from sending the request to the first network activity, i.e. waiting
+      for a free connection in the pool;
+    - ``connect``: DNS resolution and TCP connection setup (new connections only);
+    - ``tls``: TLS handshake (new HTTPS connections only);
+    - ``send``: writing request headers and body;
+    - ``wait``: waiting for the response headers, i.e. server processing time;
+    - ``receive``: reading the response body.
+    """
+
+    def __init__(self):
+        self.metrics = Metrics()
+
+    def install(self, client: Client) -> Client:
+        """
+        Enables phase tracing for all requests of the client, e.g. ``timer.install(users_client.client)``.
+
+        :param client: The client to trace.
+        :return: The same client.
+        """
+        hooks = client.event_hooks
+        hooks['request'].append(self.on_request)
+        client.event_hooks = hooks
+        return client
+
+    def on_request(self, request: Request) -> None:
+        """
+        Sets the trace callback of the request. A callback set before, by the caller or another
+        timer, is kept and called first.
+        """
+        previous = request.extensions.get('trace')
+        sent_at = time.perf_counter()
+        started: dict[str, float] = {}
+        phases: dict[str, float] = {}
+
+        def trace(event_name: str, info: dict[str, Any]) -> None:
+            if previous is not None:
+                previous(event_name, info)
+            now = time.perf_counter()
+            if not started and 'queue' not in phases:
+                phases['queue'] = now - sent_at
+
+            name, _, state = event_name.rpartition('.')
+            if state == 'started':
+                started[name] = now
+            elif state == 'complete' and name in PHASES and name in started:
+                phase = PHASES[name]
+                phases[phase] = phases.get(phase, 0.0) + now - started.pop(name)
+
+            if event_name in CLOSE_EVENTS:
+                self.metrics.record_many([(phase, elapsed, False) for phase, elapsed in phases.items()])
+
+        request.extensions['trace'] = trace
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """
+        Returns statistics of every phase, see :meth:`tools.metrics.Metrics.summary`.
+        """
+        return self.metrics.summary()
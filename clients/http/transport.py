@@ -0,0 +1,55 @@
+from threading import BoundedSemaphore
+from typing import Iterator
+
+from httpx import HTTPTransport, Request, Response, SyncByteStream
+
+
+class StreamSlotByteStream(SyncByteStream):
+    """
+    Response body stream releasing the stream slot when the response is closed.
+    """
+
+    def __init__(self, stream: SyncByteStream, slots: BoundedSemaphore):
+        self.stream = stream
+        self.slots = slots
+        self.released = False
+
+    def __iter__(self) -> Iterator[bytes]:
+        yield from self.stream
+
+    def close(self) -> None:
+        try:
+            self.stream.close()
+        finally:
+            if not self.released:
+                self.released = True
+                self.slots.release()
+
+
+class StreamLimitTransport(HTTPTransport):
+    """
+    HTTP transport limiting the number of requests in flight.
+
+    With HTTP/2 all requests to the gateway are multiplexed over a single connection, and httpcore
+    only caps the number of concurrent streams by the server setting (at most 100), so the limit
+    is enforced here: a request waits for a free stream slot, which is released when its response
+    is closed.
+
+    :param max_concurrent_streams: Maximum number of requests in flight.
+    :param kwargs: ``httpx.HTTPTransport`` parameters.
+    """
+
+    def __init__(self, max_concurrent_streams: int, **kwargs):
+        super().__init__(**kwargs)
+        self.slots = BoundedSemaphore(max_concurrent_streams)
+
+    def handle_request(self, request: Request) -> Response:
+        self.slots.acquire()
+        try:
+            response = super().handle_request(request)
+        except BaseException:
+            self.slots.release()
+            raise
+
+        response.stream = StreamSlotByteStream(response.stream, self.slots)
+        return response
@@ -0,0 +1,247 @@
+import inspect
+import json
+import random
+import types
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+from enum import Enum
+from functools import lru_cache
+from queue import Full, Queue
+from threading import Lock, Thread
+from typing import Any, Callable, Iterable, TypeVar, Union, get_args, get_origin
+from uuid import UUID
+
+from pydantic import AnyUrl, BaseModel, TypeAdapter, ValidationError
+
+T = TypeVar('T', bound=BaseModel)
+
+_set_attribute = object.__setattr__
+
+
+def construct(schema: type[T], data: dict[str, Any]) -> T:
+    """
+    Builds a schema instance from decoded JSON without validation, nested schemas included.
+
+    Missing optional fields get their defaults. Enums, dates, URLs, UUIDs and decimals are
+    converted to the field types, other values are taken as is (constraints and validators
+    such as ``EmailStr`` are not checked), so the instance has the same types as a validated one.
+    A missing required field or a value which cannot be converted raises ValueError.
+
+    :param schema: The schema class.
+    :param data: Decoded JSON object with API field names (aliases).
+    :return: The schema instance.
+    """
+    values = {}
+    fields_set = set()
+    for name, field in schema.model_fields.items():
+        key = field.alias or name
+        if key in data:
+            values[name] = _construct_value(field.annotation, data[key])
+            fields_set.add(name)
+        elif field.is_required():
+            raise ValueError(f'{schema.__name__} requires the {key!r} field')
+        else:
+            values[name] = field.get_default(call_default_factory=True)
+
+    instance = schema.__new__(schema)
+    _set_attribute(instance, '__dict__', values)
+    _set_attribute(instance, '__pydantic_fields_set__', fields_set)
+    _set_attribute(instance, '__pydantic_extra__', None)
+    _set_attribute(instance, '__pydantic_private__', None)
+    return instance
+
+
+def _construct_value(annotation: Any, value: Any) -> Any:
+    if value is None:
+        return None
+    if isinstance(value, dict):
+        for candidate in (annotation, *get_args(annotation)):
+            if inspect.isclass(candidate) and issubclass(candidate, BaseModel):
+                return construct(candidate, value)
+    elif isinstance(value, list) and (args := get_args(annotation)):
+        return [_construct_value(args[0], item) for item in value]
+    converter = _converter(annotation)
+    return value if converter is None else converter(value)
+
+
+@lru_cache(maxsize=None)
+def _converter(annotation: Any) -> Callable[[Any], Any] | None:
+    """
+    Returns the conversion of a JSON value to a non-JSON field type, None for JSON types.
+    """
+    if get_origin(annotation) in (Union, types.UnionType):
+        converters = [_converter(arg) for arg in get_args(annotation) if arg is not type(None)]
+        return converters[0] if len(converters) == 1 else None
+    if not inspect.isclass(annotation):
+        return None
+    if issubclass(annotation, Enum):
+        return annotation
+    if issubclass(annotation, (date, UUID, Decimal, AnyUrl)):
+        return TypeAdapter(annotation).validate_python
+    return None
+
+
+def field_path(location: tuple[int | str, ...]) -> str:
+    """
+    Formats a pydantic error location, list indexes are collapsed: ``accounts[].cards[].paymentSystem``.
+    """
+    path = ''
+    for part in location:
+        if isinstance(part, int):
+            path += '[]'
+        else:
+            path += f'.{part}' if path else part
+    return path
+
+
+@dataclass
+class ContractViolation:
+    """
+    Aggregated validation errors of one field of a response schema.
+    """
+    schema: str
+    path: str
+    type: str
+    count: int
+    message: str
+    example: Any
+
+
+class SampledValidator:
+    """
+    Skips validation of trusted response schemas, validating a sample of them in a background thread.
+
+    Responses of trusted schemas (all schemas by default) are built without validation (see
+    :func:`construct`), which pays off for schemas with Python-level validators (e.g. ``EmailStr``).
+    A sample of them is validated again in the background thread, so a violation of constraints
+    not checked by :func:`construct` does not fail the request but is reported in :meth:`violations`.
+
+    A response which cannot be built without validation (malformed JSON, an unknown enum member,
+    a malformed date...) is fully validated instead: the violation is reported and ValidationError
+    is raised. Responses of schemas which are not trusted are always fully validated, an invalid
+    one is reported and raises ValidationError the same way.
+
+    :param rate: Fraction of validated responses of every trusted schema.
+    :param rates: Fractions by response schema name, overriding ``rate``.
+    :param queue_size: Capacity of the background queue, samples are dropped when it is full.
+    :param trusted: Response schemas built without validation, all schemas if not set.
+    """
+
+    def __init__(
+            self,
+            rate: float = 0.01,
+            rates: dict[str, float] | None = None,
+            queue_size: int = 10000,
+            trusted: Iterable[type[BaseModel]] | None = None
+    ):
+        self.rate = rate
+        self.rates = rates or {}
+        self.queue: Queue[tuple[type[BaseModel], bytes]] = Queue(maxsize=queue_size)
+        self.lock = Lock()
+        self.trusted: frozenset[type[BaseModel]] | None = frozenset(trusted) if trusted is not None else None
+        self.validated: dict[str, int] = {}
+        self.invalid: dict[str, int] = {}
+        self.dropped = 0
+        self.errors: dict[tuple[str, str, str], ContractViolation] = {}
+        self.thread: Thread | None = None
+
+    def parse(self, schema: type[T], content: bytes) -> T:
+        """
+        Parses a response body, scheduling its validation if it is sampled.
+
+        :raises ValidationError: If the response is validated and invalid.
+
+        :param schema: The response schema.
+        :param content: The response body.
+        :return: The schema instance.
+        """
+        if self.trusted is None or schema in self.trusted:
+            try:
+                instance = construct(schema, json.loads(content))
+            except (ValueError, TypeError):
+                # Not convertible without validation, e.g. an unknown enum member, validated below
+                pass
+            else:
+                if random.random() < self.rates.get(schema.__name__, self.rate):
+                    self.submit(schema, content)
+                return instance
+
+        try:
+            return schema.model_validate_json(content)
+        except ValidationError as error:
+            self.report(schema.__name__, error.errors(include_url=False))
+            raise
+
+    def submit(self, schema: type[BaseModel], content: bytes) -> None:
+        if self.thread is None:
+            with self.lock:
+                if self.thread is None:
+                    self.thread = Thread(target=self.run, name='sampled-validator', daemon=True)
+                    self.thread.start()
+        try:
+            self.queue.put_nowait((schema, content))
+        except Full:
+            self.dropped += 1
+
+    def run(self) -> None:
+        while True:
+            schema, content = self.queue.get()
+            try:
+                self.validate(schema, content)
+            finally:
+                self.queue.task_done()
+
+    def validate(self, schema: type[BaseModel], content: bytes) -> None:
+        try:
+            schema.model_validate_json(content)
+            errors = []
+        except ValidationError as error:
+            errors = error.errors(include_url=False)
+        self.report(schema.__name__, errors)
+
+    def report(self, name: str, errors: list[dict[str, Any]]) -> None:
+        with self.lock:
+            self.validated[name] = self.validated.get(name, 0) + 1
+            if not errors:
+                return
+
+            self.invalid[name] = self.invalid.get(name, 0) + 1
+            for error in errors:
+                path = field_path(error['loc'])
+                key = (name, path, error['type'])
+                violation = self.errors.get(key)
+                if violation is None:
+                    self.errors[key] = ContractViolation(
+                        schema=name,
+                        path=path,
+                        type=error['type'],
+                        count=1,
+                        message=error['msg'],
+                        example=error.get('input'),
+                    )
+                else:
+                    violation.count += 1
+
+    def flush(self) -> None:
+        """
+        Waits until all submitted samples are validated.
+        """
+        self.queue.join()
+
+    def violations(self) -> list[ContractViolation]:
+        """
+        Returns the aggregated violations, the most frequent first.
+        """
+        with self.lock:
+            return sorted(self.errors.values(), key=lambda violation: violation.count, reverse=True)
+
+    def summary(self) -> dict[str, dict[str, int]]:
+        """
+        Returns the number of validated and invalid responses by schema name.
+        """
+        with self.lock:
+            return {
+                name: {'validated': count, 'invalid': self.invalid.get(name, 0)}
+                for name, count in sorted(self.validated.items())
+            }
@@ -0,0 +1,59 @@
+"""
+Side-by-side comparison of gateway targets under identical load.
+
+The same scenario runs against every target at the same time, each target with its own
+runner and connection pool (see :mod:`clients.http.gateway.settings`). With a seed every
+target receives the same generated payloads::
+
+    results = compare_targets(get_accounts, targets=['stable', 'canary'], threads=16, duration=60, rps=200, seed=1)
+    for target, result in results.items():
+        print(target, result.summary())
+"""
+from threading import Thread
+
+from tools.runner import RunResult, Scenario, SteadyState, ThreadPoolRunner
+
+
+def compare_targets(
+        scenario: Scenario,
+        targets: list[str],
+        threads: int,
+        duration: float,
+        rps: float | None = None,
+        seed: int | None = None,
+        warmup: float = 0.0,
+        steady_state: SteadyState | None = None
+) -> dict[str, RunResult]:
+    """
+    Runs the scenario against all targets concurrently.
+
+    :param scenario: A function executing one iteration of the scenario.
+    :param targets: Names of the gateway targets.
+    :param threads: Number of worker threads per target.
+    :param duration: Run duration in seconds.
+    :param rps: Target arrival rate per target, closed model if not set.
+    :param seed: Run seed, the same for all targets.
+    :param warmup: Warm-up duration in seconds.
+    :param steady_state: Extends the warm-up until the steady state is detected.
+    :return: Run results by target name.
+    """
+    runners = {
+        target: ThreadPoolRunner(scenario, threads=threads, seed=seed, target=target)
+        for target in targets
+    }
+    results: dict[str, RunResult] = {}
+
+    def run(target: str) -> None:
+        results[target] = runners[target].run(
+            duration=duration, rps=rps, warmup=warmup, steady_state=steady_state
+        )
+
+    workers = [Thread(target=run, args=(target,), name=f'compare-{target}') for target in targets]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    for runner in runners.values():
+        runner.client.close()
+    return results
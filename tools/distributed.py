@@ -0,0 +1,287 @@
+"""
+Distributed load generation: one controller drives several worker nodes over TCP.
+
+The protocol is newline-delimited JSON over a plain TCP connection per worker:
+
+- controller -> worker ``{"type": "start", "scenario": "module:function", "rps": ..., "threads": ...,
+  "duration": ..., "start_at": <unix time>, "base_url": ..., "seed": ...}``;
+- worker -> controller ``{"type": "snapshot", "interval": <n>, "metrics": ...}`` every second of the
+  run and ``{"type": "done", "interval": <n>, "metrics": ..., "elapsed": ...}`` at the end.
+
+Snapshots are cumulative and mergeable (see :meth:`tools.metrics.Metrics.snapshot`), the controller
+keeps the latest snapshot of every worker and merges them into the combined report. Snapshots are
+numbered by the interval of the run the worker took them at, the per-interval timeline is the
+difference of the combined snapshots of two consecutive intervals, however late they were received.
+Start times are synchronised by wall clock, so nodes should have their clocks synchronised (NTP)::
+
+    python -m tools.distributed controller --workers 3 --rps 300 --duration 60 --scenario scenarios:get_user
+    python -m tools.distributed worker --controller localhost:5557
+"""
+import argparse
+import importlib
+import json
+import socket
+import time
+from dataclasses import dataclass, field
+from threading import Event, Lock, Thread
+from typing import Any, Callable
+
+from httpx import Client, Limits
+
+from tools.fakers import derive_seed
+from tools.metrics import Metrics
+from tools.runner import Scenario, ThreadPoolRunner
+
+SNAPSHOT_INTERVAL = 1.0
+
+
+def send_message(connection: socket.socket, message: dict[str, Any]) -> None:
+    connection.sendall(json.dumps(message, separators=(',', ':')).encode() + b'\n')
+
+
+def load_scenario(path: str) -> Scenario:
+    """
+    Imports a scenario function by its ``module:function`` path.
+    """
+    module_name, _, function_name = path.partition(':')
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+@dataclass
+class DistributedResult:
+    """
+    Combined results of all worker nodes.
+
+    ``timeline`` contains the combined metrics summary of every snapshot interval of the run, covering
+    only the iterations completed in the interval, with its throughput.
+    """
+    workers: int
+    elapsed: float
+    metrics: Metrics
+    timeline: list[dict[str, dict[str, float]]] = field(default_factory=list)
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        return self.metrics.summary(self.elapsed)
+
+
+class Controller:
+    """
+    Distributes a scenario and shares of the target rate to worker nodes and combines their results.
+
+    :param workers: Number of worker nodes to wait for.
+    :param host: The host to listen on.
+    :param port: The port to listen on, a free port is chosen if 0.
+    """
+
+    def __init__(self, workers: int, host: str = '0.0.0.0', port: int = 5557):
+        self.workers = workers
+        self.server = socket.create_server((host, port))
+        self.port = self.server.getsockname()[1]
+        self.snapshots: dict[int, dict[str, Any]] = {}
+        self.intervals: dict[int, dict[int, dict[str, Any]]] = {}
+        self.lock = Lock()
+
+    def combined(self) -> Metrics:
+        """
+        Merges the latest snapshots of all workers.
+        """
+        metrics = Metrics()
+        with self.lock:
+            snapshots = list(self.snapshots.values())
+        for snapshot in snapshots:
+            metrics.merge(Metrics.from_snapshot(snapshot).endpoints)
+        return metrics
+
+    def timeline(self, elapsed: float) -> list[dict[str, dict[str, float]]]:
+        """
+        Returns the combined metrics summary of every interval by the snapshots numbered by the workers.
+
+        :param elapsed: Duration of the run, the last interval may be shorter than the others.
+        """
+        with self.lock:
+            intervals = [dict(snapshots) for snapshots in self.intervals.values()]
+        last = max((max(snapshots) for snapshots in intervals if snapshots), default=0)
+
+        timeline = []
+        previous = Metrics()
+        for interval in range(1, last + 1):
+            metrics = Metrics()
+            for snapshots in intervals:
+                # A worker without a snapshot of the interval has not recorded anything new since its previous one
+                taken = [number for number in snapshots if number <= interval]
+                if taken:
+                    metrics.merge(Metrics.from_snapshot(snapshots[max(taken)]).endpoints)
+            duration = min(SNAPSHOT_INTERVAL, elapsed - (interval - 1) * SNAPSHOT_INTERVAL)
+            timeline.append(metrics.subtract(previous).summary(duration if duration > 0 else SNAPSHOT_INTERVAL))
+            previous = metrics
+        return timeline
+
+    def receive(self, index: int, connection: socket.socket, elapsed: list[float]) -> None:
+        with connection, connection.makefile('r', encoding='utf-8') as stream:
+            for line in stream:
+                message = json.loads(line)
+                with self.lock:
+                    self.snapshots[index] = message['metrics']
+                    self.intervals.setdefault(index, {})[message['interval']] = message['metrics']
+                if message['type'] == 'done':
+                    elapsed[index] = message['elapsed']
+                    return
+
+    def run(
+            self,
+            scenario: str,
+            rps: float,
+            duration: float,
+            threads: int = 32,
+            base_url: str = 'http://localhost:8003',
+            seed: int | None = None,
+            start_delay: float = 2.0,
+            on_snapshot: Callable[[Metrics], None] | None = None
+    ) -> DistributedResult:
+        """
+        Waits for all workers, starts the run on them and collects the results.
+
+        :param scenario: The scenario function path ``module:function``, importable on every worker.
+        :param rps: Total target rate of scenario iterations, split evenly between workers.
+        :param duration: Run duration in seconds.
+        :param threads: Number of threads on every worker.
+        :param base_url: The gateway URL used by workers.
+        :param seed: Run seed, every worker gets an independent seed derived from it.
+        :param start_delay: Seconds between sending the start message and the synchronised start.
+        :param on_snapshot: Called with the combined metrics every snapshot interval.
+        :return: The combined results.
+        """
+        connections = []
+        with self.server:
+            while len(connections) < self.workers:
+                connection, _ = self.server.accept()
+                connections.append(connection)
+
+        start_at = time.time() + start_delay
+        for index, connection in enumerate(connections):
+            send_message(connection, {
+                'type': 'start',
+                'scenario': scenario,
+                'rps': rps / self.workers,
+                'threads': threads,
+                'duration': duration,
+                'start_at': start_at,
+                'base_url': base_url,
+                'seed': derive_seed(seed, 'node', index) if seed is not None else None,
+            })
+
+        elapsed = [0.0] * self.workers
+        receivers = [
+            Thread(target=self.receive, args=(index, connection, elapsed), daemon=True)
+            for index, connection in enumerate(connections)
+        ]
+        for receiver in receivers:
+            receiver.start()
+
+        time.sleep(max(0.0, start_at - time.time()))
+        while any(receiver.is_alive() for receiver in receivers):
+            time.sleep(SNAPSHOT_INTERVAL)
+            if on_snapshot is not None:
+                on_snapshot(self.combined())
+
+        return DistributedResult(
+            workers=self.workers,
+            elapsed=max(elapsed),
+            metrics=self.combined(),
+            timeline=self.timeline(max(elapsed)),
+        )
+
+
+def run_worker(host: str, port: int) -> None:
+    """
+    Connects to the controller, runs the assigned share of the load and reports metrics.
+
+    :param host: The controller host.
+    :param port: The controller port.
+    """
+    with socket.create_connection((host, port)) as connection:
+        with connection.makefile('r', encoding='utf-8') as stream:
+            task = json.loads(stream.readline())
+
+        scenario = load_scenario(task['scenario'])
+        limits = Limits(max_connections=task['threads'], max_keepalive_connections=task['threads'])
+        with Client(base_url=task['base_url'], timeout=90, limits=limits) as client:
+            # Buffered samples reach the shared metrics well within the snapshot interval
+            runner = ThreadPoolRunner(
+                scenario,
+                threads=task['threads'],
+                client=client,
+                seed=task['seed'],
+                flush_interval=SNAPSHOT_INTERVAL / 10,
+            )
+            metrics = Metrics()
+            finished = Event()
+            interval = [1]
+
+            def report() -> None:
+                while not finished.wait(max(0.0, start + interval[0] * SNAPSHOT_INTERVAL - time.perf_counter())):
+                    snapshot = metrics.snapshot()
+                    send_message(connection, {'type': 'snapshot', 'interval': interval[0], 'metrics': snapshot})
+                    interval[0] += 1
+
+            time.sleep(max(0.0, task['start_at'] - time.time()))
+            start = time.perf_counter()
+            reporter = Thread(target=report, daemon=True)
+            reporter.start()
+            result = runner.run(duration=task['duration'], rps=task['rps'], metrics=metrics)
+            finished.set()
+            reporter.join()
+
+        # Iterations finished shortly after the last snapshot are added to its interval
+        last = interval[0] - 1
+        if time.perf_counter() - start - last * SNAPSHOT_INTERVAL >= SNAPSHOT_INTERVAL / 2:
+            last += 1
+        send_message(connection, {
+            'type': 'done',
+            'interval': max(last, 1),
+            'metrics': metrics.snapshot(),
+            'elapsed': result.elapsed,
+        })
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Distributed load generation')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    controller_parser = commands.add_parser('controller')
+    controller_parser.add_argument('--workers', type=int, required=True)
+    controller_parser.add_argument('--scenario', required=True, help='module:function')
+    controller_parser.add_argument('--rps', type=float, required=True)
+    controller_parser.add_argument('--duration', type=float, required=True)
+    controller_parser.add_argument('--threads', type=int, default=32)
+    controller_parser.add_argument('--base-url', default='http://localhost:8003')
+    controller_parser.add_argument('--seed', type=int)
+    controller_parser.add_argument('--port', type=int, default=5557)
+
+    worker_parser = commands.add_parser('worker')
+    worker_parser.add_argument('--controller', default='localhost:5557', help='host:port')
+
+    arguments = parser.parse_args()
+    if arguments.command == 'worker':
+        host, _, port = arguments.controller.rpartition(':')
+        run_worker(host, int(port))
+        return
+
+    controller = Controller(workers=arguments.workers, port=arguments.port)
+    result = controller.run(
+        scenario=arguments.scenario,
+        rps=arguments.rps,
+        duration=arguments.duration,
+        threads=arguments.threads,
+        base_url=arguments.base_url,
+        seed=arguments.seed,
+        on_snapshot=lambda metrics: print(json.dumps(metrics.summary())),
+    )
+    print(f'Combined results of {result.workers} workers in {result.elapsed:.1f} s:')
+    for name, stats in result.summary().items():
+        print(f'{name:<40} {stats["count"]:>8} {stats["errors"]:>6} {stats["rps"]:>9.1f} rps '
+              f'p50 {stats["p50_ms"]:.2f} ms p99 {stats["p99_ms"]:.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,332 @@
+import sys
+from array import array
+from enum import Enum
+from threading import Lock
+from typing import Iterator
+from uuid import UUID
+
+from clients.http.gateway.accounts.schema import AccountSchema, AccountStatus, AccountType
+from clients.http.gateway.cards.schema import CardPaymentSystem, CardSchema, CardStatus, CardType
+from clients.http.gateway.users.schema import UserSchema
+
+
+class CardRecord:
+    """
+    Compact representation of a seeded card.
+
+    Keeps only the fields used by scenarios, sensitive and display-only fields
+    (``pin``, ``cvv``, ``card_holder``, ``expiry_date``, ``card_number``) are dropped.
+    """
+    __slots__ = ('id', 'account_id', 'type', 'status', 'payment_system')
+
+    def __init__(
+            self,
+            id: str,
+            account_id: str,
+            type: CardType,
+            status: CardStatus,
+            payment_system: CardPaymentSystem
+    ):
+        self.id = sys.intern(id)
+        self.account_id = sys.intern(account_id)
+        self.type = type
+        self.status = status
+        self.payment_system = payment_system
+
+    @classmethod
+    def from_schema(cls, card: CardSchema) -> 'CardRecord':
+        return cls(
+            id=card.id,
+            account_id=card.account_id,
+            type=card.type,
+            status=card.status,
+            payment_system=card.payment_system,
+        )
+
+    def to_schema(self) -> CardSchema:
+        """
+        Converts the record into a card schema without validation.
+
+        Dropped fields are not set, accessing them raises ``AttributeError``.
+
+        :return: A partially filled CardSchema.
+        """
+        return CardSchema.model_construct(
+            id=self.id,
+            type=self.type,
+            status=self.status,
+            account_id=self.account_id,
+            payment_system=self.payment_system,
+        )
+
+
+class AccountRecord:
+    """
+    Compact representation of a seeded account with its cards.
+    """
+    __slots__ = ('id', 'type', 'status', 'balance', 'cards')
+
+    def __init__(
+            self,
+            id: str,
+            type: AccountType,
+            status: AccountStatus,
+            balance: float,
+            cards: tuple[CardRecord, ...] = ()
+    ):
+        self.id = sys.intern(id)
+        self.type = type
+        self.status = status
+        self.balance = balance
+        self.cards = cards
+
+    @classmethod
+    def from_schema(cls, account: AccountSchema) -> 'AccountRecord':
+        return cls(
+            id=account.id,
+            type=account.type,
+            status=account.status,
+            balance=account.balance,
+            cards=tuple(CardRecord.from_schema(card) for card in account.cards),
+        )
+
+    def to_schema(self) -> AccountSchema:
+        """
+        Converts the record into an account schema without validation.
+
+        :return: An AccountSchema with partially filled cards.
+        """
+        return AccountSchema.model_construct(
+            id=self.id,
+            type=self.type,
+            status=self.status,
+            balance=self.balance,
+            cards=[card.to_schema() for card in self.cards],
+        )
+
+
+class UserRecord:
+    """
+    Compact representation of a seeded user with its accounts.
+
+    Personal data (email, names, phone number) is dropped.
+    """
+    __slots__ = ('id', 'accounts')
+
+    def __init__(self, id: str, accounts: tuple[AccountRecord, ...] = ()):
+        self.id = sys.intern(id)
+        self.accounts = accounts
+
+    @classmethod
+    def from_schema(cls, user: UserSchema, accounts: list[AccountSchema] | None = None) -> 'UserRecord':
+        return cls(
+            id=user.id,
+            accounts=tuple(AccountRecord.from_schema(account) for account in accounts or ()),
+        )
+
+    def to_schema(self) -> UserSchema:
+        """
+        Converts the record into a user schema without validation.
+
+        Dropped fields are not set, accessing them raises ``AttributeError``.
+
+        :return: A partially filled UserSchema.
+        """
+        return UserSchema.model_construct(id=self.id)
+
+
+_ACCOUNT_TYPES = tuple(AccountType)
+_ACCOUNT_STATUSES = tuple(AccountStatus)
+_CARD_TYPES = tuple(CardType)
+_CARD_STATUSES = tuple(CardStatus)
+_PAYMENT_SYSTEMS = tuple(CardPaymentSystem)
+_CODES = {
+    enum: {member: code for code, member in enumerate(enum)}
+    for enum in (AccountType, AccountStatus, CardType, CardStatus, CardPaymentSystem)
+}
+_ID_SIZE = 16
+_NONE = -1
+
+
+def _encode(enum: type[Enum], value: str) -> int:
+    return _CODES[enum][enum(value)]
+
+
+class EntityStore:
+    """
+    In-memory columnar store of seeded entities keyed by user ID.
+
+    Entities are kept in typed arrays instead of objects: IDs as 16-byte UUIDs, enums as
+    one-byte codes, links between users, accounts and cards as row numbers. A user with a debit
+    card account and its cards takes about 0.4 KB instead of about 5 KB as pydantic schemas.
+    Records (:class:`UserRecord` and others) are built on access, they are snapshots: changing
+    a record does not change the store.
+
+    IDs must be UUIDs, as issued by the gateway. The store is thread-safe.
+    """
+
+    def __init__(self):
+        self.lock = Lock()
+        self.rows: dict[int, int] = {}
+
+        self.user_ids = bytearray()
+        self.user_first_account = array('l')
+        self.user_last_account = array('l')
+
+        self.account_ids = bytearray()
+        self.account_types = array('B')
+        self.account_statuses = array('B')
+        self.account_balances = array('d')
+        self.account_next = array('l')
+        self.account_first_card = array('l')
+        self.account_last_card = array('l')
+
+        self.card_ids = bytearray()
+        self.card_accounts = array('l')
+        self.card_types = array('B')
+        self.card_statuses = array('B')
+        self.card_payment_systems = array('B')
+        self.card_next = array('l')
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __iter__(self) -> Iterator[UserRecord]:
+        with self.lock:
+            rows = list(self.rows.values())
+        return (self.user_record(row) for row in rows)
+
+    def __getitem__(self, user_id: str) -> UserRecord:
+        return self.user_record(self.rows[UUID(user_id).int])
+
+    @staticmethod
+    def read_id(column: bytearray, row: int) -> str:
+        return str(UUID(bytes=bytes(column[row * _ID_SIZE:(row + 1) * _ID_SIZE])))
+
+    def account_rows(self, user_row: int) -> Iterator[int]:
+        row = self.user_first_account[user_row]
+        while row != _NONE:
+            yield row
+            row = self.account_next[row]
+
+    def card_rows(self, account_row: int) -> Iterator[int]:
+        row = self.account_first_card[account_row]
+        while row != _NONE:
+            yield row
+            row = self.card_next[row]
+
+    def card_record(self, row: int) -> CardRecord:
+        return CardRecord(
+            id=self.read_id(self.card_ids, row),
+            account_id=self.read_id(self.account_ids, self.card_accounts[row]),
+            type=_CARD_TYPES[self.card_types[row]],
+            status=_CARD_STATUSES[self.card_statuses[row]],
+            payment_system=_PAYMENT_SYSTEMS[self.card_payment_systems[row]],
+        )
+
+    def account_record(self, row: int) -> AccountRecord:
+        with self.lock:
+            cards = list(self.card_rows(row))
+        return AccountRecord(
+            id=self.read_id(self.account_ids, row),
+            type=_ACCOUNT_TYPES[self.account_types[row]],
+            status=_ACCOUNT_STATUSES[self.account_statuses[row]],
+            balance=self.account_balances[row],
+            cards=tuple(self.card_record(card) for card in cards),
+        )
+
+    def user_record(self, row: int) -> UserRecord:
+        with self.lock:
+            accounts = list(self.account_rows(row))
+        return UserRecord(
+            id=self.read_id(self.user_ids, row),
+            accounts=tuple(self.account_record(account) for account in accounts),
+        )
+
+    def add_user(self, user: UserSchema) -> UserRecord:
+        """
+        Adds a user without accounts.
+
+        :param user: The user schema returned by the gateway.
+        :return: The stored record.
+        """
+        key = UUID(user.id)
+        with self.lock:
+            self.rows[key.int] = len(self.user_first_account)
+            self.user_ids += key.bytes
+            self.user_first_account.append(_NONE)
+            self.user_last_account.append(_NONE)
+        return UserRecord(id=user.id)
+
+    def add_account(self, user_id: str, account: AccountSchema) -> AccountRecord:
+        """
+        Adds an account (with its cards) to a stored user.
+
+        :param user_id: The ID of the account owner.
+        :param account: The account schema returned by the gateway.
+        :return: The stored record.
+        :raises KeyError: If the user is not stored.
+        """
+        with self.lock:
+            user_row = self.rows[UUID(user_id).int]
+            row = len(self.account_next)
+            self.account_ids += UUID(account.id).bytes
+            self.account_types.append(_encode(AccountType, account.type))
+            self.account_statuses.append(_encode(AccountStatus, account.status))
+            self.account_balances.append(account.balance)
+            self.account_next.append(_NONE)
+            self.account_first_card.append(_NONE)
+            self.account_last_card.append(_NONE)
+
+            last = self.user_last_account[user_row]
+            if last == _NONE:
+                self.user_first_account[user_row] = row
+            else:
+                self.account_next[last] = row
+            self.user_last_account[user_row] = row
+
+            for card in account.cards:
+                self.append_card(row, card)
+        return self.account_record(row)
+
+    def add_card(self, user_id: str, card: CardSchema) -> CardRecord:
+        """
+        Adds a card to a stored account of the user.
+
+        :param user_id: The ID of the card owner.
+        :param card: The card schema returned by the gateway.
+        :return: The stored record.
+        :raises KeyError: If the user or the card account is not stored.
+        """
+        account_id = UUID(card.account_id).bytes
+        with self.lock:
+            user_row = self.rows[UUID(user_id).int]
+            for account_row in self.account_rows(user_row):
+                if self.account_ids[account_row * _ID_SIZE:(account_row + 1) * _ID_SIZE] == account_id:
+                    row = self.append_card(account_row, card)
+                    break
+            else:
+                raise KeyError(f'Account {card.account_id} of user {user_id} is not stored')
+        return self.card_record(row)
+
+    def append_card(self, account_row: int, card: CardSchema) -> int:
+        """
+        Appends a card to the account, must be called under the lock.
+
+        :return: The card row.
+        """
+        row = len(self.card_next)
+        self.card_ids += UUID(card.id).bytes
+        self.card_accounts.append(account_row)
+        self.card_types.append(_encode(CardType, card.type))
+        self.card_statuses.append(_encode(CardStatus, card.status))
+        self.card_payment_systems.append(_encode(CardPaymentSystem, card.payment_system))
+        self.card_next.append(_NONE)
+
+        last = self.account_last_card[account_row]
+        if last == _NONE:
+            self.account_first_card[account_row] = row
+        else:
+            self.card_next[last] = row
+        self.account_last_card[account_row] = row
+        return row
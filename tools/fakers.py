@@ -1,17 +1,117 @@
-from faker import Faker
-from faker.providers.python import TEnum
-from shortuuid import uuid
+import hashlib
+from contextlib import contextmanager
+from threading import local
+from typing import TYPE_CHECKING, Hashable, Iterator
+from uuid import UUID
 
+from shortuuid import encode, uuid
+
+if TYPE_CHECKING:
+    from faker import Faker
+    from faker.providers.python import TEnum
+
+
+def derive_seed(seed: int, *key: Hashable) -> int:
+    """
+    Derives an independent 64-bit seed for a random stream identified by ``key``.
+
+    :param seed: The run-level seed.
+    :param key: Stream identity, e.g. worker and user indexes.
+    :return: A seed which is stable across runs and processes.
+    """
+    digest = hashlib.blake2b(repr((seed, *key)).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'big')
 
 
 class Fake:
     """
     Class for generating fake data for testing using Faker library.
+
+    The Faker library and its locale data are loaded on first use, so importing
+    modules which only reference the ``fake`` instance stays cheap.
+
+    Data is random by default. Code running inside :meth:`stream` with a seed draws from an
+    independent random stream derived from the seed and the stream key, so workers and users
+    get different data which is the same in every run with the same seed. The seed is passed
+    to every stream, so concurrent runs with different seeds (or without one) do not affect
+    each other. :meth:`seed_run` sets a default seed for the whole process instead.
+
+    :param faker: An instance of Faker to use. Created for ``locale`` on first use if not set.
+    :param locale: The locale of the lazily created Faker instance.
     """
-    def __init__(self, faker: Faker):
-        self.faker = faker
+    def __init__(self, faker: 'Faker | None' = None, locale: str = 'ru_RU'):
+        self._faker = faker
+        self.locale = locale
+        self.seed: int | None = None
+        self.local = local()
+
+    def _create_faker(self) -> 'Faker':
+        from faker import Faker
+
+        return Faker(self.locale)
+
+    @property
+    def faker(self) -> 'Faker':
+        """
+        Returns the Faker instance of the current stream, or the shared one outside of streams.
+        """
+        stream_faker = getattr(self.local, 'faker', None)
+        if stream_faker is not None:
+            return stream_faker
+
+        if self._faker is None:
+            self._faker = self._create_faker()
+            if self.seed is not None:
+                self._faker.seed_instance(derive_seed(self.seed))
+        return self._faker
+
+    def seed_run(self, seed: int | None) -> None:
+        """
+        Makes data generation of the process reproducible, the default seed of :meth:`stream`.
+
+        :param seed: The process-wide seed, None to make data random again.
+        """
+        self.seed = seed
+        if self._faker is not None:
+            self._faker.seed_instance(derive_seed(seed) if seed is not None else None)
+
+    @property
+    def current_seed(self) -> int | None:
+        """
+        Returns the seed of the current stream, the process-wide seed outside of seeded streams.
+        """
+        seed = getattr(self.local, 'seed', None)
+        return seed if seed is not None else self.seed
+
+    @contextmanager
+    def stream(self, *key: Hashable, seed: int | None = None) -> Iterator[None]:
+        """
+        Generates data of the current thread from a random stream identified by ``key``.
+
+        Without a seed data is random anyway, so the shared Faker is used and nothing is
+        created or reseeded. Streams of one thread should not be nested.
+
+        :param key: Stream identity, e.g. ``(worker_id, user_index)``.
+        :param seed: The seed of the run, the process-wide seed (see :meth:`seed_run`) if not set.
+        """
+        seed = seed if seed is not None else self.seed
+        if seed is None:
+            yield
+            return
+
+        stream_faker = getattr(self.local, 'stream_faker', None)
+        if stream_faker is None:
+            stream_faker = self.local.stream_faker = self._create_faker()
+        stream_faker.seed_instance(derive_seed(seed, *key))
+
+        previous = getattr(self.local, 'faker', None), getattr(self.local, 'seed', None)
+        self.local.faker, self.local.seed = stream_faker, seed
+        try:
+            yield
+        finally:
+            self.local.faker, self.local.seed = previous
 
-    def enum_choice(self, value: type[TEnum]):
+    def enum_choice(self, value: 'type[TEnum]'):
         """
         Chooses a random value from a given enum.
 
@@ -26,7 +126,49 @@ class Fake:
 
         :return: A random email address.
         """
-        return f'test_user_{uuid()}.{self.faker.email()}'
+        # The unique part is taken from the seeded stream to keep seeded runs reproducible
+        unique = encode(UUID(int=self.faker.random.getrandbits(128))) if self.current_seed is not None else uuid()
+        return f'test_user_{unique}.{self.faker.email()}'
+
+    def user_payloads(self, count: int, pool_size: int = 256) -> list[dict[str, str]]:
+        """
+        Generates user creation payloads in bulk.
+
+        Names, phone numbers and email domains are drawn from pools of ``pool_size`` values generated
+        once, so a payload costs a few random choices instead of five Faker calls. Emails stay
+        unique: every email starts with a unique batch prefix and the payload index.
+
+        :param count: Number of payloads.
+        :param pool_size: Number of distinct values of every field.
+        :return: Payloads with API field names (camelCase), ready to be sent as JSON.
+        """
+        faker = self.faker
+        size = min(count, pool_size)
+        last_names = [faker.last_name() for _ in range(size)]
+        first_names = [faker.first_name() for _ in range(size)]
+        middle_names = [faker.middle_name() for _ in range(size)]
+        phone_numbers = [faker.phone_number() for _ in range(size)]
+        emails = [faker.email() for _ in range(size)]
+
+        batch = encode(UUID(int=faker.random.getrandbits(128))) if self.current_seed is not None else uuid()
+        choose = faker.random.choices
+        return [
+            {
+                'email': f'test_user_{batch}{index}.{email}',
+                'lastName': last_name,
+                'firstName': first_name,
+                'middleName': middle_name,
+                'phoneNumber': phone_number,
+            }
+            for index, email, last_name, first_name, middle_name, phone_number in zip(
+                range(count),
+                choose(emails, k=count),
+                choose(last_names, k=count),
+                choose(first_names, k=count),
+                choose(middle_names, k=count),
+                choose(phone_numbers, k=count),
+            )
+        ]
 
     def category(self) -> str:
         """
@@ -107,4 +249,4 @@ class Fake:
         return self.float_generator(1, 1000)
 
 
-fake = Fake(faker=Faker('ru_RU'))
+fake = Fake(locale='ru_RU')
@@ -0,0 +1,332 @@
+import math
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Any, Iterator
+
+_BASE = 1e-6
+_GROWTH = math.log1p(0.01)
+
+
+class Histogram:
+    """
+    Log-bucketed latency histogram.
+
+    Values (seconds) are stored in buckets growing by 1%, so percentiles have at most 1%
+    relative error while memory does not depend on the number of samples. Histograms
+    can be merged and serialized, which makes them suitable for combining results of
+    several threads, processes or time windows.
+    """
+
+    def __init__(self):
+        self.counts: dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def record(self, value: float) -> None:
+        """
+        Records a single value.
+
+        :param value: The value in seconds.
+        """
+        index = math.ceil(math.log(value / _BASE) / _GROWTH) if value > _BASE else 0
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def merge(self, other: 'Histogram') -> None:
+        """
+        Adds all values of another histogram to this one.
+
+        :param other: The histogram to merge.
+        """
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def subtract(self, earlier: 'Histogram') -> 'Histogram':
+        """
+        Returns the values recorded since an earlier copy of this histogram, e.g. the difference
+        of two cumulative snapshots.
+
+        The minimum and maximum of the difference are known to the bucket precision only.
+
+        :param earlier: The earlier copy of the histogram.
+        :return: A new histogram instance.
+        """
+        histogram = Histogram()
+        for index, count in self.counts.items():
+            count -= earlier.counts.get(index, 0)
+            if count > 0:
+                histogram.counts[index] = count
+        histogram.count = self.count - earlier.count
+        histogram.total = self.total - earlier.total
+        if histogram.counts:
+            lowest, highest = min(histogram.counts), max(histogram.counts)
+            histogram.min = max(_BASE * math.exp((lowest - 1) * _GROWTH) if lowest else 0.0, self.min)
+            histogram.max = min(_BASE * math.exp(highest * _GROWTH), self.max)
+        return histogram
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, percent: float) -> float:
+        """
+        Returns the approximate value below which the given percent of values fall.
+
+        :param percent: The percentile in range 0-100.
+        :return: The value in seconds, 0 for an empty histogram.
+        """
+        if not self.count:
+            return 0.0
+
+        rank = max(1, math.ceil(self.count * percent / 100))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(max(_BASE * math.exp(index * _GROWTH), self.min), self.max)
+        return self.max
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Serializes the histogram into a JSON-compatible dictionary.
+
+        :return: A dictionary accepted by :meth:`from_dict`.
+        """
+        return {
+            'counts': {str(index): count for index, count in self.counts.items()},
+            'count': self.count,
+            'total': self.total,
+            'min': self.min if self.count else 0.0,
+            'max': self.max,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> 'Histogram':
+        """
+        Restores a histogram serialized with :meth:`to_dict`.
+
+        :param data: The serialized histogram.
+        :return: A new histogram instance.
+        """
+        histogram = cls()
+        histogram.counts = {int(index): count for index, count in data['counts'].items()}
+        histogram.count = data['count']
+        histogram.total = data['total']
+        histogram.min = data['min'] if histogram.count else math.inf
+        histogram.max = data['max']
+        return histogram
+
+
+@dataclass
+class EndpointStats:
+    """
+    Aggregated results of one endpoint (or any other named measurement).
+    """
+    histogram: Histogram = field(default_factory=Histogram)
+    errors: int = 0
+
+    def merge(self, other: 'EndpointStats') -> None:
+        self.histogram.merge(other.histogram)
+        self.errors += other.errors
+
+    def subtract(self, earlier: 'EndpointStats') -> 'EndpointStats':
+        return EndpointStats(
+            histogram=self.histogram.subtract(earlier.histogram),
+            errors=self.errors - earlier.errors,
+        )
+
+    def summary(self, elapsed: float | None = None) -> dict[str, float]:
+        """
+        Returns the main statistics of the endpoint.
+
+        :param elapsed: Duration of the measured window, used to calculate throughput.
+        :return: A dictionary with count, errors, latency percentiles (ms) and throughput.
+        """
+        histogram = self.histogram
+        summary = {
+            'count': histogram.count,
+            'errors': self.errors,
+            'mean_ms': histogram.mean * 1000,
+            'p50_ms': histogram.percentile(50) * 1000,
+            'p90_ms': histogram.percentile(90) * 1000,
+            'p99_ms': histogram.percentile(99) * 1000,
+            'max_ms': histogram.max * 1000,
+        }
+        if elapsed:
+            summary['rps'] = histogram.count / elapsed
+        return summary
+
+
+class Metrics:
+    """
+    Thread-safe per-endpoint collection of latency histograms and error counters.
+    """
+
+    def __init__(self):
+        self.lock = Lock()
+        self.endpoints: dict[str, EndpointStats] = {}
+
+    def record(self, name: str, elapsed: float, error: bool = False) -> None:
+        """
+        Records a single measurement.
+
+        :param name: The endpoint (measurement) name.
+        :param elapsed: Duration in seconds.
+        :param error: Whether the measured call failed.
+        """
+        self.record_many([(name, elapsed, error)])
+
+    def record_many(self, samples: list[tuple[str, float, bool]]) -> None:
+        """
+        Records a batch of measurements taking the lock only once.
+
+        :param samples: A list of (name, elapsed, error) tuples.
+        """
+        with self.lock:
+            for name, elapsed, error in samples:
+                stats = self.endpoints.get(name)
+                if stats is None:
+                    stats = self.endpoints[name] = EndpointStats()
+                stats.histogram.record(elapsed)
+                if error:
+                    stats.errors += 1
+
+    def merge(self, endpoints: dict[str, EndpointStats]) -> None:
+        """
+        Merges already aggregated per-endpoint stats.
+
+        :param endpoints: Stats by endpoint name.
+        """
+        with self.lock:
+            for name, stats in endpoints.items():
+                self.endpoints.setdefault(name, EndpointStats()).merge(stats)
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """
+        Serializes current per-endpoint stats into a JSON-compatible dictionary.
+
+        :return: A dictionary accepted by :meth:`from_snapshot`.
+        """
+        with self.lock:
+            return {
+                name: {'histogram': stats.histogram.to_dict(), 'errors': stats.errors}
+                for name, stats in self.endpoints.items()
+            }
+
+    def subtract(self, earlier: 'Metrics') -> 'Metrics':
+        """
+        Returns the measurements recorded since an earlier copy of these metrics, e.g. per-interval
+        metrics from two cumulative snapshots.
+
+        :param earlier: The earlier copy of the metrics.
+        :return: A new metrics instance.
+        """
+        metrics = Metrics()
+        with self.lock:
+            endpoints = dict(self.endpoints)
+        with earlier.lock:
+            previous = dict(earlier.endpoints)
+        metrics.endpoints = {
+            name: stats.subtract(previous.get(name, EndpointStats())) for name, stats in endpoints.items()
+        }
+        return metrics
+
+    @classmethod
+    def from_snapshot(cls, snapshot: dict[str, dict[str, Any]]) -> 'Metrics':
+        """
+        Restores metrics serialized with :meth:`snapshot`.
+
+        :param snapshot: The serialized metrics.
+        :return: A new metrics instance.
+        """
+        metrics = cls()
+        metrics.endpoints = {
+            name: EndpointStats(histogram=Histogram.from_dict(data['histogram']), errors=data['errors'])
+            for name, data in snapshot.items()
+        }
+        return metrics
+
+    def reset(self) -> None:
+        """
+        Drops all collected measurements.
+        """
+        with self.lock:
+            self.endpoints = {}
+
+    def summary(self, elapsed: float | None = None) -> dict[str, dict[str, float]]:
+        """
+        Returns statistics of all endpoints.
+
+        :param elapsed: Duration of the measured window, used to calculate throughput.
+        :return: A dictionary with :meth:`EndpointStats.summary` by endpoint name.
+        """
+        with self.lock:
+            return {name: stats.summary(elapsed) for name, stats in sorted(self.endpoints.items())}
+
+
+class MetricsBuffer:
+    """
+    Per-thread buffer of measurements flushed into shared metrics in batches.
+
+    Each worker thread owns its buffer, so recording a measurement does not take a lock
+    and threads contend on the shared metrics lock only once per batch.
+
+    :param metrics: The shared metrics to flush measurements into.
+    :param batch_size: Number of buffered measurements triggering a flush.
+    :param flush_interval: Maximum age (seconds) of buffered measurements, keeps the shared
+                           metrics up to date when the rate is low.
+    """
+
+    def __init__(self, metrics: Metrics, batch_size: int = 256, flush_interval: float = 1.0):
+        self.metrics = metrics
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.samples: list[tuple[str, float, bool]] = []
+        self.flushed_at = time.monotonic()
+
+    def record(self, name: str, elapsed: float, error: bool = False) -> None:
+        """
+        Buffers a single measurement.
+
+        :param name: The endpoint (measurement) name.
+        :param elapsed: Duration in seconds.
+        :param error: Whether the measured call failed.
+        """
+        self.samples.append((name, elapsed, error))
+        if len(self.samples) >= self.batch_size or time.monotonic() - self.flushed_at >= self.flush_interval:
+            self.flush()
+
+    @contextmanager
+    def measure(self, name: str) -> Iterator[None]:
+        """
+        Measures the duration of the ``with`` block, an exception is recorded as an error and re-raised.
+
+        :param name: The endpoint (measurement) name.
+        """
+        start = time.perf_counter()
+        error = True
+        try:
+            yield
+            error = False
+        finally:
+            self.record(name, time.perf_counter() - start, error)
+
+    def flush(self) -> None:
+        """
+        Moves buffered measurements into the shared metrics.
+        """
+        self.flushed_at = time.monotonic()
+        if self.samples:
+            samples, self.samples = self.samples, []
+            self.metrics.record_many(samples)
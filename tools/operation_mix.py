@@ -0,0 +1,250 @@
+from dataclasses import dataclass
+from itertools import count
+from threading import Lock
+
+from clients.http.gateway.operations.client import OperationsGatewayHTTPClient
+from clients.http.gateway.operations.schema import (
+    MakeBillPaymentOperationRequestSchema,
+    MakeBillPaymentOperationResponseSchema,
+    MakeCashbackOperationRequestSchema,
+    MakeCashbackOperationResponseSchema,
+    MakeCashWithdrawalOperationRequestSchema,
+    MakeCashWithdrawalOperationResponseSchema,
+    MakeFeeOperationRequestSchema,
+    MakeFeeOperationResponseSchema,
+    MakeOperationRequestSchema,
+    MakePurchaseOperationRequestSchema,
+    MakePurchaseOperationResponseSchema,
+    MakeTopUpOperationRequestSchema,
+    MakeTopUpOperationResponseSchema,
+    MakeTransferOperationRequestSchema,
+    MakeTransferOperationResponseSchema,
+    OperationSchema,
+    OperationStatus,
+    OperationType,
+)
+from tools.fakers import fake
+
+OPERATIONS = {
+    OperationType.FEE: (
+        MakeFeeOperationRequestSchema, MakeFeeOperationResponseSchema, 'make_fee_operation_api'
+    ),
+    OperationType.TOP_UP: (
+        MakeTopUpOperationRequestSchema, MakeTopUpOperationResponseSchema, 'make_top_up_operation_api'
+    ),
+    OperationType.PURCHASE: (
+        MakePurchaseOperationRequestSchema, MakePurchaseOperationResponseSchema, 'make_purchase_operation_api'
+    ),
+    OperationType.CASHBACK: (
+        MakeCashbackOperationRequestSchema, MakeCashbackOperationResponseSchema, 'make_cashback_operation_api'
+    ),
+    OperationType.TRANSFER: (
+        MakeTransferOperationRequestSchema, MakeTransferOperationResponseSchema, 'make_transfer_operation_api'
+    ),
+    OperationType.BILL_PAYMENT: (
+        MakeBillPaymentOperationRequestSchema,
+        MakeBillPaymentOperationResponseSchema,
+        'make_bill_payment_operation_api'
+    ),
+    OperationType.CASH_WITHDRAWAL: (
+        MakeCashWithdrawalOperationRequestSchema,
+        MakeCashWithdrawalOperationResponseSchema,
+        'make_cash_withdrawal_operation_api'
+    ),
+}
+
+DEBIT_OPERATIONS = frozenset({
+    OperationType.FEE,
+    OperationType.PURCHASE,
+    OperationType.TRANSFER,
+    OperationType.BILL_PAYMENT,
+    OperationType.CASH_WITHDRAWAL,
+})
+
+DEFAULT_WEIGHTS = {
+    OperationType.TOP_UP: 15,
+    OperationType.PURCHASE: 40,
+    OperationType.TRANSFER: 10,
+    OperationType.FEE: 5,
+    OperationType.CASHBACK: 10,
+    OperationType.BILL_PAYMENT: 10,
+    OperationType.CASH_WITHDRAWAL: 10,
+}
+
+
+@dataclass
+class AccountBalance:
+    """
+    Locally tracked state of an account.
+    """
+    card_id: str
+    balance: float = 0.0
+    cashback_base: float = 0.0
+
+
+@dataclass
+class PendingOperation:
+    """
+    A generated operation already applied to the tracked balance, see :meth:`OperationMixGenerator.next_operation`.
+
+    :param token: Identifies the operation in :meth:`OperationMixGenerator.commit` and ``rollback``.
+    :param payload: The request schema to send.
+    :param operation_type: The operation type.
+    :param cashback_base: The cashback base of the account before the operation, restored on rollback.
+    """
+    token: int
+    payload: MakeOperationRequestSchema
+    operation_type: OperationType
+    cashback_base: float
+
+
+class OperationMixGenerator:
+    """
+    Stateful generator of consistent operation sequences.
+
+    Tracks balances of accounts locally and generates operations the gateway should accept:
+    debit operations never exceed the balance (a top-up is generated instead when funds are
+    low), cashback is a share of purchases made since the previous cashback, and all operations
+    are generated with the ``COMPLETED`` status.
+
+    Random choices are drawn from ``fake``, so generated sequences are reproducible in seeded runs.
+
+    :param weights: Relative frequencies of operation types, see ``DEFAULT_WEIGHTS``.
+    :param top_up_range: Range of top-up amounts.
+    :param max_debit: Upper bound of a single debit operation amount.
+    :param cashback_rate: Range of cashback as a share of purchases.
+    """
+
+    def __init__(
+            self,
+            weights: dict[OperationType, float] | None = None,
+            top_up_range: tuple[int, int] = (500, 5000),
+            max_debit: int = 1000,
+            cashback_rate: tuple[float, float] = (0.01, 0.05)
+    ):
+        weights = weights or DEFAULT_WEIGHTS
+        self.types = list(weights)
+        self.weights = list(weights.values())
+        self.top_up_range = top_up_range
+        self.max_debit = max_debit
+        self.cashback_rate = cashback_rate
+        self.accounts: dict[str, AccountBalance] = {}
+        # Operations not yet accepted or rejected by token
+        self.pending: dict[int, PendingOperation] = {}
+        self.tokens = count()
+        self.lock = Lock()
+
+    def add_account(self, account_id: str, card_id: str, balance: float = 0.0) -> None:
+        """
+        Starts tracking an account.
+
+        :param account_id: The account ID.
+        :param card_id: The ID of the account card to use for operations.
+        :param balance: The current account balance.
+        """
+        with self.lock:
+            self.accounts[account_id] = AccountBalance(card_id=card_id, balance=balance)
+
+    def balance(self, account_id: str) -> float:
+        return self.accounts[account_id].balance
+
+    def next_operation(self, account_id: str) -> PendingOperation:
+        """
+        Generates the next operation for the account and applies it to the tracked balance.
+
+        Every operation must be either committed with :meth:`commit` or reverted with :meth:`rollback`,
+        also when it was not sent at all, otherwise it is kept in ``pending``.
+
+        :param account_id: The account ID.
+        :return: The pending operation with a request schema of one of the seven operation types.
+        """
+        operation_type = fake.faker.random.choices(self.types, weights=self.weights)[0]
+
+        with self.lock:
+            account = self.accounts[account_id]
+            if operation_type == OperationType.CASHBACK and account.cashback_base < 1:
+                operation_type = OperationType.PURCHASE
+            if operation_type in DEBIT_OPERATIONS and account.balance < 2:
+                operation_type = OperationType.TOP_UP
+
+            if operation_type == OperationType.TOP_UP:
+                amount = fake.float_generator(*self.top_up_range)
+            elif operation_type == OperationType.CASHBACK:
+                amount = max(round(account.cashback_base * fake.faker.random.uniform(*self.cashback_rate), 2), 0.01)
+            else:
+                amount = fake.float_generator(1, int(min(self.max_debit, account.balance)))
+
+            cashback_base = account.cashback_base
+            self._apply(account, operation_type, amount)
+
+            request_schema = OPERATIONS[operation_type][0]
+            payload = request_schema(
+                status=OperationStatus.COMPLETED,
+                amount=amount,
+                card_id=account.card_id,
+                account_id=account_id,
+            )
+            operation = PendingOperation(
+                token=next(self.tokens),
+                payload=payload,
+                operation_type=operation_type,
+                cashback_base=cashback_base,
+            )
+            self.pending[operation.token] = operation
+        return operation
+
+    def commit(self, operation: PendingOperation) -> None:
+        """
+        Forgets an operation accepted by the gateway.
+
+        :param operation: The operation returned by :meth:`next_operation`.
+        """
+        with self.lock:
+            self.pending.pop(operation.token, None)
+
+    def rollback(self, operation: PendingOperation) -> None:
+        """
+        Reverts a generated operation which was not accepted by the gateway, once.
+
+        :param operation: The operation returned by :meth:`next_operation`.
+        """
+        with self.lock:
+            if self.pending.pop(operation.token, None) is None:
+                return
+
+            payload = operation.payload
+            account = self.accounts[payload.account_id]
+            self._apply(account, operation.operation_type, -payload.amount)
+            if operation.operation_type == OperationType.CASHBACK:
+                # The cashback reset the base, purchases made since then are kept on top of it
+                account.cashback_base = round(account.cashback_base + operation.cashback_base, 2)
+
+    @staticmethod
+    def _apply(account: AccountBalance, operation_type: OperationType, amount: float) -> None:
+        if operation_type in DEBIT_OPERATIONS:
+            account.balance = round(account.balance - amount, 2)
+        else:
+            account.balance = round(account.balance + amount, 2)
+
+        if operation_type == OperationType.PURCHASE:
+            account.cashback_base = round(account.cashback_base + amount, 2)
+        elif operation_type == OperationType.CASHBACK and amount > 0:
+            account.cashback_base = 0.0
+
+    def execute(self, client: OperationsGatewayHTTPClient, account_id: str) -> OperationSchema:
+        """
+        Generates the next operation for the account and performs it via the gateway.
+
+        :param client: The operations gateway client.
+        :param account_id: The account ID.
+        :return: The created operation.
+        """
+        operation = self.next_operation(account_id)
+        _, response_schema, method = OPERATIONS[operation.operation_type]
+        try:
+            response = getattr(client, method)(payload=operation.payload)
+        except Exception:
+            self.rollback(operation)
+            raise
+        self.commit(operation)
+        return client.parse(response_schema, response).operation
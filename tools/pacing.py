@@ -0,0 +1,235 @@
+"""
+Pacing of virtual users on a timing wheel.
+
+Instead of a sleeping thread (or timer) per virtual user, all deadlines are kept in the slots
+of a single timing wheel. One scheduler thread sleeps until the next slot (``resolution``) with
+tasks due, takes them in one batch and hands them over to a pool of worker threads::
+
+    engine = PacingEngine(workers=64)
+    for user_id in user_ids:
+        engine.every(5.0, partial(client.get_operations_summary, user_id), offset=random() * 5, name='summary')
+    engine.run(duration=60)
+    print(engine.summary())
+
+Paced tasks are scheduled from their previous deadline, not from their completion time,
+so deadlines do not drift, however long the tasks take.
+
+An engine may be started again after it was stopped, stopping drops (cancels) all the scheduled
+tasks, so the tasks of the next run are scheduled anew.
+"""
+import heapq
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Condition, Event, Thread
+from typing import Callable
+
+from tools.metrics import Metrics
+
+
+class Pacer:
+    """
+    A task repeated every ``interval`` seconds, see :meth:`PacingEngine.every`.
+
+    ``missed`` counts deadlines skipped because the previous run was still in progress.
+    """
+    __slots__ = ('task', 'name', 'interval', 'deadline', 'tick', 'missed', 'cancelled')
+
+    def __init__(self, task: Callable[[], object], name: str | None, interval: float | None, deadline: float):
+        self.task = task
+        self.name = name or getattr(task, '__name__', 'task')
+        self.interval = interval
+        self.deadline = deadline
+        self.tick = 0
+        self.missed = 0
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+
+class PacingEngine:
+    """
+    Runs tasks at their deadlines using a timing wheel and a pool of worker threads.
+
+    Scheduling lag (from the deadline to the actual start of the task in a worker thread) is
+    recorded into ``metrics`` as ``pacing.lag``, i.e. it includes waiting for a free worker.
+    Task durations are recorded under the task names and failures as errors.
+
+    :param workers: Number of worker threads running the tasks.
+    :param resolution: Slot duration of the wheel in seconds, the maximum timer granularity.
+    :param slots: Number of wheel slots, deadlines further than ``slots * resolution`` wrap around.
+    :param metrics: Metrics to record the lag and task durations into, new metrics by default.
+    """
+
+    def __init__(
+            self,
+            workers: int = 32,
+            resolution: float = 0.0005,
+            slots: int = 8192,
+            metrics: Metrics | None = None
+    ):
+        self.resolution = resolution
+        self.wheel: list[list[Pacer]] = [[] for _ in range(slots)]
+        self.metrics = metrics if metrics is not None else Metrics()
+        self.workers = workers
+        self.executor: ThreadPoolExecutor | None = None
+        self.lock = Condition()
+        # Heap of the ticks of the non-empty slots, the scheduler sleeps until the first one
+        self.ticks: list[int] = []
+        self.queued: set[int] = set()
+        self.origin = time.perf_counter()
+        self.current = 0
+        self.stop_event = Event()
+        self.thread: Thread | None = None
+
+    def schedule(self, pacer: Pacer) -> None:
+        tick = math.ceil((pacer.deadline - self.origin) / self.resolution)
+        with self.lock:
+            # A deadline in the current (already processed) slot goes to the next one
+            pacer.tick = max(tick, self.current + 1)
+            self.wheel[pacer.tick % len(self.wheel)].append(pacer)
+            if pacer.tick not in self.queued:
+                if not self.ticks or pacer.tick < self.ticks[0]:
+                    self.lock.notify()
+                self.queued.add(pacer.tick)
+                heapq.heappush(self.ticks, pacer.tick)
+
+    def every(
+            self,
+            interval: float,
+            task: Callable[[], object],
+            offset: float = 0.0,
+            name: str | None = None
+    ) -> Pacer:
+        """
+        Runs the task every ``interval`` seconds, e.g. one request every 5 s per virtual user.
+
+        A run is never started while the previous one is in progress, its deadlines are skipped
+        and counted in ``Pacer.missed``.
+
+        :param interval: Pacing interval in seconds.
+        :param task: The function to run.
+        :param offset: Delay of the first run, spreads the users over the interval.
+        :param name: The measurement name of the task, the function name by default.
+        :return: The pacer, which can be cancelled.
+        """
+        pacer = Pacer(task, name, interval, time.perf_counter() + offset)
+        self.schedule(pacer)
+        return pacer
+
+    def after(self, delay: float, task: Callable[[], object], name: str | None = None) -> Pacer:
+        """
+        Runs the task once after the delay, e.g. a think time before the next step of a scenario.
+
+        :param delay: Delay in seconds.
+        :param task: The function to run.
+        :param name: The measurement name of the task, the function name by default.
+        :return: The pacer, which can be cancelled.
+        """
+        pacer = Pacer(task, name, None, time.perf_counter() + delay)
+        self.schedule(pacer)
+        return pacer
+
+    def execute(self, pacer: Pacer) -> None:
+        start = time.perf_counter()
+        error = True
+        try:
+            pacer.task()
+            error = False
+        finally:
+            end = time.perf_counter()
+            self.metrics.record_many([
+                ('pacing.lag', start - pacer.deadline, False),
+                (pacer.name, end - start, error),
+            ])
+            if pacer.interval is not None and not pacer.cancelled and not self.stop_event.is_set():
+                pacer.deadline += pacer.interval
+                if pacer.deadline < end:
+                    skipped = math.ceil((end - pacer.deadline) / pacer.interval)
+                    pacer.missed += skipped
+                    pacer.deadline += skipped * pacer.interval
+                self.schedule(pacer)
+
+    def run_wheel(self) -> None:
+        while True:
+            with self.lock:
+                if self.stop_event.is_set():
+                    return
+                if not self.ticks:
+                    self.lock.wait()
+                    continue
+                tick = self.ticks[0]
+                delay = self.origin + tick * self.resolution - time.perf_counter()
+                if delay > 0:
+                    # Woken up earlier by a task scheduled before the tick or by stop()
+                    self.lock.wait(delay)
+                    continue
+
+                heapq.heappop(self.ticks)
+                self.queued.discard(tick)
+                self.current = tick
+                slot = self.wheel[tick % len(self.wheel)]
+                due = [pacer for pacer in slot if pacer.tick <= tick]
+                if due:
+                    slot[:] = [pacer for pacer in slot if pacer.tick > tick]
+
+            for pacer in due:
+                if not pacer.cancelled:
+                    self.executor.submit(self.execute, pacer)
+
+    def start(self) -> 'PacingEngine':
+        if self.thread is not None:
+            raise RuntimeError('The pacing engine is already running')
+
+        self.stop_event.clear()
+        self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='pacing')
+        self.thread = Thread(target=self.run_wheel, name='pacing-wheel', daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        """
+        Stops scheduling, cancels the scheduled tasks and waits for the running tasks to finish.
+        """
+        self.stop_event.set()
+        with self.lock:
+            self.lock.notify()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        if self.executor is not None:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+            self.executor = None
+
+        with self.lock:
+            for slot in self.wheel:
+                for pacer in slot:
+                    pacer.cancel()
+                slot.clear()
+            self.ticks.clear()
+            self.queued.clear()
+
+    def run(self, duration: float) -> None:
+        """
+        Runs the scheduled tasks for ``duration`` seconds and stops.
+
+        :param duration: Duration in seconds.
+        """
+        self.start()
+        try:
+            time.sleep(duration)
+        finally:
+            self.stop()
+
+    def __enter__(self) -> 'PacingEngine':
+        return self.start()
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """
+        Returns the scheduling lag and task statistics, see :meth:`tools.metrics.Metrics.summary`.
+        """
+        return self.metrics.summary()
@@ -0,0 +1,274 @@
+import gc
+import os
+import sys
+import threading
+import time
+import warnings
+from collections import Counter, deque
+from queue import Empty, SimpleQueue
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from tools.metrics import Metrics
+
+if TYPE_CHECKING:
+    import asyncio
+
+# Functions of the client hot paths: response validation, fake data generation, JSON encoding
+HOT_PATHS = ('model_validate_json', 'faker', 'json')
+
+
+@dataclass
+class ResourceSample:
+    """
+    Resource usage of the load generator process over one sampling interval.
+    """
+    timestamp: float
+    cpu_percent: float
+    rss_bytes: int
+    gc_pause: float
+    open_sockets: int | None
+    loop_lag: float | None = None
+
+
+def read_rss() -> int:
+    """
+    Returns the resident set size of the current process in bytes.
+
+    Falls back to the peak RSS where ``/proc`` is not available.
+    """
+    try:
+        with open('/proc/self/statm') as file:
+            return int(file.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except OSError:
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def count_open_sockets() -> int | None:
+    """
+    Returns the number of sockets opened by the current process, None if it cannot be determined.
+    """
+    try:
+        descriptors = os.listdir('/proc/self/fd')
+    except OSError:
+        return None
+
+    sockets = 0
+    for descriptor in descriptors:
+        try:
+            sockets += os.readlink(f'/proc/self/fd/{descriptor}').startswith('socket:')
+        except OSError:
+            pass
+    return sockets
+
+
+class ResourceSampler:
+    """
+    Periodically samples resource usage of the load generator itself.
+
+    Records process CPU, RSS, time spent in garbage collection, open sockets and, if an event
+    loop is given, event loop lag. GC pauses and loop lag are also recorded into the request
+    metrics (as ``generator.gc_pause`` and ``generator.loop_lag``), so they can be compared
+    with request latencies. A ``RuntimeWarning`` is issued when the generator CPU usage
+    reaches the threshold, i.e. measured latencies may include client-side queueing.
+
+    :param interval: Sampling interval in seconds.
+    :param cpu_threshold: CPU usage (percent of one core) considered saturation.
+    :param metrics: Request metrics to record GC pauses and loop lag into.
+    :param loop: Event loop to measure the lag of, in async mode.
+    :param history: Number of samples kept.
+    """
+
+    def __init__(
+            self,
+            interval: float = 1.0,
+            cpu_threshold: float = 90.0,
+            metrics: Metrics | None = None,
+            loop: 'asyncio.AbstractEventLoop | None' = None,
+            history: int = 3600
+    ):
+        self.interval = interval
+        self.cpu_threshold = cpu_threshold
+        self.metrics = metrics
+        self.loop = loop
+        self.samples: deque[ResourceSample] = deque(maxlen=history)
+        self.saturated = 0
+
+        # GC callbacks may run while the thread holds the metrics lock, so pauses are only
+        # queued there (SimpleQueue.put is reentrant) and recorded by the sampler thread
+        self.gc_pauses: SimpleQueue[float] = SimpleQueue()
+        self.gc_started: float | None = None
+        self.loop_lag: float | None = None
+        self.stop_event = threading.Event()
+        self.thread: threading.Thread | None = None
+
+    def on_gc(self, phase: str, info: dict[str, Any]) -> None:
+        if phase == 'start':
+            self.gc_started = time.perf_counter()
+        elif self.gc_started is not None:
+            self.gc_pauses.put(time.perf_counter() - self.gc_started)
+            self.gc_started = None
+
+    def drain_gc_pauses(self) -> float:
+        """
+        Records the queued GC pauses into the request metrics.
+
+        :return: The total pause in seconds.
+        """
+        pauses = []
+        while True:
+            try:
+                pauses.append(self.gc_pauses.get_nowait())
+            except Empty:
+                break
+        if pauses and self.metrics is not None:
+            self.metrics.record_many([('generator.gc_pause', pause, False) for pause in pauses])
+        return sum(pauses)
+
+    def measure_loop_lag(self) -> None:
+        scheduled = time.perf_counter()
+
+        def callback() -> None:
+            self.loop_lag = time.perf_counter() - scheduled
+            if self.metrics is not None:
+                self.metrics.record('generator.loop_lag', self.loop_lag)
+
+        self.loop.call_soon_threadsafe(callback)
+
+    def run(self) -> None:
+        wall, cpu = time.perf_counter(), time.process_time()
+        while not self.stop_event.wait(self.interval):
+            if self.loop is not None and not self.loop.is_closed():
+                self.measure_loop_lag()
+
+            now_wall, now_cpu = time.perf_counter(), time.process_time()
+            cpu_percent = (now_cpu - cpu) / (now_wall - wall) * 100
+            wall, cpu = now_wall, now_cpu
+
+            self.samples.append(ResourceSample(
+                timestamp=time.time(),
+                cpu_percent=cpu_percent,
+                rss_bytes=read_rss(),
+                gc_pause=self.drain_gc_pauses(),
+                open_sockets=count_open_sockets(),
+                loop_lag=self.loop_lag,
+            ))
+
+            if cpu_percent >= self.cpu_threshold:
+                self.saturated += 1
+                warnings.warn(
+                    f'Load generator CPU usage reached {self.cpu_threshold:.0f}%, '
+                    f'results may be limited by the generator',
+                    RuntimeWarning
+                )
+
+    def start(self) -> 'ResourceSampler':
+        gc.callbacks.append(self.on_gc)
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self.run, name='resource-sampler', daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join()
+        if self.on_gc in gc.callbacks:
+            gc.callbacks.remove(self.on_gc)
+        self.drain_gc_pauses()
+
+    def __enter__(self) -> 'ResourceSampler':
+        return self.start()
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+    def summary(self) -> dict[str, float | int | None]:
+        """
+        Returns the aggregated resource usage over the kept samples.
+        """
+        samples = list(self.samples)
+        if not samples:
+            return {}
+
+        sockets = [sample.open_sockets for sample in samples if sample.open_sockets is not None]
+        lags = [sample.loop_lag for sample in samples if sample.loop_lag is not None]
+        return {
+            'cpu_mean_percent': sum(sample.cpu_percent for sample in samples) / len(samples),
+            'cpu_max_percent': max(sample.cpu_percent for sample in samples),
+            'rss_max_bytes': max(sample.rss_bytes for sample in samples),
+            'gc_pause_total': sum(sample.gc_pause for sample in samples),
+            'open_sockets_max': max(sockets) if sockets else None,
+            'loop_lag_max': max(lags) if lags else None,
+            'saturated_samples': self.saturated,
+        }
+
+
+class StackSampler:
+    """
+    Sampling profiler of all threads of the process.
+
+    Stacks are collected every ``interval`` seconds and written in the folded format
+    (``frame;frame;frame count`` per line) accepted by flamegraph.pl, speedscope and similar tools.
+
+    :param interval: Sampling interval in seconds.
+    :param focus: Keep only stacks with a frame whose module or function name contains
+                  one of the substrings, ``HOT_PATHS`` by default. Empty keeps all stacks.
+    """
+
+    def __init__(self, interval: float = 0.005, focus: tuple[str, ...] = HOT_PATHS):
+        self.interval = interval
+        self.focus = focus
+        self.stacks: Counter[str] = Counter()
+        self.stop_event = threading.Event()
+        self.thread: threading.Thread | None = None
+
+    def sample(self) -> None:
+        own_thread = threading.get_ident()
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_thread:
+                continue
+
+            frames = []
+            while frame is not None:
+                code = frame.f_code
+                frames.append(f'{frame.f_globals.get("__name__", "?")}:{code.co_name}')
+                frame = frame.f_back
+            stack = ';'.join(reversed(frames))
+            if not self.focus or any(path in stack for path in self.focus):
+                self.stacks[stack] += 1
+
+    def run(self) -> None:
+        while not self.stop_event.wait(self.interval):
+            self.sample()
+
+    def start(self) -> 'StackSampler':
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self.run, name='stack-sampler', daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join()
+
+    def __enter__(self) -> 'StackSampler':
+        return self.start()
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+    def dump(self, path: str | Path) -> None:
+        """
+        Writes collected stacks in the folded format.
+
+        :param path: Path of the output file.
+        """
+        with open(path, 'w', encoding='utf-8') as file:
+            for stack, count in self.stacks.most_common():
+                file.write(f'{stack} {count}\n')
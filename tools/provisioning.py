@@ -0,0 +1,195 @@
+"""
+Pipelined provisioning of test entities: user -> account -> card.
+
+Every hop is a stage with its own pool of worker threads and a bounded input queue, so while
+one user gets a card, the next ones get accounts and are being created. A slow stage fills
+its queue and blocks the previous one (backpressure) instead of accumulating unbounded work::
+
+    pipeline = ProvisioningPipeline(client, workers={'user': 8, 'account': 8, 'card': 8})
+    result = pipeline.run(1000)
+    print(result.summary())
+"""
+import time
+from dataclasses import dataclass, field
+from queue import Queue
+from threading import Lock, Thread
+from typing import Any, Callable
+
+from httpx import Client
+
+from clients.http.gateway.accounts.client import AccountsGatewayHTTPClient
+from clients.http.gateway.cards.client import CardsGatewayHTTPClient
+from clients.http.gateway.users.client import UsersGatewayHTTPClient
+from tools.entities import EntityStore
+
+STAGES = ('user', 'account', 'card')
+ACCOUNT_TYPES = ('deposit', 'savings', 'debit_card', 'credit_card')
+CARD_TYPES = ('virtual', 'physical')
+
+_DONE = object()
+
+
+@dataclass
+class StageStats:
+    """
+    Counters of one pipeline stage.
+
+    ``backlog_max`` is the largest observed number of items waiting in the stage input queue.
+    """
+    workers: int
+    processed: int = 0
+    failed: int = 0
+    busy: float = 0.0
+    backlog_max: int = 0
+    lock: Lock = field(default_factory=Lock, repr=False)
+
+    def record(self, elapsed: float, error: bool) -> None:
+        with self.lock:
+            self.busy += elapsed
+            if error:
+                self.failed += 1
+            else:
+                self.processed += 1
+
+    def summary(self, elapsed: float) -> dict[str, float]:
+        """
+        Returns the stage statistics.
+
+        :param elapsed: Duration of the run, used to calculate throughput and utilization.
+        :return: A dictionary with counters, throughput (per second) and worker utilization (0-1).
+        """
+        return {
+            'processed': self.processed,
+            'failed': self.failed,
+            'rps': self.processed / elapsed if elapsed else 0.0,
+            'utilization': self.busy / (elapsed * self.workers) if elapsed else 0.0,
+            'backlog_max': self.backlog_max,
+        }
+
+
+@dataclass
+class ProvisioningResult:
+    """
+    Results of a provisioning run.
+
+    ``failures`` contains error messages by stage, the entities failed on a stage are not passed further.
+    """
+    store: EntityStore
+    elapsed: float
+    stages: dict[str, StageStats]
+    failures: dict[str, list[str]]
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        return {name: stats.summary(self.elapsed) for name, stats in self.stages.items()}
+
+
+class ProvisioningPipeline:
+    """
+    Provisions users with an account and a card using independent, bounded stages.
+
+    :param client: The HTTP client shared by all stages, its pool should allow as many
+                   connections as there are workers in total.
+    :param store: The store to add provisioned entities to, a new one by default.
+    :param account_type: Type of the opened account, one of ``ACCOUNT_TYPES``.
+    :param card_type: Type of the issued card, one of ``CARD_TYPES``, None to skip the card stage.
+    :param workers: Number of worker threads by stage name, 4 per stage by default.
+    :param queue_size: Capacity of every stage input queue.
+    """
+
+    def __init__(
+            self,
+            client: Client,
+            store: EntityStore | None = None,
+            account_type: str = 'debit_card',
+            card_type: str | None = 'virtual',
+            workers: dict[str, int] | None = None,
+            queue_size: int = 64
+    ):
+        if account_type not in ACCOUNT_TYPES:
+            raise ValueError(f'Unknown account type {account_type!r}, expected one of {ACCOUNT_TYPES}')
+        if card_type is not None and card_type not in CARD_TYPES:
+            raise ValueError(f'Unknown card type {card_type!r}, expected one of {CARD_TYPES}')
+
+        self.store = store if store is not None else EntityStore()
+        self.users_client = UsersGatewayHTTPClient(client=client)
+        self.open_account = getattr(AccountsGatewayHTTPClient(client=client), f'open_{account_type}_account')
+        self.issue_card = (
+            getattr(CardsGatewayHTTPClient(client=client), f'issue_{card_type}_card') if card_type else None
+        )
+        self.stage_names = STAGES if card_type else STAGES[:2]
+        self.workers = {name: (workers or {}).get(name, 4) for name in self.stage_names}
+        self.queue_size = queue_size
+
+    def create_user(self, index: int) -> str:
+        return self.store.add_user(self.users_client.create_user().user).id
+
+    def create_account(self, user_id: str) -> tuple[str, str]:
+        return user_id, self.store.add_account(user_id, self.open_account(user_id).account).id
+
+    def create_card(self, ids: tuple[str, str]) -> None:
+        user_id, account_id = ids
+        self.store.add_card(user_id, self.issue_card(user_id, account_id).card)
+
+    def run(self, count: int) -> ProvisioningResult:
+        """
+        Provisions ``count`` entities and waits until all stages are drained.
+
+        :param count: Number of users to create.
+        :return: The store with provisioned entities and per-stage statistics.
+        """
+        handlers: dict[str, Callable[[Any], Any]] = {
+            'user': self.create_user, 'account': self.create_account, 'card': self.create_card
+        }
+        queues = {name: Queue(maxsize=self.queue_size) for name in self.stage_names}
+        stats = {name: StageStats(workers=self.workers[name]) for name in self.stage_names}
+        failures: dict[str, list[str]] = {name: [] for name in self.stage_names}
+
+        def put(name: str, item: Any) -> None:
+            queue = queues[name]
+            queue.put(item)
+            backlog = queue.qsize()
+            if backlog > stats[name].backlog_max:
+                stats[name].backlog_max = backlog
+
+        def work(position: int) -> None:
+            name = self.stage_names[position]
+            handler, queue = handlers[name], queues[name]
+            following = self.stage_names[position + 1] if position + 1 < len(self.stage_names) else None
+            while (item := queue.get()) is not _DONE:
+                start = time.perf_counter()
+                try:
+                    result = handler(item)
+                except Exception as ex:
+                    stats[name].record(time.perf_counter() - start, error=True)
+                    failures[name].append(str(ex))
+                    continue
+                stats[name].record(time.perf_counter() - start, error=False)
+                if following is not None:
+                    put(following, result)
+
+        threads = {
+            name: [
+                Thread(target=work, args=(position,), name=f'provision-{name}-{index}', daemon=True)
+                for index in range(self.workers[name])
+            ]
+            for position, name in enumerate(self.stage_names)
+        }
+        start = time.perf_counter()
+        for stage_threads in threads.values():
+            for thread in stage_threads:
+                thread.start()
+
+        for index in range(count):
+            put('user', index)
+        for name in self.stage_names:
+            for _ in threads[name]:
+                queues[name].put(_DONE)
+            for thread in threads[name]:
+                thread.join()
+
+        return ProvisioningResult(
+            store=self.store,
+            elapsed=time.perf_counter() - start,
+            stages=stats,
+            failures=failures,
+        )
@@ -0,0 +1,325 @@
+import itertools
+import math
+import statistics
+import time
+from dataclasses import dataclass
+from queue import Queue
+from threading import Event, Lock, Thread
+from typing import Any, Callable
+
+from httpx import Client, Limits
+
+from clients.http.gateway.client import build_gateway_http_client
+from clients.http.gateway.settings import get_settings
+from clients.http.ratelimit import RateLimiter, ShedRequestError
+from tools.fakers import fake
+from tools.metrics import Metrics, MetricsBuffer
+
+
+@dataclass
+class ScenarioContext:
+    """
+    State available to a scenario iteration.
+
+    :param client: The httpx.Client shared by all worker threads.
+    :param metrics: Metrics buffer of the current worker thread.
+    :param worker_id: Index of the worker thread.
+    :param iteration: Index of the iteration within the worker thread.
+    :param rate_limiter: The rate limiter of the run, to be passed to the gateway clients.
+    """
+    client: Client
+    metrics: MetricsBuffer
+    worker_id: int
+    iteration: int = 0
+    rate_limiter: RateLimiter | None = None
+
+
+Scenario = Callable[[ScenarioContext], Any]
+
+
+@dataclass
+class SteadyState:
+    """
+    Automatic detection of the end of the warm-up.
+
+    Every ``interval`` seconds the throughput and the mean latency of the scenario over the interval
+    are sampled. The system is considered stable when the coefficient of variation (standard
+    deviation divided by mean) of both over the last ``window`` samples is below ``max_variation``.
+
+    :param window: Number of samples in the sliding window.
+    :param interval: Sampling interval in seconds.
+    :param max_variation: Maximum coefficient of variation of throughput and latency.
+    :param timeout: Maximum warm-up duration in seconds, the measurement starts anyway when it expires.
+    """
+    window: int = 5
+    interval: float = 1.0
+    max_variation: float = 0.1
+    timeout: float = 60.0
+
+    def is_stable(self, samples: list[tuple[float, float]]) -> bool:
+        """
+        Checks the last ``window`` samples.
+
+        :param samples: (throughput, mean latency) samples, the oldest first.
+        :return: True if both throughput and latency are stable.
+        """
+        if len(samples) < self.window:
+            return False
+
+        recent = samples[-self.window:]
+        for values in ([sample[0] for sample in recent], [sample[1] for sample in recent]):
+            mean = statistics.fmean(values)
+            variation = statistics.pstdev(values) / mean if mean else math.inf
+            if variation > self.max_variation:
+                return False
+        return True
+
+
+@dataclass
+class RunResult:
+    """
+    Results of a scenario run.
+
+    ``elapsed`` and ``metrics`` cover the measured window only, the warm-up is reported separately:
+    its duration, its metrics and whether the steady state was detected (None without detection).
+    """
+    threads: int
+    iterations: int
+    elapsed: float
+    metrics: Metrics
+    warmup: float = 0.0
+    warmup_metrics: Metrics | None = None
+    steady: bool | None = None
+
+    @property
+    def throughput(self) -> float:
+        """
+        Completed iterations per second.
+        """
+        return self.iterations / self.elapsed if self.elapsed else 0.0
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        return self.metrics.summary(self.elapsed)
+
+
+class ThreadPoolRunner:
+    """
+    Runs scenario iterations on a pool of worker threads sharing one httpx.Client.
+
+    Every iteration is measured under the scenario name, scenarios may record additional
+    per-endpoint measurements with ``context.metrics.measure(name)``. Measurements are
+    buffered per thread and flushed into the shared metrics in batches.
+
+    A run may start with a warm-up (fixed, or until the steady state is detected, see
+    :class:`SteadyState`): connections are established and schemas are compiled while
+    iterations are recorded into separate metrics, excluded from the results.
+
+    Iterations failed with :class:`ShedRequestError` (the gateway shed load with 429/503, or
+    the rate limiter skipped the request) are not errors of the scenario, they are recorded
+    separately under ``<scenario>.shed``. With a ``skip`` mode rate limiter an open-model run
+    keeps its arrival schedule while the gateway asks to back off.
+
+    :param scenario: A function executing one iteration of the scenario.
+    :param threads: Number of worker threads.
+    :param client: The shared httpx.Client. A gateway client of the target is built if not set,
+                   its pool is sized for ``threads`` connections unless the target settings
+                   configure the pool limits.
+    :param batch_size: Size of per-thread metric batches.
+    :param flush_interval: Maximum age (seconds) of per-thread metric batches, lower it to read the
+                           metrics while the run is in progress more often.
+    :param seed: Run seed making generated payloads reproducible, every iteration draws fake data
+                 from a stream derived from the seed and the run-wide iteration index, whichever
+                 thread executes it. The seed applies to the iterations of this runner only, concurrent
+                 runners (e.g. of :mod:`tools.compare`) are seeded independently.
+    :param target: The name of the gateway target of the built client, the default target if not set.
+    :param rate_limiter: Optional rate limiter shared by all iterations, see :attr:`ScenarioContext.rate_limiter`.
+    """
+
+    def __init__(
+            self,
+            scenario: Scenario,
+            threads: int,
+            client: Client | None = None,
+            batch_size: int = 256,
+            seed: int | None = None,
+            target: str | None = None,
+            rate_limiter: RateLimiter | None = None,
+            flush_interval: float = 1.0
+    ):
+        self.scenario = scenario
+        self.threads = threads
+        self.client = client or build_gateway_http_client(limits=self.default_limits(threads, target), target=target)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.seed = seed
+        self.rate_limiter = rate_limiter
+        self.name = getattr(scenario, '__name__', 'scenario')
+
+    @staticmethod
+    def default_limits(threads: int, target: str | None) -> Limits | None:
+        """
+        Returns pool limits sized for ``threads`` connections, None if the target configures its own.
+        """
+        settings = get_settings().target(target)
+        if {'max_connections', 'max_keepalive_connections'} & settings.model_fields_set:
+            return None
+        return Limits(max_connections=threads, max_keepalive_connections=threads)
+
+    def run(
+            self,
+            iterations: int | None = None,
+            duration: float | None = None,
+            rps: float | None = None,
+            metrics: Metrics | None = None,
+            warmup: float = 0.0,
+            steady_state: SteadyState | None = None
+    ) -> RunResult:
+        """
+        Runs the scenario until the total number of iterations is reached or the duration expires.
+
+        By default every thread starts the next iteration as soon as the previous one is finished
+        (closed model). With ``rps`` iterations are started at a fixed arrival rate regardless of
+        how fast the gateway responds (open model), iteration latency is then measured from the
+        scheduled start, so time spent waiting for a free thread is included.
+
+        :param iterations: Total number of iterations across all threads.
+        :param duration: Run duration in seconds.
+        :param rps: Target arrival rate of iterations per second.
+        :param metrics: Metrics to record into, e.g. to take snapshots while the run is in progress.
+        :param warmup: Warm-up duration in seconds. Iterations started during the warm-up are recorded
+                       into separate metrics and do not count towards ``iterations`` and ``duration``.
+        :param steady_state: Extends the warm-up until the steady state is detected.
+        :return: The run results.
+        """
+        if iterations is None and duration is None:
+            raise ValueError('Either iterations or duration should be set')
+
+        metrics = metrics or Metrics()
+        warmup_metrics = Metrics()
+        has_warmup = bool(warmup) or steady_state is not None
+        # Iterations scheduled before the measured window starts belong to the warm-up
+        measured_from = [math.inf if has_warmup else -math.inf]
+        stop = Event()
+        lock = Lock()
+        remaining = [iterations]
+        arrivals: Queue[tuple[float, int] | None] | None = Queue() if rps else None
+        # Run-wide iteration indexes, fake data streams are keyed by them, not by worker threads
+        indexes = itertools.count()
+
+        def take_iteration() -> bool:
+            if stop.is_set():
+                return False
+            if remaining[0] is None or time.perf_counter() < measured_from[0]:
+                return True
+            with lock:
+                if remaining[0] <= 0:
+                    return False
+                remaining[0] -= 1
+                return True
+
+        def next_start() -> tuple[float, int] | None:
+            if arrivals is None:
+                return (time.perf_counter(), next(indexes)) if take_iteration() else None
+            arrival = arrivals.get()
+            return None if arrival is None or stop.is_set() else arrival
+
+        def dispatch() -> None:
+            index = measured = 0
+            while iterations is None or measured < iterations:
+                scheduled = start + index / rps
+                delay = scheduled - time.perf_counter()
+                if delay > 0 and stop.wait(delay) or stop.is_set():
+                    break
+                arrivals.put((scheduled, index))
+                measured += scheduled >= measured_from[0]
+                index += 1
+            for _ in range(self.threads):
+                arrivals.put(None)
+
+        def worker(worker_id: int) -> None:
+            buffers = (
+                MetricsBuffer(warmup_metrics, batch_size=self.batch_size, flush_interval=warmup_flush_interval),
+                MetricsBuffer(metrics, batch_size=self.batch_size, flush_interval=self.flush_interval),
+            )
+            context = ScenarioContext(
+                client=self.client, metrics=buffers[1], worker_id=worker_id, rate_limiter=self.rate_limiter
+            )
+            try:
+                while (arrival := next_start()) is not None:
+                    scheduled, index = arrival
+                    context.metrics = buffers[scheduled >= measured_from[0]]
+                    name, error = self.name, True
+                    try:
+                        with fake.stream(index, seed=self.seed):
+                            self.scenario(context)
+                        error = False
+                    except ShedRequestError:
+                        name, error = shed_name, False
+                    except Exception:
+                        pass
+                    context.metrics.record(name, time.perf_counter() - scheduled, error)
+                    context.iteration += 1
+            finally:
+                for buffer in buffers:
+                    buffer.flush()
+
+        threads = [Thread(target=worker, args=(index,), daemon=True) for index in range(self.threads)]
+        if arrivals is not None:
+            threads.append(Thread(target=dispatch, daemon=True))
+
+        shed_name = f'{self.name}.shed'
+        warmup_flush_interval = min(1.0, steady_state.interval / 4) if steady_state is not None else 1.0
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+
+        steady = None
+        if has_warmup:
+            time.sleep(warmup)
+            if steady_state is not None:
+                steady = self.wait_for_steady_state(steady_state, warmup_metrics, start)
+
+        measured_start = time.perf_counter()
+        if has_warmup:
+            measured_from[0] = measured_start
+        deadline = measured_start + duration if duration is not None else None
+        for thread in threads:
+            thread.join(None if deadline is None else max(0.0, deadline - time.perf_counter()))
+        stop.set()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - measured_start
+
+        completed = metrics.endpoints[self.name].histogram.count if self.name in metrics.endpoints else 0
+        return RunResult(
+            threads=self.threads,
+            iterations=completed,
+            elapsed=elapsed,
+            metrics=metrics,
+            warmup=measured_start - start if has_warmup else 0.0,
+            warmup_metrics=warmup_metrics if has_warmup else None,
+            steady=steady,
+        )
+
+    def wait_for_steady_state(self, steady_state: SteadyState, metrics: Metrics, start: float) -> bool:
+        """
+        Samples the warm-up metrics until the steady state is detected or the timeout expires.
+
+        :return: True if the steady state was detected.
+        """
+        samples = []
+        previous_count, previous_total = 0, 0.0
+        while time.perf_counter() - start < steady_state.timeout:
+            time.sleep(steady_state.interval)
+            with metrics.lock:
+                stats = metrics.endpoints.get(self.name)
+                count, total = (stats.histogram.count, stats.histogram.total) if stats else (0, 0.0)
+            completed = count - previous_count
+            samples.append((
+                completed / steady_state.interval,
+                (total - previous_total) / completed if completed else 0.0,
+            ))
+            previous_count, previous_total = count, total
+            if steady_state.is_stable(samples):
+                return True
+        return False
@@ -0,0 +1,188 @@
+from dataclasses import dataclass, field
+from typing import Any
+
+from httpx import Client
+
+from tools.runner import Scenario, ThreadPoolRunner
+
+
+@dataclass
+class SLO:
+    """
+    Service level objective a load step has to meet.
+
+    :param p99_ms: Maximum 99th percentile of iteration latency, milliseconds.
+    :param max_error_rate: Maximum share of failed iterations.
+    :param min_achieved: Minimum share of the target rate that has to be actually achieved.
+    """
+    p99_ms: float
+    max_error_rate: float = 0.01
+    min_achieved: float = 0.95
+
+
+@dataclass
+class SearchStep:
+    """
+    Results of one load step.
+    """
+    rps: float
+    achieved_rps: float
+    p99_ms: float
+    error_rate: float
+    passed: bool
+
+
+@dataclass
+class SearchState:
+    """
+    Progress of a throughput search.
+
+    ``low`` is the highest rate which met the SLO, ``high`` is the lowest rate which did not.
+    If no step met the SLO, the sustainable rate is below the rate of the first step and
+    ``below_start`` is set. The state can be passed back to :meth:`ThroughputSearch.run` to continue a search,
+    e.g. with a higher precision, without repeating the finished steps.
+    """
+    low: float = 0.0
+    high: float | None = None
+    steps: list[SearchStep] = field(default_factory=list)
+
+    @property
+    def max_sustainable_rps(self) -> float:
+        return self.low
+
+    @property
+    def below_start(self) -> bool:
+        return self.high is not None and not self.low
+
+
+class ThroughputSearch:
+    """
+    Finds the highest arrival rate a scenario sustains within the SLO.
+
+    The rate is multiplied by ``growth`` until a step violates the SLO, then the interval
+    between the last passing and the first failing rate is bisected until it is narrower
+    than ``precision`` (relative). If the first step already violates the SLO, the search stops,
+    see :attr:`SearchState.below_start`. Every step runs the open-model runner for ``step_duration``
+    seconds on the same connection pool, so connections stay warm between steps.
+
+    :param runner: The runner of the scenario.
+    :param slo: The objective every step has to meet.
+    :param step_duration: Duration of a step in seconds.
+    :param start_rps: The rate of the first step.
+    :param growth: Rate multiplier of the ramp-up phase.
+    :param precision: Relative width of the final interval.
+    :param max_rps: Upper bound of the search.
+    :param max_steps: Upper bound of the number of steps of one :meth:`run`.
+    :param warmup: Warm-up of every step in seconds, excluded from the step results.
+    """
+
+    def __init__(
+            self,
+            runner: ThreadPoolRunner,
+            slo: SLO,
+            step_duration: float = 10.0,
+            start_rps: float = 10.0,
+            growth: float = 2.0,
+            precision: float = 0.05,
+            max_rps: float | None = None,
+            max_steps: int = 20,
+            warmup: float = 0.0
+    ):
+        self.runner = runner
+        self.slo = slo
+        self.step_duration = step_duration
+        self.start_rps = start_rps
+        self.growth = growth
+        self.precision = precision
+        self.max_rps = max_rps
+        self.max_steps = max_steps
+        self.warmup = warmup
+
+    def step(self, rps: float) -> SearchStep:
+        """
+        Runs one load step and checks it against the SLO.
+
+        :param rps: The target arrival rate.
+        :return: The step results.
+        """
+        result = self.runner.run(duration=self.step_duration, rps=rps, warmup=self.warmup)
+        stats = result.summary().get(self.runner.name, {})
+        count = stats.get('count', 0)
+        error_rate = stats['errors'] / count if count else 1.0
+        achieved_rps = stats.get('rps', 0.0)
+        p99_ms = stats.get('p99_ms', 0.0)
+        return SearchStep(
+            rps=rps,
+            achieved_rps=achieved_rps,
+            p99_ms=p99_ms,
+            error_rate=error_rate,
+            passed=(
+                    p99_ms <= self.slo.p99_ms
+                    and error_rate <= self.slo.max_error_rate
+                    and achieved_rps >= rps * self.slo.min_achieved
+            ),
+        )
+
+    def next_rps(self, state: SearchState) -> float | None:
+        """
+        Chooses the rate of the next step, None when the search is finished.
+        """
+        if state.below_start:
+            return None
+
+        if state.high is None:
+            rps = state.low * self.growth if state.low else self.start_rps
+            if self.max_rps is not None:
+                if state.low >= self.max_rps:
+                    return None
+                rps = min(rps, self.max_rps)
+            return rps
+
+        if state.high - state.low <= state.high * self.precision:
+            return None
+        return (state.low + state.high) / 2
+
+    def run(self, state: SearchState | None = None) -> SearchState:
+        """
+        Runs the search until the precision, the maximum rate or the step limit is reached.
+
+        Steps of a continued search count towards the limit of the run they were made by only.
+
+        :param state: State of a previous search to continue.
+        :return: The final search state.
+        """
+        state = state or SearchState()
+        limit = len(state.steps) + self.max_steps
+        while len(state.steps) < limit and (rps := self.next_rps(state)) is not None:
+            step = self.step(rps)
+            state.steps.append(step)
+            if step.passed:
+                state.low = max(state.low, rps)
+            else:
+                state.high = rps if state.high is None else min(state.high, rps)
+        return state
+
+
+def search_scenarios(
+        scenarios: list[Scenario],
+        slo: SLO,
+        threads: int,
+        client: Client | None = None,
+        **options: Any
+) -> dict[str, SearchState]:
+    """
+    Finds the highest sustainable rate of every scenario, one after another on the same client.
+
+    :param scenarios: Scenario functions, reported by their names.
+    :param slo: The objective every step has to meet.
+    :param threads: Number of runner threads.
+    :param client: The HTTP client shared by the runners, the gateway client by default.
+    :param options: Other :class:`ThroughputSearch` parameters.
+    :return: Search states by scenario name.
+    """
+    results = {}
+    for scenario in scenarios:
+        runner = ThreadPoolRunner(scenario, threads=threads, client=client)
+        client = runner.client
+        results[runner.name] = ThroughputSearch(runner, slo, **options).run()
+    return results
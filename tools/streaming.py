@@ -0,0 +1,355 @@
+import json
+import mmap
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+_WHITESPACE = ' \t\n\r'
+_decoder = json.JSONDecoder()
+_QUOTE, _BACKSLASH, _COLON = ord('"'), ord('\\'), ord(':')
+
+
+class JSONStreamReader:
+    """
+    Incremental reader over a JSON document delivered in text chunks.
+
+    Keeps only the not yet consumed part of the document in memory, so large documents
+    can be processed with bounded memory.
+
+    :param chunks: An iterable of text chunks (e.g. ``response.iter_text()``).
+    """
+
+    def __init__(self, chunks: Iterable[str]):
+        self.chunks = iter(chunks)
+        self.buffer = ''
+        self.position = 0
+        self.exhausted = False
+
+    def _fill(self) -> bool:
+        """
+        Reads the next chunk into the buffer, dropping the already consumed prefix.
+
+        :return: False if the source has no more chunks.
+        """
+        if self.exhausted:
+            return False
+
+        for chunk in self.chunks:
+            if chunk:
+                self.buffer = self.buffer[self.position:] + chunk
+                self.position = 0
+                return True
+
+        self.exhausted = True
+        return False
+
+    def peek(self) -> str:
+        """
+        Skips whitespace and returns the next significant character without consuming it.
+
+        :return: The next character, or an empty string at the end of the document.
+        """
+        while True:
+            while self.position < len(self.buffer) and self.buffer[self.position] in _WHITESPACE:
+                self.position += 1
+            if self.position < len(self.buffer):
+                return self.buffer[self.position]
+            if not self._fill():
+                return ''
+
+    def expect(self, *tokens: str) -> str:
+        """
+        Consumes the next significant character, which must be one of the given tokens.
+
+        :param tokens: Allowed characters.
+        :return: The consumed character.
+        """
+        char = self.peek()
+        if char not in tokens:
+            raise ValueError(f'Expected one of {tokens!r} at offset {self.position}, got {char!r}')
+        self.position += 1
+        return char
+
+    def value(self) -> Any:
+        """
+        Decodes the next complete JSON value, reading more chunks until it is available.
+
+        :return: The decoded Python object.
+        """
+        self.peek()
+        while True:
+            try:
+                result, end = _decoder.raw_decode(self.buffer, self.position)
+                # A value touching the end of the buffer may be a truncated number
+                if end < len(self.buffer) or self.exhausted:
+                    self.position = end
+                    return result
+            except json.JSONDecodeError:
+                if self.exhausted:
+                    raise
+            self._fill()
+
+
+def iter_json_array(chunks: Iterable[str], key: str) -> Iterator[Any]:
+    """
+    Lazily yields items of the array stored under ``key`` of a top-level JSON object.
+
+    Only one array item at a time is decoded, other top-level values are decoded and dropped.
+
+    :param chunks: An iterable of text chunks with a JSON object.
+    :param key: The name of the top-level field containing the array.
+    :return: An iterator over decoded array items.
+    """
+    reader = JSONStreamReader(chunks)
+    reader.expect('{')
+    if reader.peek() == '}':
+        return
+
+    while True:
+        name = reader.value()
+        reader.expect(':')
+        if name != key:
+            reader.value()
+        else:
+            reader.expect('[')
+            if reader.peek() != ']':
+                while True:
+                    yield reader.value()
+                    if reader.expect(',', ']') == ']':
+                        break
+            else:
+                reader.expect(']')
+            return
+
+        if reader.expect(',', '}') == '}':
+            return
+
+
+class DocumentBuffer:
+    """
+    In-memory target of a streamed document, preallocated to avoid reallocations.
+
+    :param size_hint: Expected size in bytes, e.g. the response ``Content-Length``.
+    """
+
+    def __init__(self, size_hint: int = 0):
+        self.buffer = bytearray(size_hint)
+        self.size = 0
+        self._view: memoryview | None = None
+
+    def write(self, data: bytes | memoryview) -> None:
+        end = self.size + len(data)
+        if end > len(self.buffer):
+            self.buffer += bytes(max(end - len(self.buffer), len(self.buffer)))
+        self.buffer[self.size:end] = data
+        self.size = end
+
+    def view(self) -> memoryview:
+        if self._view is None:
+            self._view = memoryview(self.buffer)[:self.size]
+        return self._view
+
+    def close(self) -> None:
+        if self._view is not None:
+            self._view.release()
+            self._view = None
+
+
+class DocumentFile:
+    """
+    On-disk target of a streamed document, exposed as a read-only memory map.
+
+    :param path: Path of the file to write, overwritten if exists.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.file = open(self.path, 'w+b')
+        self.size = 0
+        self._map: mmap.mmap | None = None
+
+    def write(self, data: bytes | memoryview) -> None:
+        self.file.write(data)
+        self.size += len(data)
+
+    def view(self) -> mmap.mmap | memoryview:
+        if not self.size:
+            return memoryview(b'')
+        if self._map is None:
+            self.file.flush()
+            self._map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._map
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self.file.close()
+
+
+def _is_escaped(segment: bytes, index: int) -> bool:
+    """
+    Checks whether the byte at ``index`` is escaped, i.e. preceded by an odd number of backslashes.
+    """
+    run = index
+    while run > 0 and segment[run - 1] == _BACKSLASH:
+        run -= 1
+    return (index - run) % 2 == 1
+
+
+def _string_end(segment: bytes) -> int:
+    """
+    Returns the index of the closing quote of JSON string content, -1 if it is not in the segment.
+
+    The segment should start at the beginning of the content or of an escape.
+    """
+    quote = segment.find(b'"')
+    if quote == -1 or not _is_escaped(segment, quote):
+        return quote
+    # Escaped backslashes and quotes are masked, pairing backslashes from the start like JSON
+    return segment.replace(b'\\\\', b'  ').replace(b'\\"', b'  ').find(b'"', quote + 1)
+
+
+def _complete_end(segment: bytes) -> int:
+    """
+    Returns the length of the prefix of JSON string content which can be decoded on its own.
+
+    The prefix ends neither inside an escape nor inside a UTF-8 character, a high surrogate escape
+    is kept with the low surrogate which may follow in the next chunk.
+    """
+    end = len(segment)
+    backslash = segment.rfind(b'\\', max(0, end - 6))
+    if backslash != -1 and not _is_escaped(segment, backslash):
+        if end - backslash < (6 if segment[backslash + 1:backslash + 2] == b'u' else 2):
+            end = backslash
+    if (
+            end >= 6 and segment[end - 6:end - 2].upper() in (b'\\UD8', b'\\UD9', b'\\UDA', b'\\UDB')
+            and not _is_escaped(segment, end - 6)
+    ):
+        return end - 6
+    if end == len(segment):
+        for back in range(1, min(4, end) + 1):
+            byte = segment[end - back]
+            if byte & 0xC0 != 0x80:
+                if byte >= 0xC0 and back < (2 if byte < 0xE0 else 3 if byte < 0xF0 else 4):
+                    end -= back
+                break
+    return end
+
+
+def _write_string(target: 'DocumentBuffer | DocumentFile', segment: bytes, end: int) -> None:
+    """
+    Writes ``segment[:end]`` of JSON string content, decoding it from the first escape on.
+    """
+    first = segment.find(b'\\', 0, end)
+    if first == -1:
+        target.write(memoryview(segment)[:end])
+        return
+    target.write(memoryview(segment)[:first])
+    target.write(json.loads(b'"' + segment[first:end] + b'"').encode())
+
+
+def extract_json_string(chunks: Iterable[bytes], key: str, target: DocumentBuffer | DocumentFile) -> bytes:
+    """
+    Streams the value of the first string field ``key`` of a JSON document into the target.
+
+    The field value is written to the target chunk by chunk, without decoding the document: chunks
+    without JSON escapes are copied as is, otherwise the part of the chunk from the first escape on
+    is decoded, an escape or a character split between chunks is carried over to the next one.
+    Everything else (the envelope) is kept in memory with an empty string in place of the field
+    value, so it can be validated as usual.
+
+    :param chunks: An iterable of byte chunks with a JSON document (e.g. ``response.iter_bytes()``).
+    :param key: The name of the string field to extract.
+    :param target: Where to write the field value.
+    :return: The envelope JSON document.
+    """
+    key_token = json.dumps(key).encode()
+    envelope = bytearray()
+    found = in_document = in_string = escape = is_value = False
+    string_start = 0
+    last_string = b''
+    # The tail of the document content not decoded yet, an escape or a character split between chunks
+    pending = b''
+
+    for chunk in chunks:
+        position = 0
+        while position < len(chunk):
+            if in_document:
+                segment = pending + chunk[position:] if pending or position else chunk
+                end = _string_end(segment)
+                if end == -1:
+                    complete = _complete_end(segment)
+                    _write_string(target, segment, complete)
+                    pending = segment[complete:]
+                    break
+
+                _write_string(target, segment, end)
+                pending = b''
+                position = len(chunk) - len(segment) + end + 1
+                envelope += b'""'
+                in_document = False
+                continue
+
+            byte = chunk[position]
+            position += 1
+            if in_string:
+                envelope.append(byte)
+                if escape:
+                    escape = False
+                elif byte == _BACKSLASH:
+                    escape = True
+                elif byte == _QUOTE:
+                    in_string = False
+                    last_string = bytes(envelope[string_start:])
+            elif byte == _QUOTE and is_value:
+                found = in_document = True
+                is_value = False
+            else:
+                if byte == _QUOTE:
+                    in_string = True
+                    string_start = len(envelope)
+                elif byte == _COLON:
+                    is_value = not found and last_string == key_token
+                elif chr(byte) not in _WHITESPACE:
+                    is_value = False
+                    last_string = b''
+                envelope.append(byte)
+
+    if in_document or in_string:
+        raise ValueError('Unexpected end of the JSON document')
+    if not found:
+        raise ValueError(f'String field {key!r} not found in the JSON document')
+    return bytes(envelope)
+
+
+class StreamedDocument:
+    """
+    A document streamed into a buffer or a file, with its validated envelope.
+
+    :param envelope: The validated response without the document content.
+    :param target: The buffer or file containing the document.
+    """
+
+    def __init__(self, envelope: Any, target: DocumentBuffer | DocumentFile):
+        self.envelope = envelope
+        self.target = target
+
+    @property
+    def document(self) -> memoryview | mmap.mmap:
+        """
+        UTF-8 content of the document, valid until the document is closed.
+        """
+        return self.target.view()
+
+    @property
+    def size(self) -> int:
+        return self.target.size
+
+    def close(self) -> None:
+        self.target.close()
+
+    def __enter__(self) -> 'StreamedDocument':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
@@ -0,0 +1,140 @@
+import json
+import math
+import time
+from collections import deque
+from pathlib import Path
+from typing import Iterator
+
+from tools.metrics import EndpointStats, Metrics
+
+
+class TimeBucket:
+    """
+    Per-endpoint stats of one time interval.
+    """
+    __slots__ = ('start', 'endpoints')
+
+    def __init__(self, start: float):
+        self.start = start
+        self.endpoints: dict[str, EndpointStats] = {}
+
+    def to_dict(self) -> dict:
+        return {
+            't': self.start,
+            'endpoints': {
+                name: {'histogram': stats.histogram.to_dict(), 'errors': stats.errors}
+                for name, stats in self.endpoints.items()
+            },
+        }
+
+
+class TimeSeriesMetrics(Metrics):
+    """
+    Metrics additionally split into fixed time buckets (1 s by default).
+
+    The last ``capacity`` buckets are kept in memory (a ring buffer), so memory does not grow
+    with the run duration. With ``path`` every completed bucket is appended to the file as one
+    JSON line ``{"t": <unix time>, "endpoints": <Metrics.snapshot() format>}``, see :func:`read_time_series`.
+
+    Measurements are bucketed when they reach the metrics, so with :class:`tools.metrics.MetricsBuffer`
+    a measurement may land in a later bucket by up to the buffer flush interval.
+
+    :param resolution: Bucket duration in seconds.
+    :param capacity: Number of buckets kept in memory.
+    :param path: Optional NDJSON file to append completed buckets to.
+    """
+
+    def __init__(self, resolution: float = 1.0, capacity: int = 3600, path: str | Path | None = None):
+        super().__init__()
+        self.resolution = resolution
+        self.buckets: deque[TimeBucket] = deque(maxlen=capacity)
+        self.file = open(path, 'a', encoding='utf-8') if path is not None else None
+
+    def current_bucket(self) -> TimeBucket:
+        """
+        Returns the bucket of the current time, rolling the series forward if needed.
+
+        Must be called under the lock. Buckets only move forward: a measurement reaching the
+        metrics late (e.g. from a buffer flushed by another thread) goes into the current bucket.
+        """
+        start = math.floor(time.time() / self.resolution) * self.resolution
+        bucket = self.buckets[-1] if self.buckets else None
+        if bucket is None or start > bucket.start:
+            if bucket is not None:
+                self.write(bucket)
+            bucket = TimeBucket(start)
+            self.buckets.append(bucket)
+        return bucket
+
+    def record_many(self, samples: list[tuple[str, float, bool]]) -> None:
+        with self.lock:
+            bucket = self.current_bucket()
+            for name, elapsed, error in samples:
+                for endpoints in (self.endpoints, bucket.endpoints):
+                    stats = endpoints.get(name)
+                    if stats is None:
+                        stats = endpoints[name] = EndpointStats()
+                    stats.histogram.record(elapsed)
+                    if error:
+                        stats.errors += 1
+
+    def merge(self, endpoints: dict[str, EndpointStats]) -> None:
+        with self.lock:
+            bucket = self.current_bucket()
+            for name, stats in endpoints.items():
+                self.endpoints.setdefault(name, EndpointStats()).merge(stats)
+                bucket.endpoints.setdefault(name, EndpointStats()).merge(stats)
+
+    def write(self, bucket: TimeBucket) -> None:
+        if self.file is not None:
+            self.file.write(json.dumps(bucket.to_dict(), separators=(',', ':')) + '\n')
+            self.file.flush()
+
+    def reset(self) -> None:
+        with self.lock:
+            self.endpoints = {}
+            self.buckets.clear()
+
+    def series(self, name: str) -> list[tuple[float, dict[str, float]]]:
+        """
+        Returns the statistics of one endpoint in every kept bucket, e.g. to plot latency over time.
+
+        :param name: The endpoint (measurement) name.
+        :return: (bucket start, :meth:`EndpointStats.summary`) pairs, the oldest first.
+        """
+        with self.lock:
+            return [
+                (bucket.start, bucket.endpoints[name].summary(self.resolution))
+                for bucket in self.buckets
+                if name in bucket.endpoints
+            ]
+
+    def close(self) -> None:
+        """
+        Writes the current bucket and closes the file.
+        """
+        with self.lock:
+            if self.buckets:
+                self.write(self.buckets[-1])
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+
+    def __enter__(self) -> 'TimeSeriesMetrics':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+def read_time_series(path: str | Path) -> Iterator[tuple[float, Metrics]]:
+    """
+    Reads buckets written by :class:`TimeSeriesMetrics`.
+
+    :param path: The NDJSON file.
+    :return: An iterator over (bucket start, bucket metrics) pairs.
+    """
+    with open(path, encoding='utf-8') as file:
+        for line in file:
+            bucket = json.loads(line)
+            yield bucket['t'], Metrics.from_snapshot(bucket['endpoints'])
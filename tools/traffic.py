@@ -0,0 +1,320 @@
+"""
+Recording of gateway traffic into a request log and its replay with the original timing.
+
+The log is newline-delimited JSON, one compact record per line, so it can be written and
+replayed as a stream. Two kinds of records are written:
+
+- request record ``{"n": 1, "t": 0.0153, "m": "POST", "p": "/api/v1/users", "b": {...}}`` with
+  sequence number, offset from the start of the recording (seconds), method, path with query and JSON body,
+  a body which is not JSON is recorded as text in ``"x"`` with ``"b": null``;
+- id record ``{"r": 1, "ids": ["..."]}`` with entity IDs returned in the response to request ``r``.
+
+On replay the IDs returned by the gateway are matched with the recorded ones, and later requests
+referencing recorded IDs are sent with IDs of the freshly created entities::
+
+    python -m tools.traffic replay traffic.ndjson --base-url http://localhost:8003 --speed 10
+"""
+import argparse
+import json
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from itertools import count
+from pathlib import Path
+from threading import BoundedSemaphore, Lock
+from typing import Any, Iterator
+
+from httpx import Client, Request, RequestNotRead, Response
+
+from tools.metrics import Histogram, Metrics
+
+_TOKEN = re.compile(r'[^/?&=]+')
+_ID_SEGMENT = re.compile(r'/[0-9a-fA-F-]{16,}|/[0-9A-Za-z]{22,}')
+_SPIN_THRESHOLD = 0.002
+_SWITCH_INTERVAL = 0.0002
+
+
+def decode_json(content: bytes) -> Any:
+    """
+    Decodes a JSON body, None if the body is empty or not JSON.
+    """
+    if not content:
+        return None
+    try:
+        return json.loads(content)
+    except ValueError:
+        return None
+
+
+def collect_ids(data: Any) -> list[str]:
+    """
+    Collects values of all ``id`` fields of a JSON document in document order.
+
+    :param data: Decoded JSON document.
+    :return: A list of IDs.
+    """
+    ids = []
+    if isinstance(data, dict):
+        for key, value in data.items():
+            if key == 'id' and isinstance(value, str):
+                ids.append(value)
+            else:
+                ids.extend(collect_ids(value))
+    elif isinstance(data, list):
+        for item in data:
+            ids.extend(collect_ids(item))
+    return ids
+
+
+class TrafficRecorder:
+    """
+    Records requests issued through an httpx.Client into a request log.
+
+    :param path: Path of the log file to write.
+    """
+
+    def __init__(self, path: str | Path):
+        self.file = open(path, 'w', encoding='utf-8')
+        self.lock = Lock()
+        self.sequence = count(1)
+        self.start: float | None = None
+
+    def install(self, client: Client) -> Client:
+        """
+        Adds recording event hooks to the client, e.g. ``recorder.install(users_client.client)``.
+
+        :param client: The client to record.
+        :return: The same client.
+        """
+        hooks = client.event_hooks
+        hooks['request'].append(self.on_request)
+        hooks['response'].append(self.on_response)
+        client.event_hooks = hooks
+        return client
+
+    @staticmethod
+    def encode(record: dict[str, Any]) -> str:
+        return json.dumps(record, separators=(',', ':'), ensure_ascii=False) + '\n'
+
+    def write(self, record: dict[str, Any]) -> None:
+        line = self.encode(record)
+        with self.lock:
+            self.file.write(line)
+
+    def on_request(self, request: Request) -> None:
+        # Recording never fails a request: a streamed body is not recorded, a non-JSON one is kept as text
+        try:
+            content = request.content
+        except RequestNotRead:
+            content = b''
+        body = decode_json(content)
+        text = content.decode('utf-8', 'replace') if content and body is None else None
+        # The number, the timestamp and the line are taken under one lock, so the log is in request order
+        with self.lock:
+            now = time.perf_counter()
+            if self.start is None:
+                self.start = now
+            number = next(self.sequence)
+            record = {
+                'n': number,
+                't': round(now - self.start, 6),
+                'm': request.method,
+                'p': request.url.raw_path.decode(),
+                'b': body,
+            }
+            if text is not None:
+                record['x'] = text
+            self.file.write(self.encode(record))
+        request.extensions['traffic_record'] = number
+
+    def on_response(self, response: Response) -> None:
+        if response.request.method != 'POST' or not response.is_success:
+            return
+        ids = collect_ids(decode_json(response.read()))
+        if ids:
+            self.write({'r': response.request.extensions['traffic_record'], 'ids': ids})
+
+    def close(self) -> None:
+        with self.lock:
+            self.file.close()
+
+    def __enter__(self) -> 'TrafficRecorder':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+class IdRemapper:
+    """
+    Thread-safe mapping of recorded entity IDs to IDs of entities created during replay.
+
+    :param id_map: Initial mapping, e.g. recorded IDs of pre-seeded entities to new ones.
+    """
+
+    def __init__(self, id_map: dict[str, str] | None = None):
+        self.id_map = dict(id_map or {})
+        self.lock = Lock()
+
+    def learn(self, recorded_ids: list[str], new_ids: list[str]) -> None:
+        with self.lock:
+            self.id_map.update(zip(recorded_ids, new_ids))
+
+    def path(self, path: str) -> str:
+        return _TOKEN.sub(lambda match: self.id_map.get(match[0], match[0]), path)
+
+    def body(self, body: Any) -> Any:
+        if isinstance(body, str):
+            return self.id_map.get(body, body)
+        if isinstance(body, dict):
+            return {key: self.body(value) for key, value in body.items()}
+        if isinstance(body, list):
+            return [self.body(item) for item in body]
+        return body
+
+
+@dataclass
+class ReplayResult:
+    """
+    Results of a replay.
+
+    ``lag`` is the histogram of delays between the scheduled and the actual dispatch time.
+    """
+    requests: int = 0
+    elapsed: float = 0.0
+    metrics: Metrics = field(default_factory=Metrics)
+    lag: Histogram = field(default_factory=Histogram)
+
+
+def read_log(path: str | Path) -> Iterator[dict[str, Any]]:
+    with open(path, encoding='utf-8') as file:
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
+
+
+class TrafficReplayer:
+    """
+    Replays a request log keeping the original inter-arrival timing.
+
+    Requests are dispatched by a single scheduler thread which sleeps until shortly before
+    the deadline and then spins, so dispatch is accurate to well under a millisecond.
+    The requests themselves are sent from a worker pool, so slow responses do not delay
+    the schedule. A request referencing an entity is sent with the new ID only if the entity
+    was created by the time the request is dispatched, as it was during recording.
+
+    :param client: The client to send requests with, its base URL points to the target gateway.
+    :param speed: Replay speed multiplier, e.g. 10 for 10x. None replays as fast as possible.
+    :param workers: Number of threads sending requests, also bounds the number of in-flight requests.
+    :param id_map: Initial mapping of recorded entity IDs to existing ones.
+    """
+
+    def __init__(
+            self,
+            client: Client,
+            speed: float | None = 1.0,
+            workers: int = 32,
+            id_map: dict[str, str] | None = None
+    ):
+        self.client = client
+        self.speed = speed
+        self.workers = workers
+        self.remapper = IdRemapper(id_map)
+
+    def replay(self, path: str | Path) -> ReplayResult:
+        """
+        Replays the log, blocking until all requests are completed.
+
+        :param path: Path of the request log.
+        :return: The replay results.
+        """
+        result = ReplayResult()
+        pending: dict[int, tuple[list[str] | None, list[str] | None]] = {}
+        pending_lock = Lock()
+        in_flight = BoundedSemaphore(self.workers)
+
+        def pair(number: int, recorded: list[str] | None = None, returned: list[str] | None = None) -> None:
+            # The id record may be read before or after the replayed response arrives
+            with pending_lock:
+                other_recorded, other_returned = pending.pop(number, (None, None))
+                recorded = recorded if recorded is not None else other_recorded
+                returned = returned if returned is not None else other_returned
+                if recorded is None or returned is None:
+                    pending[number] = (recorded, returned)
+                    return
+            self.remapper.learn(recorded, returned)
+
+        def send(record: dict[str, Any]) -> None:
+            name = f'{record["m"]} {_ID_SEGMENT.sub("/{id}", record["p"].split("?")[0])}'
+            start = time.perf_counter()
+            error = True
+            try:
+                if 'x' in record:
+                    content = {'content': record['x'].encode()}
+                else:
+                    content = {'json': self.remapper.body(record['b'])}
+                response = self.client.request(record['m'], self.remapper.path(record['p']), **content)
+                error = not response.is_success
+                if record['m'] == 'POST' and not error:
+                    pair(record['n'], returned=collect_ids(decode_json(response.content)))
+            finally:
+                result.metrics.record(name, time.perf_counter() - start, error)
+                in_flight.release()
+
+        # A short GIL switch interval lets the scheduler thread preempt busy workers in time
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(min(switch_interval, _SWITCH_INTERVAL))
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                # Threads are started lazily on submit, start them all before the schedule begins
+                for _ in range(self.workers):
+                    executor.submit(time.sleep, 0.001)
+
+                start = time.perf_counter()
+                for record in read_log(path):
+                    if 'r' in record:
+                        pair(record['r'], recorded=record['ids'])
+                        continue
+
+                    if self.speed:
+                        deadline = start + record['t'] / self.speed
+                        remaining = deadline - time.perf_counter()
+                        if remaining > _SPIN_THRESHOLD:
+                            time.sleep(remaining - _SPIN_THRESHOLD)
+                        while time.perf_counter() < deadline:
+                            pass
+                        result.lag.record(max(time.perf_counter() - deadline, 0.0))
+
+                    in_flight.acquire()
+                    executor.submit(send, record)
+                    result.requests += 1
+            result.elapsed = time.perf_counter() - start
+        finally:
+            sys.setswitchinterval(switch_interval)
+        return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Replays a recorded request log')
+    parser.add_argument('command', choices=['replay'])
+    parser.add_argument('log')
+    parser.add_argument('--base-url', default='http://localhost:8003')
+    parser.add_argument('--speed', type=float, default=1.0, help='Speed multiplier, 0 for max speed')
+    parser.add_argument('--workers', type=int, default=32)
+    arguments = parser.parse_args()
+
+    with Client(base_url=arguments.base_url, timeout=90) as client:
+        replayer = TrafficReplayer(client, speed=arguments.speed or None, workers=arguments.workers)
+        result = replayer.replay(arguments.log)
+
+    print(f'Replayed {result.requests} requests in {result.elapsed:.2f} s, '
+          f'dispatch lag p99 {result.lag.percentile(99) * 1000:.3f} ms')
+    for name, stats in result.metrics.summary(result.elapsed).items():
+        print(f'{name:<60} {stats["count"]:>7} {stats["errors"]:>5} {stats["p99_ms"]:>9.2f} ms')
+
+
+if __name__ == '__main__':
+    main()